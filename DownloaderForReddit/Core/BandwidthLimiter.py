@@ -0,0 +1,152 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+from collections import deque
+from time import monotonic
+
+
+class TokenBucket:
+
+    def __init__(self, rate):
+        """
+        Limits the rate at which bytes may be received.  The bucket fills with tokens at the supplied rate, up to one
+        second's worth, and each byte that is received takes one token.  When there are not enough tokens the bucket
+        goes into debt and the caller is told how long to wait for the debt to be paid off.
+
+        :param rate: The number of bytes per second that are allowed.  A rate of 0 means there is no limit.
+        :type rate: int
+        """
+        self.rate = rate
+        self.tokens = rate
+        self.last_update = monotonic()
+
+    def set_rate(self, rate):
+        """Changes the rate of the bucket.  Any debt is kept so that a lowered rate takes effect immediately."""
+        self.refill()
+        self.rate = rate
+        self.tokens = min(self.tokens, rate)
+
+    def refill(self):
+        now = monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.rate, self.tokens + (now - self.last_update) * self.rate)
+        self.last_update = now
+
+    def reserve(self, amount):
+        """
+        Takes tokens for the supplied number of bytes and returns the number of seconds that the caller must wait
+        before receiving any more.  Not thread safe, the caller must hold the limiter's lock.
+        :param amount: The number of bytes that were received.
+        :type amount: int
+        :return: The number of seconds to wait.
+        :rtype: float
+        """
+        if self.rate <= 0:
+            return 0
+        self.refill()
+        self.tokens -= amount
+        return -self.tokens / self.rate if self.tokens < 0 else 0
+
+
+class BandwidthLimiter:
+
+    # The number of seconds of received bytes that are used to calculate the current throughput.
+    THROUGHPUT_WINDOW = 3
+
+    def __init__(self, global_limit=0, host_limit=0):
+        """
+        Limits the combined download rate of all downloads and the download rate from each individual host using
+        token buckets.  The limits may be changed at any time, including while downloads are running, and the change
+        takes effect with the next chunk that is received.  The limiter also keeps track of the recent throughput so
+        that it can be displayed to the user.
+
+        :param global_limit: The maximum combined download rate in KB/s.  A limit of 0 means there is no limit.
+        :param host_limit: The maximum download rate from a single host in KB/s.  A limit of 0 means there is no limit.
+        :type global_limit: int
+        :type host_limit: int
+        """
+        self.lock = threading.Lock()
+        self.global_bucket = TokenBucket(global_limit * 1024)
+        self.host_limit = host_limit * 1024
+        self.host_buckets = {}
+        self.received = deque()
+        self.host_received = {}
+
+    def configure(self, global_limit, host_limit):
+        """
+        Sets the global and per host download rate limits.
+        :param global_limit: The maximum combined download rate in KB/s, or 0 for no limit.
+        :param host_limit: The maximum download rate from a single host in KB/s, or 0 for no limit.
+        :type global_limit: int
+        :type host_limit: int
+        """
+        with self.lock:
+            self.global_bucket.set_rate(global_limit * 1024)
+            self.host_limit = host_limit * 1024
+            for bucket in self.host_buckets.values():
+                bucket.set_rate(self.host_limit)
+
+    def reserve(self, host, amount):
+        """
+        Records that the supplied number of bytes were received from the host and returns how long the caller must wait
+        before receiving more so that neither the global nor the host limit is exceeded.
+        :param host: The host that the bytes were received from.
+        :param amount: The number of bytes that were received.
+        :type host: str
+        :type amount: int
+        :return: The number of seconds to wait before receiving more content.
+        :rtype: float
+        """
+        with self.lock:
+            now = monotonic()
+            self.received.append((now, amount))
+            self.host_received[host] = self.host_received.get(host, 0) + amount
+            self.trim_received(now)
+            bucket = self.host_buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_limit)
+                self.host_buckets[host] = bucket
+            return max(self.global_bucket.reserve(amount), bucket.reserve(amount))
+
+    def trim_received(self, now):
+        """Removes received byte records that are older than the throughput window.  Must be called holding the lock."""
+        while len(self.received) > 0 and self.received[0][0] < now - self.THROUGHPUT_WINDOW:
+            self.received.popleft()
+
+    def get_throughput(self):
+        """
+        Returns the combined download rate over the last few seconds.
+        :return: The download rate in bytes per second.
+        :rtype: float
+        """
+        with self.lock:
+            self.trim_received(monotonic())
+            return sum(item[1] for item in self.received) / self.THROUGHPUT_WINDOW
+
+    def get_host_totals(self):
+        """Returns a dict of the total number of bytes that have been received from each host."""
+        with self.lock:
+            return dict(self.host_received)
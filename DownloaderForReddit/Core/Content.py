@@ -23,19 +23,33 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
-import requests
+import os
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
 from PyQt5.QtCore import QRunnable
+from requests import exceptions as requests_exceptions
+from urllib3 import exceptions as urllib3_exceptions
 import logging
 
 from Core import SystemUtil
 from Core import Injector
+from Core.StreamWriter import StreamWriter
 from Logging import LogUtils
 
 
 class Content(QRunnable):
 
+    # Errors raised while connecting to or receiving from the server that may not happen if the download is retried.
+    TRANSIENT_ERRORS = (ConnectionError, TimeoutError, requests_exceptions.ConnectionError,
+                        requests_exceptions.Timeout, requests_exceptions.ChunkedEncodingError,
+                        urllib3_exceptions.ProtocolError, urllib3_exceptions.ReadTimeoutError)
+    # The connect and read timeouts, in seconds, for download requests.
+    REQUEST_TIMEOUT = (15, 60)
+
     def __init__(self, url, user, post_title, subreddit, submission_id, number_in_seq, file_ext, save_path,
-                 subreddit_save_method, date_created, display_only):
+                 subreddit_save_method, date_created, display_only, bytes_received=0, retry_count=0):
         """
         Class that holds information about a single file extracted from a reddit submission that is to be downloaded as
         content.  Also holes the method to download the file.
@@ -47,10 +61,16 @@ class Content(QRunnable):
                 (e.g. the album id if the url is from an imgur album)
         :param number_in_seq:  The number of the file in a sequence of files (e.g. if the file is from an album)
         :param file_ext:  The extension of the file, used to save the file with the correct extension
+        :param bytes_received: The number of bytes of the file that were saved to the part file during a previous
+                               download attempt.  The download will be resumed from this point if possible.
+        :param retry_count: The number of times this download has failed and been retried, including during previous
+                            runs.
         """
         super().__init__()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
         self.settings_manager = Injector.get_settings_manager()
+        self.session_manager = Injector.get_session_manager()
+        self.bandwidth_limiter = Injector.get_bandwidth_limiter()
         self.url = url
         self.user = user
         self.post_title = post_title
@@ -65,9 +85,23 @@ class Content(QRunnable):
         self.output = ''
         self.setAutoDelete(False)
         self.downloaded = False
+        self.stopped = False
+        self.stop_event = threading.Event()  # Set when the download is stopped to end any bandwidth limit wait early
+        self.bytes_received = bytes_received
+        self.bytes_transferred = 0
+        self.hasher = None
+        self.linked = False
+        self.retry_count = retry_count
+        self.run_retry_count = 0
+        self.retry_delay = None
+        self.permanent_failure = False
+        self.reddit_object_name = None
+        self.content_length = None
+        self.transfer_time = 0
         self.check_path = None
 
         self.queue = None
+        self.download_finished_callback = None
 
         if not self.display_only:
             if self.subreddit_save_method is None:
@@ -102,42 +136,313 @@ class Content(QRunnable):
                                               self.number_in_seq, self.file_ext)
                 self.check_path = self.save_path
 
+    @property
+    def host(self):
+        """The host name of the server that the content is downloaded from."""
+        return urlsplit(self.url).hostname
+
+    @property
+    def part_filename(self):
+        """The path of the file that content is saved to while the download is in progress."""
+        return '%s.part' % self.filename
+
     def run(self):
         self.check_save_path_subreddit()
+        self.retry_delay = None
         try:
-            response = requests.get(self.url, stream=True)
-            if response.status_code == 200:
-                with open(self.filename, 'wb') as file:
-                    for chunk in response.iter_content(1024):
-                        file.write(chunk)
-                self.set_file_modified_date()
-                self.queue.put('Saved: %s' % self.filename)
-                self.downloaded = True
-                return None
-            else:
-                self.handle_unsuccessful_response(response.status_code)
-        except ConnectionError:
+            resume_position = self.get_resume_position()
+            response = self.request_content(resume_position)
+            if self.check_range_mismatch(response.status_code, response.headers, resume_position):
+                response.close()
+                resume_position = self.restart_download()
+                response = self.request_content(resume_position)
+            with response:
+                position = self.get_write_position(response.status_code, response.headers, resume_position)
+                if position is not None:
+                    self.save_response(response, position)
+                elif self.check_part_complete(response.status_code, response.headers, resume_position):
+                    self.finish_download()
+                else:
+                    self.handle_unsuccessful_response(response.status_code, response.headers.get('Retry-After'))
+        except self.TRANSIENT_ERRORS:
             self.handle_connection_error()
         except:
             self.handle_exception()
+        finally:
+            if self.download_finished_callback is not None:
+                self.download_finished_callback(self)
+
+    def request_content(self, resume_position):
+        """Requests the file from the server, starting from the supplied byte position."""
+        return self.session_manager.get(self.url, stream=True, headers=self.get_request_headers(resume_position),
+                                        timeout=self.REQUEST_TIMEOUT)
+
+    def request_content_length(self):
+        """
+        Asks the server for the size of the file without downloading it.  The size is used to order downloads when the
+        smallest files are to be downloaded first.  The size is left as None if the server does not report it.
+        """
+        try:
+            response = self.session_manager.head(self.url, allow_redirects=True, timeout=self.REQUEST_TIMEOUT)
+            self.content_length = int(response.headers['Content-Length']) if response.ok else None
+        except (KeyError, ValueError, requests_exceptions.RequestException):
+            self.content_length = None
+
+    def get_resume_position(self):
+        """
+        Returns the byte position that the download should be resumed from.  The number of bytes received during the
+        last attempt is only trusted if the part file on disk is at least that large, otherwise the download is started
+        over from the beginning.
+        :return: The byte position that the download should start from.
+        :rtype: int
+        """
+        if self.bytes_received > 0 and os.path.isfile(self.part_filename):
+            if os.path.getsize(self.part_filename) >= self.bytes_received:
+                return self.bytes_received
+        self.bytes_received = 0
+        return 0
+
+    @staticmethod
+    def get_request_headers(resume_position):
+        """Returns the headers to be sent with the download request, or None if no extra headers are needed."""
+        return {'Range': 'bytes=%s-' % resume_position} if resume_position > 0 else None
+
+    def get_write_position(self, status_code, headers, resume_position):
+        """
+        Determines where in the part file the content of a response should be written.
+        :param status_code: The status code of the response from the server.
+        :param headers: The headers of the response from the server.
+        :param resume_position: The byte position that was requested from the server.
+        :return: The byte position the response content starts at, or None if the response does not contain content
+                 that can be saved.
+        :rtype: int
+        """
+        if status_code == 206 and self.check_content_range(headers, resume_position):
+            return resume_position
+        elif status_code == 200:
+            return 0
+        return None
+
+    @staticmethod
+    def check_content_range(headers, resume_position):
+        """
+        Checks that a partial content response starts at the byte position that was requested so that the received
+        content can be safely appended to the existing part file.
+        """
+        content_range = headers.get('Content-Range', '')
+        try:
+            start = int(content_range.split(' ', 1)[1].split('-', 1)[0])
+            return start == resume_position
+        except (IndexError, ValueError):
+            return False
+
+    def check_range_mismatch(self, status_code, headers, resume_position):
+        """
+        Checks for a partial content response to a resumed download that does not start at the byte position that was
+        requested.  The content of such a response cannot be appended to the part file, so the download has to be
+        started again from the beginning.
+        """
+        return status_code == 206 and resume_position > 0 and not self.check_content_range(headers, resume_position)
+
+    def restart_download(self):
+        """
+        Discards the part file and the bytes received from a previous attempt so that the download starts again from
+        the beginning.
+        :return: The byte position that the download starts from, which is always 0.
+        :rtype: int
+        """
+        try:
+            os.remove(self.part_filename)
+        except FileNotFoundError:
+            pass
+        self.bytes_received = 0
+        self.logger.info('Part file discarded: server did not resume from the requested position',
+                         extra={'url': self.url, 'part_file': self.part_filename})
+        return 0
 
-    def handle_unsuccessful_response(self, status_code):
-        """Handles logging and output in case of a failed response from the server."""
+    @staticmethod
+    def check_part_complete(status_code, headers, resume_position):
+        """
+        Checks a range not satisfiable response to determine if the part file already holds the entire file.  This
+        happens when the previous attempt received every byte but was stopped before the file was finished.
+        """
+        if status_code != 416 or resume_position <= 0:
+            return False
+        content_range = headers.get('Content-Range', '')
+        try:
+            return int(content_range.rsplit('/', 1)[1]) == resume_position
+        except (IndexError, ValueError):
+            return False
+
+    def save_response(self, response, position):
+        """
+        Writes the content of the supplied response to the part file starting at the supplied byte position.  The part
+        file is only moved to the final file name once the entire response has been received.
+        :param response: The response from the server which is to be saved.
+        :param position: The byte position in the part file where the response content starts.
+        :type position: int
+        """
+        # The raw response is read directly into the writer's buffer, so it has to be told to decompress any encoded
+        # content the same way iter_content would.
+        response.raw.decode_content = True
+        start_time = time.perf_counter()
+        try:
+            with self.open_part_file(position, self.get_expected_size(response.headers, position)) as writer:
+                while not self.stopped:
+                    chunk = writer.read_from(response.raw)
+                    if not chunk:
+                        break
+                    delay = self.write_chunk(writer, chunk)
+                    if delay > 0:
+                        self.stop_event.wait(delay)
+        finally:
+            self.transfer_time += time.perf_counter() - start_time
+        if not self.stopped:
+            self.finish_download()
+
+    @staticmethod
+    def get_expected_size(headers, position):
+        """
+        Returns the size that the part file will be once the response has been saved, or None if the response does not
+        report its length or is encoded such that the saved size will differ from the reported length.
+        """
+        if headers.get('Content-Encoding', 'identity') != 'identity':
+            return None
+        try:
+            return position + int(headers['Content-Length'])
+        except (KeyError, ValueError):
+            return None
+
+    def open_part_file(self, position, expected_size=None):
+        """
+        Opens the part file for writing with any content after the supplied byte position removed.
+        :param position: The byte position that new content will be written from.
+        :param expected_size: The size the part file will be once the download is complete, if it is known.
+        :type position: int
+        :type expected_size: int
+        :return: A stream writer for the open part file.
+        :rtype: StreamWriter
+        """
+        self.bytes_received = position
+        self.hasher = self.make_hasher(position) if self.settings_manager.deduplicate_content else None
+        return StreamWriter(self.part_filename, position, self.settings_manager.download_write_size * 1024,
+                            expected_size)
+
+    def write_chunk(self, writer, chunk):
+        """
+        Writes a chunk of received content to the part file through the supplied stream writer.
+        :return: The number of seconds the download must wait before receiving the next chunk in order to stay within
+                 the bandwidth limits.
+        :rtype: float
+        """
+        writer.write(chunk)
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+        self.bytes_received += len(chunk)
+        self.bytes_transferred += len(chunk)
+        return self.bandwidth_limiter.reserve(self.host, len(chunk))
+
+    def make_hasher(self, position):
+        """
+        Creates the hash object that the content of the file is hashed with as it is received.  If the download is
+        being resumed, the content that is already in the part file is hashed first.
+        :param position: The byte position that the download is being resumed from.
+        :type position: int
+        """
+        hasher = hashlib.sha256()
+        if position > 0:
+            with open(self.part_filename, 'rb') as file:
+                remaining = position
+                while remaining > 0:
+                    block = file.read(min(remaining, 1048576))
+                    if not block:
+                        break
+                    hasher.update(block)
+                    remaining -= len(block)
+        return hasher
+
+    def finish_download(self):
+        """
+        Moves the completed part file to its final file name and reports the file as saved.  If the content was hashed
+        while it was received, the content store is used so that duplicate content is linked to the existing copy.
+        """
+        if self.hasher is not None:
+            self.linked = Injector.get_content_store().save(self.part_filename, self.filename,
+                                                            self.hasher.hexdigest())
+        else:
+            os.replace(self.part_filename, self.filename)
+        # A linked file shares its date modified with the existing copy, which should not be changed
+        if not self.linked:
+            self.set_file_modified_date()
+        self.queue.put('Saved: %s' % self.filename)
+        self.downloaded = True
+
+    def stop(self):
+        """
+        Stops the download after the chunk currently being written.  The part file and the number of bytes received are
+        kept so that the download can be resumed later.
+        """
+        self.stopped = True
+        self.stop_event.set()
+
+    def handle_unsuccessful_response(self, status_code, retry_after=None):
+        """
+        Handles logging and output in case of a failed response from the server.  Responses that indicate a temporary
+        problem with the server are retried, and responses that indicate the file no longer exists are marked so that
+        the content is not saved to be downloaded again.
+        :param status_code: The status code of the response from the server.
+        :param retry_after: The value of the Retry-After header of the response, if there was one.
+        """
+        retry_policy = Injector.get_retry_policy()
+        if retry_policy.is_transient(status_code) and self.schedule_retry(retry_after):
+            return None
+        if retry_policy.is_permanent(status_code):
+            self.permanent_failure = True
         self.logger.warning('Failed Download: Unsuccessful response from server',
                             extra={'response_code': status_code, 'url': self.url, 'user': self.user,
-                                   'submission_id': self.submission_id, 'number_in_seq': self.number_in_seq})
+                                   'submission_id': self.submission_id, 'number_in_seq': self.number_in_seq,
+                                   'retry_count': self.retry_count, 'permanent_failure': self.permanent_failure})
         self.queue.put('Failed Download:  File %s%s posted by %s failed to download...try link to download '
                        'manually: %s\n' % (self.submission_id, self.number_in_seq, self.user, self.url))
 
     def handle_connection_error(self):
         """Handles logging and output in case of a failed connection attempt to the server"""
+        if self.schedule_retry():
+            return None
         self.logger.error('Failed to establish a connection',
                           extra={'url': self.url, 'user': self.user, 'submission_id': self.submission_id,
                                  'number_in_seq': self.number_in_seq, 'extension': self.file_ext,
-                                 'created': self.date_created}, exc_info=True)
+                                 'created': self.date_created, 'retry_count': self.retry_count}, exc_info=True)
         self.queue.put('Failed Download: Failed to establish a connection to url: %s\n'
                        'User: %s, Subreddit: %s, Title: %s' % (self.url, self.user, self.subreddit, self.post_title))
 
+    def schedule_retry(self, retry_after=None):
+        """
+        Records a transient failure and, if the retry policy allows it, sets the delay after which the downloader will
+        run this download again.  Content that has failed too many times over all runs is marked as a permanent failure
+        so that it is no longer saved to be retried.
+        :param retry_after: The value of the Retry-After header sent by the server, if there was one.
+        :return: True if the download will be retried during this run, False if it will not.
+        :rtype: bool
+        """
+        if self.stopped:
+            return False
+        retry_policy = Injector.get_retry_policy()
+        self.retry_count += 1
+        if retry_policy.check_exhausted(self.retry_count):
+            self.permanent_failure = True
+            return False
+        delay = retry_policy.get_delay(self.run_retry_count, retry_after)
+        if delay is None:
+            return False
+        self.run_retry_count += 1
+        self.retry_delay = delay
+        self.logger.info('Download scheduled to be retried', extra={'url': self.url, 'delay': round(delay, 2),
+                                                                    'retry_count': self.retry_count})
+        self.queue.put('Retrying download in %d secs (retry %s of %s): %s' %
+                       (delay, self.run_retry_count, retry_policy.max_retries, self.url))
+        return True
+
     def handle_exception(self):
         """Handles logging and output in case of a failed save due to a general exception."""
         self.logger.error('Failed to save content: Exception while saving file',
@@ -0,0 +1,142 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import sqlite3
+import threading
+import logging
+
+from Core import SystemUtil
+
+
+class ContentStore:
+
+    def __init__(self, index_path=None):
+        """
+        Keeps an index of every downloaded file by the hash of its content so that a file which has already been
+        downloaded for one user or subreddit can be hard linked into the save folder of another instead of being saved
+        as a second copy.  The index is stored in the data directory and maps each content hash to the path of the
+        first file that was saved with that content.
+
+        :param index_path: The path of the index file.  The index is stored in the data directory if no path is given.
+        :type index_path: str
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.lock = threading.Lock()
+        self.index_path = index_path if index_path is not None else self.get_index_path()
+        self.linked_count = 0
+        self.connection = None
+
+    @staticmethod
+    def get_index_path():
+        return os.path.join(SystemUtil.get_data_directory(), 'content_index.db')
+
+    def connect(self):
+        """
+        Opens the index database the first time it is needed.  The connection is kept open and shared by every download
+        thread.  Must be called with the lock held.
+        """
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.index_path, check_same_thread=False)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS content (digest TEXT PRIMARY KEY, path TEXT NOT NULL)')
+            self.connection.commit()
+        return self.connection
+
+    def get_stored_path(self, digest):
+        """Returns the path of the stored copy of the content with the supplied hash, or None if there is none."""
+        with self.lock:
+            row = self.connect().execute('SELECT path FROM content WHERE digest = ?', (digest,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_stored_path(self, digest, path):
+        """Records the supplied path as the stored copy of the content with the supplied hash."""
+        with self.lock:
+            connection = self.connect()
+            connection.execute('INSERT OR REPLACE INTO content (digest, path) VALUES (?, ?)', (digest, path))
+            connection.commit()
+
+    def save(self, part_path, path, digest):
+        """
+        Moves a completed part file to its final path.  If a file with the same content hash has already been saved and
+        still exists, the final path is made a hard link to that file and the part file is removed.  Otherwise the part
+        file is moved into place as normal and recorded in the index as the stored copy of its content.  Only the
+        index lookups are made while holding the lock so that downloads finishing at the same time do not wait on
+        each other's file moves.
+        :param part_path: The path of the completed part file.
+        :param path: The final path that the file is to be saved at.
+        :param digest: The hex digest of the content hash of the file.
+        :type part_path: str
+        :type path: str
+        :type digest: str
+        :return: True if the file was linked to an existing copy, False if the part file was moved into place.
+        :rtype: bool
+        """
+        existing = self.get_stored_path(digest)
+        if existing is not None and existing != path and self.check_existing(existing, part_path):
+            if self.link(existing, path):
+                os.remove(part_path)
+                with self.lock:
+                    self.linked_count += 1
+                return True
+        os.replace(part_path, path)
+        self.set_stored_path(digest, path)
+        return False
+
+    @staticmethod
+    def check_existing(existing, part_path):
+        """
+        Checks that the stored copy of the content is still on disk and has not been changed in size since it was
+        saved.
+        """
+        try:
+            return os.path.getsize(existing) == os.path.getsize(part_path)
+        except OSError:
+            return False
+
+    def link(self, source, path):
+        """
+        Creates a hard link at the supplied path to the source file, replacing anything that is already at the path.
+        Linking fails if the file system does not support hard links or the paths are on different drives, in which
+        case the file is saved as a normal copy.
+        :return: True if the link was created, False if it was not.
+        :rtype: bool
+        """
+        temp_path = '%s.link' % path
+        try:
+            os.link(source, temp_path)
+            os.replace(temp_path, path)
+            return True
+        except OSError:
+            self.logger.warning('Failed to link duplicate content', extra={'source': source, 'path': path},
+                                exc_info=True)
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
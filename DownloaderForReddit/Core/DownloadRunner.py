@@ -24,13 +24,26 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 
 
 import prawcore
-from PyQt5.QtCore import QObject, pyqtSignal, QThreadPool, QThread
-from queue import Queue
+from PyQt5.QtCore import QObject, pyqtSignal, QThreadPool, QThread, Qt
+from queue import Queue, Empty
+from collections import deque
 from time import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 import Core.Injector
 from Core.PostFilter import PostFilter
+from Core.DownloadScheduler import DownloadScheduler
+from Core.ObjectValidator import ObjectValidator
+from Core.SubmissionStream import SubmissionStream
+from Core.ObjectQueue import ObjectQueue
 from Extractors.Extractor import Extractor
 
 
@@ -45,6 +58,13 @@ class DownloadRunner(QObject):
     update_progress_bar_signal = pyqtSignal()
     stop = pyqtSignal()
 
+    # The number of posts that reddit returns in a single listing page.
+    PAGE_SIZE = 100
+
+    # The number of seconds that a reddit object's post cursor is trusted for before the full new listing is read
+    # again to make sure that the post the cursor points to has not been deleted.
+    CURSOR_MAX_AGE = 259200
+
     def __init__(self, user_list, subreddit_list, queue, unfinished_downloads_list):
         """
         Class that does the main part of the work for the program.  This class contains the praw instance that is used
@@ -62,16 +82,24 @@ class DownloadRunner(QObject):
         self.start_time = time()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
         self.settings_manager = Core.Injector.get_settings_manager()
-        self._r = self.settings_manager.r
+        self.reddit_client_manager = Core.Injector.get_reddit_client_manager()
+        self.reddit_client_manager.start_run()
+        self._r = self.reddit_client_manager.reddit
+        self.object_validator = ObjectValidator(self._r, self.settings_manager.validity_cache_ttl * 86400)
+        self.validity = {}
         self.post_filter = PostFilter()
         self.user_list = user_list
         self.subreddit_list = subreddit_list
         self.queue = queue
-        self.validated_objects = Queue()
+        self.priority_objects = set()
+        self.validation_queue = None
+        self.validated_objects = ObjectQueue(self.priority_objects)
         self.validated_subreddits = []
         self.failed_downloads = []
         self.downloaded_objects = {}
         self.unfinished_downloads = []
+        self.transfer_stats = None
+        self.downloader = None
         self.user_run = True if self.user_list is not None else False
         self.single_subreddit_run_method = None
 
@@ -80,6 +108,7 @@ class DownloadRunner(QObject):
 
         self.queued_posts = Queue()
         self.run = True
+        Core.Injector.get_imgur_client_manager().start_run()
         self.start_extractor()
         self.start_downloader()
 
@@ -88,71 +117,173 @@ class DownloadRunner(QObject):
     def validate_users(self):
         """Validates users and builds a list of all posts to reddit that meet the user provided criteria"""
         self.setup_progress_bar.emit(len(self.user_list) * 2)
-        for user in self.user_list:
-            if self.run:
-                redditor = self._r.redditor(user.name)
-                try:
-                    test = redditor.fullname
-                    self.queue.put("%s is valid" % user.name)
-                    user.new_submissions = self.get_submissions(redditor, user)
-                    self.validated_objects.put(user)
-                    user.check_save_directory()
-                    self.update_progress_bar()
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(user)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
-
+        self.check_user_validity()
+        self.validate_concurrently(self.user_list, self.validate_user)
+        self.object_validator.save()
         self.validated_objects.put(None)  # Shuts down the extractor
 
     def validate_subreddits(self):
         """See validate_users"""
         self.setup_progress_bar.emit(len(self.subreddit_list) * 2)
-        for sub in self.subreddit_list:
-            if self.run:
-                subreddit = self._r.subreddit(sub.name)
-                try:
-                    test = subreddit.fullname
-                    self.queue.put("%s is valid" % sub.name)
-                    sub.new_submissions = self.get_submissions(subreddit, sub)
-                    self.validated_objects.put(sub)
-                    sub.check_save_directory()
-                    self.update_progress_bar()
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(sub)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
+        self.check_subreddit_validity()
+        self.validate_concurrently(self.subreddit_list, self.validate_subreddit)
+        self.object_validator.save()
         self.validated_objects.put(None)
 
     def validate_users_and_subreddits(self):
         """See validate_users"""
-        for sub in self.subreddit_list:
-            if self.run:
-                try:
-                    subreddit = self._r.subreddit(sub.name)
-                    self.validated_subreddits.append(subreddit.display_name)
-                    self.queue.put('%s is valid' % subreddit.display_name)
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(sub)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
+        self.check_subreddit_validity()
+        self.validate_concurrently(self.subreddit_list, self.validate_subreddit_name)
+        if self.run:
+            self.check_user_validity()
+            self.validate_concurrently(self.user_list, self.validate_user_in_subreddits)
+        self.object_validator.save()
+        self.validated_objects.put(None)
+
+    def check_user_validity(self):
+        """
+        Looks up whether each user in the user list is already known to be valid or invalid so that users with a
+        known result do not have to be checked individually.
+        """
+        try:
+            self.validity.update(self.object_validator.check_users([user.name for user in self.user_list]))
+        except prawcore.RequestException:
+            self.logger.warning('Failed to check user validity', exc_info=True)
+
+    def check_subreddit_validity(self):
+        """See check_user_validity"""
+        try:
+            self.validity.update(self.object_validator.check_subreddits([sub.name for sub in self.subreddit_list]))
+        except prawcore.RequestException:
+            self.logger.warning('Failed to check subreddit validity', exc_info=True)
+
+    def check_valid(self, reddit_object, praw_object):
+        """
+        Checks that the supplied reddit object exists.  A request is only made to reddit if the object's validity is
+        not already known from the validity cache.
+        :param reddit_object: The user or subreddit that is to be checked.
+        :param praw_object: The praw object for the user or subreddit.
+        :return: True if the object is valid, False if it is known to be invalid.
+        :rtype: bool
+        """
+        valid = self.validity.get(reddit_object.name)
+        if valid is None:
+            fullname = praw_object.fullname
+            self.object_validator.record(reddit_object.object_type, reddit_object.name, True, fullname)
+            valid = True
+        return valid
 
+    def handle_invalid_object_found(self, reddit_object):
+        """Records that the reddit object is invalid in the validity cache and then handles the invalid object."""
+        self.object_validator.record(reddit_object.object_type, reddit_object.name, False)
+        self.handle_invalid_reddit_object(reddit_object)
+
+    def validate_concurrently(self, object_list, validate_method):
+        """
+        Runs the supplied validation method for each reddit object in the supplied list on a pool of worker threads.
+        Each object is put in the validated objects queue by the validation method as soon as its submissions have been
+        listed, so extraction can start on the first objects while the rest are still being validated.  The workers
+        take the objects from a queue so that an object the user asks to download next is validated next.  This method
+        returns once every object has been validated or the run has been stopped.
+        :param object_list: The list of users or subreddits that are to be validated.
+        :param validate_method: The method that validates a single reddit object.
+        :type object_list: list
+        """
+        worker_count = max(1, self.settings_manager.validation_thread_count)
+        self.validation_queue = ObjectQueue(self.priority_objects)
+        for reddit_object in object_list:
+            self.validation_queue.put(reddit_object)
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            for _ in range(worker_count):
+                executor.submit(self.run_validation_worker, validate_method)
+
+    def run_validation_worker(self, validate_method):
+        """Validates reddit objects taken from the validation queue until the queue is empty or the run is stopped."""
+        while self.run:
+            try:
+                reddit_object = self.validation_queue.get_nowait()
+            except Empty:
+                return None
+            self.run_validation(validate_method, reddit_object)
+
+    def run_validation(self, validate_method, reddit_object):
+        """Validates a single reddit object on a worker thread."""
         if self.run:
-            for user in self.user_list:
-                redditor = self._r.redditor(user.name)
-                try:
-                    test = redditor.fullname
-                    self.queue.put('%s is valid' % user.name)
-                    user.new_submissions = self.get_user_submissions_from_subreddits(redditor, user)
-                    self.validated_objects.put(user)
-                    user.check_save_directory()
-                    self.update_progress_bar()
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(user)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
+            try:
+                validate_method(reddit_object)
+            except Exception:
+                self.logger.error('Unexpected error while validating reddit object',
+                                  extra={'reddit_object': reddit_object.name}, exc_info=True)
+                self.update_progress_bar()
+                self.update_progress_bar()  # Once for validation, once for would be extraction
 
-        self.validated_objects.put(None)
+    def validate_user(self, user):
+        redditor = self._r.redditor(user.name)
+        try:
+            if not self.check_valid(user, redditor):
+                self.handle_invalid_reddit_object(user)
+                return None
+            self.queue.put("%s is valid" % user.name)
+            self.stream_submissions(user, self.get_submissions(redditor, user))
+        except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
+            self.handle_invalid_object_found(user)
+        except prawcore.RequestException:
+            self.handle_failed_connection()
+
+    def validate_subreddit(self, sub):
+        subreddit = self._r.subreddit(sub.name)
+        try:
+            if not self.check_valid(sub, subreddit):
+                self.handle_invalid_reddit_object(sub)
+                return None
+            self.queue.put("%s is valid" % sub.name)
+            self.stream_submissions(sub, self.get_submissions(subreddit, sub))
+        except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
+            self.handle_invalid_object_found(sub)
+        except prawcore.RequestException:
+            self.handle_failed_connection()
+
+    def validate_subreddit_name(self, sub):
+        """Validates a subreddit that is used only to restrict which of the users submissions are downloaded."""
+        try:
+            subreddit = self._r.subreddit(sub.name)
+            if not self.check_valid(sub, subreddit):
+                self.handle_invalid_reddit_object(sub)
+                return None
+            self.validated_subreddits.append(subreddit.display_name)
+            self.queue.put('%s is valid' % subreddit.display_name)
+        except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
+            self.handle_invalid_object_found(sub)
+        except prawcore.RequestException:
+            self.handle_failed_connection()
+
+    def validate_user_in_subreddits(self, user):
+        redditor = self._r.redditor(user.name)
+        try:
+            if not self.check_valid(user, redditor):
+                self.handle_invalid_reddit_object(user)
+                return None
+            self.queue.put('%s is valid' % user.name)
+            self.stream_submissions(user, self.get_user_submissions_from_subreddits(redditor, user))
+        except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
+            self.handle_invalid_object_found(user)
+        except prawcore.RequestException:
+            self.handle_failed_connection()
+
+    def stream_submissions(self, reddit_object, posts):
+        """
+        Sends the reddit object to be extracted and then reads its posts from reddit into a submission stream, from
+        which the extractor takes each post as soon as the listing page that contains it has been received.
+        :param reddit_object: The validated reddit object whose posts are being read.
+        :param posts: An iterable of the reddit object's posts that have passed the post filter.
+        :type reddit_object: RedditObject
+        """
+        reddit_object.check_save_directory()
+        reddit_object.load_collections()
+        reddit_object.new_submissions = SubmissionStream(running=lambda: self.run)
+        self.validated_objects.put(reddit_object)
+        reddit_object.new_submissions.produce(posts)
+        self.update_progress_bar()
 
     def handle_invalid_reddit_object(self, reddit_object):
         """
@@ -170,7 +301,7 @@ class DownloadRunner(QObject):
 
     def get_download_count(self, reddit_object):
         try:
-            download_count = len(reddit_object.previous_downloads)
+            download_count = reddit_object.number_of_downloads
         except:
             download_count = 0
         return download_count
@@ -198,14 +329,35 @@ class DownloadRunner(QObject):
                 user.clear_download_session_data()
         except TypeError:
             pass
+        reddit_stats = self.reddit_client_manager.get_stats()
         self.logger.info('Download finished', extra={'download_type': 'User' if self.user_run else 'Subreddit',
                                                      'download_count': self.download_number,
-                                                     'download_time': time_string})
+                                                     'download_time': time_string,
+                                                     'reddit_requests': reddit_stats['request_count'],
+                                                     'reddit_rate_limit_remaining': reddit_stats['remaining'],
+                                                     'reddit_rate_limit_waits': reddit_stats['wait_count']})
         self.queue.put('\nFinished\nTime: %s' % time_string)
+        if self.transfer_stats is not None and self.transfer_stats['total_bytes'] > 0:
+            self.queue.put('Downloaded: %.1f MB at %.2f MB/s per download thread' %
+                           (self.transfer_stats['total_bytes'] / 1048576, self.transfer_stats['mb_per_second']))
+        if self.transfer_stats is not None and self.transfer_stats['retried_downloads'] > 0:
+            self.queue.put('Retried downloads: %s (%s succeeded)' % (self.transfer_stats['retried_downloads'],
+                                                                    self.transfer_stats['retried_and_downloaded']))
+        if self.transfer_stats is not None and self.transfer_stats['linked_files'] > 0:
+            self.queue.put('Duplicate files linked to existing copies: %s' % self.transfer_stats['linked_files'])
+        imgur_stats = Core.Injector.get_imgur_client_manager().get_stats()
+        if imgur_stats['credits_used'] > 0:
+            self.queue.put('Imgur credits used: %s (%s client credits and %s user credits remaining)' %
+                           (imgur_stats['credits_used'], imgur_stats['client_remaining'],
+                            imgur_stats['user_remaining']))
         if len(self.downloaded_objects) > 0:
             self.send_downloaded_objects()
         self.finished.emit()
 
+    def set_transfer_stats(self, stats):
+        """Stores the transfer stats reported by the downloader so they can be shown when the download finishes."""
+        self.transfer_stats = stats
+
     def calculate_run_time(self):
         """
         Calculates and returns the run time of the download runner in a human readable hour, min, sec format.
@@ -235,7 +387,8 @@ class DownloadRunner(QObject):
         Initializes an BaseExtractor object, starts a separate thread, and then runs the extractor from the new thread so
         that content can be simultaneously extracted, validated, and downloaded.
         """
-        self.extraction_runner = ExtractionRunner(self.queue, self.validated_objects, self.queued_posts, self.user_run)
+        self.extraction_runner = ExtractionRunner(self.queue, self.validated_objects, self.queued_posts, self.user_run,
+                                                  self.settings_manager.extraction_thread_count)
         self.stop.connect(self.extraction_runner.stop)
         self.extraction_thread = QThread()
         self.extraction_runner.moveToThread(self.extraction_thread)
@@ -253,8 +406,23 @@ class DownloadRunner(QObject):
         that content can be simultaneously downloaded, extracted and validated.
         :return:
         """
-        self.downloader = Downloader(self.queued_posts, self.settings_manager.max_download_thread_count)
-        self.stop.connect(self.downloader.stop)
+        if self.settings_manager.download_engine == 'ASYNC' and AsyncDownloader.available():
+            self.downloader = AsyncDownloader(self.queued_posts, self.settings_manager.max_async_download_count,
+                                              self.settings_manager.max_host_download_thread_count,
+                                              self.settings_manager.download_priority_policy)
+        else:
+            if self.settings_manager.download_engine == 'ASYNC':
+                self.logger.warning('Async download engine selected but aiohttp is not installed: '
+                                    'Falling back to thread pool downloader')
+            self.downloader = Downloader(self.queued_posts, self.settings_manager.max_download_thread_count,
+                                         self.settings_manager.max_host_download_thread_count,
+                                         self.settings_manager.download_priority_policy)
+        for name in list(self.priority_objects):
+            self.downloader.scheduler.prioritize(name)
+        # The downloader's thread is busy for the whole run, so a queued stop would not be delivered until the run has
+        # finished.  Downloader.stop is safe to call from the runner's thread.
+        self.stop.connect(self.downloader.stop, Qt.DirectConnection)
+        self.downloader.transfer_stats.connect(self.set_transfer_stats)
         self.downloader_thread = QThread()
         self.downloader.moveToThread(self.downloader_thread)
         self.downloader_thread.started.connect(self.downloader.download)
@@ -269,25 +437,26 @@ class DownloadRunner(QObject):
         Extracts posts from a redditor object if the post makes it through the PostFilter
         :param praw_object: A praw redditor object that contains the submission list.
         :param reddit_object: The User object that holds certain filter settings needed for gathering the posts.
-        :return: A list of submissions that have been filtered based on the overall settings and the supplied users
-                 individual settings.
+        :return: A generator of submissions that have been filtered based on the overall settings and the supplied
+                 users individual settings.  Listing pages are requested from reddit as the generator is read.
         """
-        return [post for post in self.get_raw_submissions(praw_object, reddit_object.post_limit) if
-                self.post_filter.filter_post(post, reddit_object)]
+        return (post for post in self.get_raw_submissions(praw_object, reddit_object) if
+                self.post_filter.filter_post(post, reddit_object))
 
-    def get_raw_submissions(self, praw_object, post_limit):
+    def get_raw_submissions(self, praw_object, reddit_object):
         """
         Gets the raw submission generator from the praw object based on the appropriate settings.
         :param praw_object: Either a praw Redditor or Subreddit object.
-        :param post_limit: The post limit from the reddit object that the submissions are for.
+        :param reddit_object: The reddit object that the submissions are for.
         :return: A list generator of submissions from the supplied praw_object.
         """
+        post_limit = reddit_object.post_limit
         if self.user_run:
-            posts = praw_object.submissions.new(limit=post_limit)
+            posts = self.get_new_submissions(praw_object.submissions.new, reddit_object)
         else:
             sort = self.get_subreddit_sort_method()
             if sort[0] == 'NEW':
-                posts = praw_object.new(limit=post_limit)
+                posts = self.get_new_submissions(praw_object.new, reddit_object)
             elif sort[0] == 'HOT':
                 posts = praw_object.hot(limit=post_limit)
             elif sort[0] == 'RISING':
@@ -298,6 +467,72 @@ class DownloadRunner(QObject):
                 posts = praw_object.top(sort[1].lower(), limit=post_limit)
         return posts
 
+    def get_new_submissions(self, new_listing, reddit_object):
+        """
+        Yields the posts from a new sorted listing that are newer than the reddit object's date limit.  Posts in a new
+        sorted listing are in date order, so the listing stops being read at the first post that is not newer than the
+        date limit instead of every page up to the post limit being requested.  If all of the posts newer than the
+        reddit object's post cursor fit in a single page, that page is the only request that is made.
+        :param new_listing: The praw method that returns the new sorted listing.
+        :param reddit_object: The reddit object that the submissions are for.
+        :type reddit_object: RedditObject
+        """
+        page = self.get_cursor_page(reddit_object)
+        if page is not None:
+            yield from page
+            return None
+        date_limit = PostFilter.get_date_limit(reddit_object)
+        checked_cursor = False
+        for post in new_listing(limit=reddit_object.post_limit):
+            if post.stickied or getattr(post, 'pinned', False):
+                yield post
+                continue
+            if not checked_cursor:
+                self.check_post_cursor(reddit_object, post, date_limit)
+                checked_cursor = True
+            if post.created <= date_limit:
+                return None
+            yield post
+
+    def get_cursor_page(self, reddit_object):
+        """
+        Requests a single page of the posts that are newer than the reddit object's post cursor.
+        :param reddit_object: The reddit object that the submissions are for.
+        :type reddit_object: RedditObject
+        :return: A list of the posts newer than the cursor, or None if the cursor can not be used, if there may be
+                 more new posts than fit in a single page, or if the page is empty.  Reddit returns an empty page both
+                 when there are no new posts and when the cursor post has been deleted, so an empty page can not be
+                 trusted and the full listing is read instead.
+        :rtype: list
+        """
+        cursor = getattr(reddit_object, 'post_cursor', None)
+        if cursor is None or reddit_object.custom_date_limit is not None or \
+                time() - reddit_object.post_cursor_time > self.CURSOR_MAX_AGE:
+            return None
+        if reddit_object.object_type == 'USER':
+            path = 'user/%s/submitted' % reddit_object.name
+        else:
+            path = 'r/%s/new' % reddit_object.name
+        page_size = min(reddit_object.post_limit, self.PAGE_SIZE)
+        posts = list(self._r.get(path, params={'sort': 'new', 'limit': page_size, 'before': cursor}))
+        return posts if 0 < len(posts) < page_size else None
+
+    @staticmethod
+    def check_post_cursor(reddit_object, newest_post, date_limit):
+        """
+        Compares the reddit object's post cursor to the newest post in a full listing.  If the newest post is the
+        cursor, the cursor is still valid.  If the newest post is not new but is also not the cursor, the post that
+        the cursor points to has been deleted and the cursor is cleared, because reddit returns no posts when it is
+        asked for the posts newer than a deleted post.
+        """
+        cursor = getattr(reddit_object, 'post_cursor', None)
+        if cursor is None:
+            return None
+        if newest_post.fullname == cursor:
+            reddit_object.set_post_cursor(cursor)
+        elif newest_post.created <= date_limit:
+            reddit_object.set_post_cursor(None)
+
     def get_subreddit_sort_method(self):
         """
         Method used to determine the subreddit sort method.  This is necessary because if a subreddit is downloaded as
@@ -316,11 +551,11 @@ class DownloadRunner(QObject):
         All other user filters still apply.
         :param redditor: The praw redditor object from which the posts will be extracted.
         :param user: The RedditObject that holds some filtering information needed.
-        :return: A list of submissions that are from the validated subreddits and that pass the users filtering
+        :return: A generator of submissions that are from the validated subreddits and that pass the users filtering
                  requirements
         """
-        return [post for post in redditor.submissions.new(limit=user.post_limit) if post.subreddit.display_name in
-                self.validated_subreddits and self.post_filter.filter_post(post, user)]
+        return (post for post in self.get_new_submissions(redditor.submissions.new, user) if
+                post.subreddit.display_name in self.validated_subreddits and self.post_filter.filter_post(post, user))
 
     def add_downloaded_object(self, obj_tuple):
         """
@@ -340,12 +575,41 @@ class DownloadRunner(QObject):
         self.downloaded_objects_signal.emit(self.downloaded_objects)
 
     def stop_download(self):
-        """Stops the download when the user selects to do so."""
+        """
+        Stops the download when the user selects to do so.  This is connected directly to the GUI's stop signal so that
+        it is called even while this runner's thread is busy, which lets any reddit or imgur request that is being held
+        for the rate limit be released straight away.
+        """
         self.run = False
+        self.reddit_client_manager.stop_run()
+        Core.Injector.get_imgur_client_manager().stop_run()
         self.stop.emit()
         self.queue.put('\nStopped\n')
         self.logger.info('Downloader stopped', extra={'run_time': self.calculate_run_time()})
 
+    def prioritize(self, reddit_object):
+        """
+        Moves the supplied reddit object ahead of all other objects that are waiting to be validated or extracted, and
+        its content ahead of all other content in the download order.  This is called directly from the GUI thread when
+        the user asks for an object to be downloaded next while this runner is already running, so that the request
+        does not have to wait for the runner's thread to become idle.
+        :param reddit_object: The user or subreddit that is to be downloaded first.
+        :type reddit_object: RedditObject
+        :return: True if the reddit object is part of this download, False if it is not.
+        :rtype: bool
+        """
+        object_list = self.user_list if self.user_list is not None else self.subreddit_list
+        if object_list is None or reddit_object not in object_list:
+            return False
+        validation_queue = self.validation_queue
+        if validation_queue is not None:
+            validation_queue.prioritize(reddit_object.name)
+        self.validated_objects.prioritize(reddit_object.name)
+        if self.downloader is not None:
+            self.downloader.scheduler.prioritize(reddit_object.name)
+        self.logger.info('Reddit object prioritized', extra={'reddit_object': reddit_object.name})
+        return True
+
     def send_unfinished_downloads(self):
         if not self.queued_posts.empty():
             for post in self.queued_posts.get():
@@ -363,6 +627,7 @@ class DownloadRunner(QObject):
         where a user has already been validated in order to skip the somewhat expensive process of validation
         """
         for x in self.user_list:
+            x.load_collections()
             self.validated_objects.put(x)
 
     def update_progress_bar(self):
@@ -375,13 +640,20 @@ class ExtractionRunner(QObject):
     update_progress_bar = pyqtSignal()
     send_object = pyqtSignal(tuple)
 
-    def __init__(self, queue, valid_objects, post_queue, user_extract):
+    # The number of extractions per worker thread that may be submitted before the oldest extraction is waited on.
+    EXTRACTION_LIMIT_MULTIPLIER = 2
+
+    def __init__(self, queue, valid_objects, post_queue, user_extract, thread_count=4):
         """
-        A class that is extracts downloadable links from container websites who's links have been posted to reddit
+        A class that is extracts downloadable links from container websites who's links have been posted to reddit.
+        The posts of each reddit object are extracted on a pool of worker threads so that requests to container
+        websites are made at the same time, but each reddit object's content is handled and sent to the downloader in
+        the order that the objects were validated and the posts were made.
 
         :param queue: The main window queue used to update the GUI output box
         :param valid_objects: Users or subreddits that have been validated
         :param post_queue: The queue where downloadable links are passed to be downloaded by the downloader thread
+        :param thread_count: The number of posts that may be extracted at the same time.
         """
         super().__init__()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
@@ -389,44 +661,82 @@ class ExtractionRunner(QObject):
         self.validated_objects = valid_objects
         self.post_queue = post_queue
         self.user_extract = user_extract
+        self.thread_count = max(1, thread_count)
+        self.extraction_limit = self.thread_count * self.EXTRACTION_LIMIT_MULTIPLIER
+        self.extractions = deque()
+        self.extraction_count = 0
         self.extract_count = 0
         self.run = True
 
     def run_extraction(self):
         """
         Runs the extractor for each user or subreddit object taken from the queue.  This method also handles sending
-        update info to the main window and sending content to the downloader.
+        update info to the main window and sending content to the downloader.  Each post is submitted to the worker
+        threads as soon as it is read from the reddit object's submission stream, and the extractions are handled in
+        the order that they were submitted.
         """
-        self.logger.info('Extraction Runner started')
-        while self.run:
-            working_object = self.validated_objects.get()
-            if working_object is not None:
+        self.logger.info('Extraction Runner started', extra={'thread_count': self.thread_count})
+        with ThreadPoolExecutor(max_workers=self.thread_count) as executor:
+            while self.run:
+                working_object = self.validated_objects.get()
+                if working_object is None:
+                    break
                 working_object.load_unfinished_downloads()
-                self.extract(working_object)
-
-                if len(working_object.failed_extracts) > 0:
-                    for entry in working_object.failed_extracts:
-                        self.queue.put(entry)
-                if len(working_object.content) > 0:
-                    self.queue.put('Count %s' % len(working_object.content))
-                    self.send_object.emit((working_object.name, [x.filename for x in working_object.content]))
-                for post in working_object.content:
-                    self.extract_count += 1
-                    post.queue = self.queue
-                    self.post_queue.put(post)
-                self.update_progress_bar.emit()
-            else:
-                self.run = False
+                extractor = Extractor(working_object)
+                for post in extractor.get_posts():
+                    if not self.run:
+                        break
+                    self.extractions.append((extractor, post, executor.submit(extractor.run_extractor, post)))
+                    self.extraction_count += 1
+                    self.finish_extractions(self.extraction_limit)
+                self.extractions.append((extractor, None, None))
+                self.finish_extractions(0 if self.validated_objects.empty() else self.extraction_limit)
+            self.finish_extractions(0)
+            for extractor, post, future in self.extractions:
+                if future is not None:
+                    future.cancel()
         self.finish()
 
-    def extract(self, reddit_object):
+    def finish_extractions(self, limit):
         """
-        Creates an extractor object, supplies it with the current reddit object, and runs the extraction process.
-        :param reddit_object: The reddit object for which content is to be extracted.
-        :type reddit_object: RedditObject
+        Handles the submitted extractions in the order that they were submitted.  Extractions that have finished are
+        always handled, and if more than the supplied limit are still outstanding this waits for the oldest ones to
+        finish.  Once every extraction for a reddit object has been handled, its content is sent to the downloader.
+        :param limit: The number of extractions that may be left outstanding.
+        :type limit: int
+        """
+        while self.run and len(self.extractions) > 0:
+            extractor, post, future = self.extractions[0]
+            if post is None:
+                self.extractions.popleft()
+                extractor.update_date_limit()
+                self.send_content(extractor.reddit_object)
+                continue
+            if self.extraction_count <= limit and not future.done():
+                break
+            self.extractions.popleft()
+            self.extraction_count -= 1
+            extractor.extract(post, future)
+
+    def send_content(self, working_object):
         """
-        extractor = Extractor(reddit_object)
-        extractor.run()
+        Sends the extracted content of the supplied reddit object to the downloader and reports any failed extractions
+        to the main window.
+        :param working_object: The reddit object whose content has been extracted.
+        :type working_object: RedditObject
+        """
+        if len(working_object.failed_extracts) > 0:
+            for entry in working_object.failed_extracts:
+                self.queue.put(entry)
+        if len(working_object.content) > 0:
+            self.queue.put('Count %s' % len(working_object.content))
+            self.send_object.emit((working_object.name, [x.filename for x in working_object.content]))
+        for post in working_object.content:
+            self.extract_count += 1
+            post.queue = self.queue
+            post.reddit_object_name = working_object.name
+            self.post_queue.put(post)
+        self.update_progress_bar.emit()
 
     def finish(self):
         """
@@ -443,37 +753,289 @@ class ExtractionRunner(QObject):
 class Downloader(QObject):
 
     finished = pyqtSignal()
+    transfer_stats = pyqtSignal(dict)
+
+    # The number of threads that request the size of content when the smallest first download order is used.
+    SIZE_LOOKUP_THREAD_COUNT = 8
 
-    def __init__(self, queue, thread_limit):
+    def __init__(self, queue, thread_limit, host_thread_limit, policy=DownloadScheduler.ROUND_ROBIN):
         """
         Class that spawns the separate download threads.  This is a separate class so it can be moved to its own thread
         and run simultaneously with post extraction.
 
         :param queue: The download queue in which extracted content is placed
+        :param thread_limit: The maximum number of downloads that may run at the same time.
+        :param host_thread_limit: The maximum number of downloads from a single host that may run at the same time.
+        :param policy: The scheduling policy that determines the order content is downloaded in.
         """
         super().__init__()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
         self.queue = queue
         self.download_count = 0
+        self.started_posts = []
         self.run = True
 
+        self.scheduler = DownloadScheduler(thread_limit, host_thread_limit, policy)
+        self.retry_policy = Core.Injector.get_retry_policy()
+        self.retry_policy.max_retries = Core.Injector.get_settings_manager().max_download_retries
+        self.setup_workers(thread_limit)
+
+    def setup_workers(self, thread_limit):
+        """Creates the download thread pool and sizes the shared session's connection pools to match it."""
         self.download_pool = QThreadPool()
         self.download_pool.setMaxThreadCount(thread_limit)
+        self.session_manager = Core.Injector.get_session_manager()
+        self.session_manager.configure(thread_limit)
 
     def download(self):
-        """Spawns the download pool threads"""
+        """
+        Spawns the download pool threads.  Content is moved from the download queue into the scheduler on a separate
+        thread so that content can be dispatched to the pool as soon as a host has a free download slot.
+        """
         self.logger.info('Downloader started')
+        intake_thread = threading.Thread(target=self.fill_scheduler, daemon=True)
+        intake_thread.start()
         while self.run:
-            post = self.queue.get()
+            post = self.scheduler.get()
             if post is not None:
+                post.download_finished_callback = self.post_finished
                 self.download_pool.start(post)
-                self.download_count += 1
+                self.add_started_post(post)
             else:
                 self.run = False
         self.download_pool.waitForDone()
-        self.logger.info('Downloader finished', extra={'download_count': self.download_count})
+        self.logger.info('Downloader finished', extra={'download_count': self.download_count,
+                                                       'session_stats': self.session_manager.json,
+                                                       'host_stats': self.scheduler.get_host_stats(),
+                                                       'transfer_stats': self.get_transfer_stats()})
+        self.transfer_stats.emit(self.get_transfer_stats())
         self.finished.emit()
 
+    def fill_scheduler(self):
+        """
+        Moves content from the download queue into the scheduler until the end of the queue is reached.  If the content
+        is to be downloaded smallest first, the size of each item is requested from its server before it is added.
+        """
+        if self.scheduler.policy == DownloadScheduler.SMALLEST_FIRST:
+            with ThreadPoolExecutor(max_workers=self.SIZE_LOOKUP_THREAD_COUNT) as executor:
+                for post in iter(self.queue.get, None):
+                    executor.submit(self.measure_and_put, post)
+        else:
+            for post in iter(self.queue.get, None):
+                if self.run:
+                    self.scheduler.put(post)
+        self.scheduler.close()
+
+    def measure_and_put(self, post):
+        """Requests the size of the supplied content item and then adds it to the scheduler."""
+        if self.run:
+            post.request_content_length()
+            self.scheduler.put(post)
+
+    def add_started_post(self, post):
+        """
+        Records a post that has been dispatched.  Posts that are being retried have already been recorded.  A post that
+        is dispatched while the downloader is being stopped is stopped here, because stop may already have stopped the
+        posts that had been recorded.
+        """
+        if post.run_retry_count == 0:
+            self.started_posts.append(post)
+            self.download_count += 1
+        if not self.run:
+            post.stop()
+
+    def post_finished(self, post):
+        """
+        Called when a download attempt has finished.  If the post failed in a way that should be retried, it is given
+        back to the scheduler to be dispatched again once its retry delay has passed.
+        :param post: The content item whose download attempt has finished.
+        :type post: Content
+        """
+        if post.retry_delay is not None and self.run:
+            self.scheduler.put_later(post, post.retry_delay)
+        self.scheduler.task_done(post)
+
+    def get_transfer_stats(self):
+        """
+        Returns the total number of bytes received by the started downloads and the average rate that each download
+        received content at while it was transferring.
+        :rtype: dict
+        """
+        total_bytes = sum(post.bytes_transferred for post in self.started_posts)
+        transfer_time = sum(post.transfer_time for post in self.started_posts)
+        return {'total_bytes': total_bytes, 'transfer_time': round(transfer_time, 3),
+                'linked_files': sum(1 for post in self.started_posts if post.linked),
+                'retried_downloads': sum(1 for post in self.started_posts if post.run_retry_count > 0),
+                'retried_and_downloaded': sum(1 for post in self.started_posts
+                                              if post.run_retry_count > 0 and post.downloaded),
+                'mb_per_second': round(total_bytes / transfer_time / 1048576, 2) if transfer_time > 0 else 0}
+
+    def get_queue_depths(self):
+        """
+        Returns the number of content items that are waiting to be downloaded for each host.
+        :rtype: dict
+        """
+        return self.scheduler.get_queue_depths()
+
     def stop(self):
+        """
+        Stops the download.  Content that has not been dispatched is removed from the scheduler and content that is
+        downloading is stopped.  This is called from the download runner's thread while the downloader's thread is
+        busy dispatching content, so it only uses parts of the downloader that are safe to use from another thread.
+        """
         self.run = False
-        self.download_pool.clear()
+        self.scheduler.clear()
+        if self.download_pool is not None:
+            self.download_pool.clear()
+        for post in list(self.started_posts):
+            post.stop()
+
+
+class AsyncDownloader(Downloader):
+
+    # The number of threads that file system work, such as opening, writing, and moving files, is run on so that slow
+    # disk calls do not stall the event loop.
+    DISK_THREAD_COUNT = 8
+
+    def __init__(self, queue, download_limit, host_download_limit, policy=DownloadScheduler.ROUND_ROBIN):
+        """
+        An alternative to the thread pool based Downloader which downloads every content item on a single asyncio event
+        loop.  This allows hundreds of transfers to be in progress at the same time without an OS thread for each one.
+        Content is taken from the same scheduler as the thread pool downloader and progress is reported through each
+        content item's queue in the same way.  Requires the optional aiohttp package.
+
+        :param queue: The download queue in which extracted content is placed
+        :param download_limit: The maximum number of downloads that may be in progress at the same time.
+        :param host_download_limit: The maximum number of downloads from a single host that may be in progress at the
+                                    same time.
+        :param policy: The scheduling policy that determines the order content is downloaded in.
+        """
+        super().__init__(queue, download_limit, host_download_limit, policy)
+        self.disk_executor = None
+        self.loop = None
+        self.stop_event = None  # Set on the event loop when the downloader is stopped to end bandwidth limit waits
+
+    @staticmethod
+    def available():
+        """Returns True if the packages needed by the async downloader are installed."""
+        return aiohttp is not None
+
+    def setup_workers(self, thread_limit):
+        """The event loop is created when the download starts so there are no workers to set up here."""
+        self.download_pool = None
+
+    def download(self):
+        """Runs the event loop until all content has been downloaded or the downloader is stopped."""
+        self.logger.info('Async downloader started')
+        intake_thread = threading.Thread(target=self.fill_scheduler, daemon=True)
+        intake_thread.start()
+        loop = self.loop = asyncio.new_event_loop()
+        self.disk_executor = ThreadPoolExecutor(max_workers=self.DISK_THREAD_COUNT)
+        try:
+            loop.run_until_complete(self.run_downloads(loop))
+        finally:
+            loop.close()
+            self.disk_executor.shutdown()
+        self.logger.info('Async downloader finished', extra={'download_count': self.download_count,
+                                                             'host_stats': self.scheduler.get_host_stats(),
+                                                             'transfer_stats': self.get_transfer_stats()})
+        self.transfer_stats.emit(self.get_transfer_stats())
+        self.finished.emit()
+
+    async def run_downloads(self, loop):
+        """
+        Takes content from the scheduler and starts a download task for each item until the scheduler is empty, then
+        waits for the remaining tasks to finish.
+        """
+        connector = aiohttp.TCPConnector(limit=self.scheduler.global_limit,
+                                         limit_per_host=self.scheduler.host_limit)
+        tasks = set()
+        self.stop_event = asyncio.Event()
+        if not self.run:
+            self.stop_event.set()
+        async with aiohttp.ClientSession(connector=connector) as session:
+            while self.run:
+                post = await loop.run_in_executor(None, self.scheduler.get)
+                if post is not None:
+                    task = loop.create_task(self.download_post(session, post))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    self.add_started_post(post)
+                else:
+                    self.run = False
+            if len(tasks) > 0:
+                await asyncio.wait(tasks)
+
+    async def download_post(self, session, post):
+        """
+        Downloads a single content item.  This mirrors Content.run and uses the content item's own methods for resuming,
+        writing, and error handling so that the result is the same no matter which downloader is used.  Every call
+        that touches the file system is run on the disk threads so that the event loop only waits on the network.
+        :param session: The aiohttp session that the request is made through.
+        :param post: The content item that is to be downloaded.
+        :type post: Content
+        """
+        post.retry_delay = None
+        try:
+            await self.run_on_disk_thread(post.check_save_path_subreddit)
+            resume_position = await self.run_on_disk_thread(post.get_resume_position)
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=post.REQUEST_TIMEOUT[0],
+                                            sock_read=post.REQUEST_TIMEOUT[1])
+            response = await session.get(post.url, headers=post.get_request_headers(resume_position), timeout=timeout)
+            if post.check_range_mismatch(response.status, response.headers, resume_position):
+                response.release()
+                resume_position = await self.run_on_disk_thread(post.restart_download)
+                response = await session.get(post.url, timeout=timeout)
+            async with response:
+                position = post.get_write_position(response.status, response.headers, resume_position)
+                if position is not None:
+                    start_time = time()
+                    expected_size = post.get_expected_size(response.headers, position)
+                    writer = await self.run_on_disk_thread(post.open_part_file, position, expected_size)
+                    try:
+                        async for chunk in response.content.iter_chunked(writer.write_size):
+                            if post.stopped:
+                                return None
+                            delay = await self.run_on_disk_thread(post.write_chunk, writer, chunk)
+                            if delay > 0:
+                                await self.wait_for_stop(delay)
+                    finally:
+                        await self.run_on_disk_thread(writer.close)
+                        post.transfer_time += time() - start_time
+                    if not post.stopped:
+                        await self.run_on_disk_thread(post.finish_download)
+                elif post.check_part_complete(response.status, response.headers, resume_position):
+                    await self.run_on_disk_thread(post.finish_download)
+                else:
+                    post.handle_unsuccessful_response(response.status, response.headers.get('Retry-After'))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            post.handle_connection_error()
+        except Exception:
+            post.handle_exception()
+        finally:
+            self.post_finished(post)
+
+    async def wait_for_stop(self, timeout):
+        """Waits for the supplied number of seconds, or until the downloader is stopped if that happens first."""
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self):
+        """Stops the download and wakes any download that is waiting for the bandwidth limit."""
+        super().stop()
+        loop = self.loop
+        stop_event = self.stop_event
+        if loop is not None and stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass  # The event loop has already been closed
+
+    def run_on_disk_thread(self, method, *args):
+        """
+        Runs a blocking file system call on one of the disk threads.
+        :return: An awaitable for the result of the call.
+        """
+        return asyncio.get_running_loop().run_in_executor(self.disk_executor, method, *args)
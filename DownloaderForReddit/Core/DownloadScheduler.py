@@ -0,0 +1,261 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+import heapq
+import itertools
+from collections import deque
+from time import monotonic
+
+
+class DownloadScheduler:
+
+    # Content is downloaded in an order that is fair between each user and subreddit in the download
+    ROUND_ROBIN = 'ROUND_ROBIN'
+    # The smallest files are downloaded first
+    SMALLEST_FIRST = 'SMALLEST_FIRST'
+    # Content is downloaded in the order it was extracted
+    FIFO = 'FIFO'
+
+    def __init__(self, global_limit, host_limit, policy=ROUND_ROBIN):
+        """
+        Sits between the extracted content queue and the download thread pool and decides which content item is to be
+        downloaded next.  Content is queued separately for each host and hosts are dispatched in round robin order so
+        that a large backlog from one host does not hold up content from the other hosts.  The number of simultaneous
+        downloads is limited both overall and for each individual host.
+
+        Within each host, content is ordered by the supplied policy.  Content from reddit objects that have been given
+        priority, such as an object that the user has asked to download right away, is always dispatched ahead of all
+        other content regardless of the policy or host order.
+
+        :param global_limit: The maximum number of content items that may be downloading at the same time.
+        :param host_limit: The maximum number of content items from a single host that may be downloading at the same
+                           time.
+        :param policy: The order in which content from the same host is downloaded.  One of ROUND_ROBIN,
+                       SMALLEST_FIRST, or FIFO.
+        :type global_limit: int
+        :type host_limit: int
+        :type policy: str
+        """
+        self.global_limit = max(1, global_limit)
+        self.host_limit = max(1, host_limit)
+        self.policy = policy
+        self.condition = threading.Condition()
+        self.host_queues = {}
+        self.host_order = deque()
+        self.active = {}
+        self.active_count = 0
+        self.dispatched = {}
+        self.delayed = []
+        self.counter = itertools.count()
+        self.object_rounds = {}
+        self.priority_objects = set()
+        self.closed = False
+
+    def put(self, post):
+        """
+        Adds a content item to the queue of the host that it is to be downloaded from.
+        :param post: The content item that is to be downloaded.
+        :type post: Content
+        """
+        with self.condition:
+            self.add_to_host_queue(post)
+            self.condition.notify_all()
+
+    def add_to_host_queue(self, post):
+        """Adds a content item to its host's queue in policy order.  Must be called while holding the condition lock."""
+        host = post.host
+        if host not in self.host_queues:
+            self.host_queues[host] = []
+            self.host_order.append(host)
+        heapq.heappush(self.host_queues[host], (self.get_sort_key(post), post))
+
+    def get_sort_key(self, post):
+        """
+        Returns the key that the supplied content item is ordered by in its host queue.  The first element of the key is
+        the priority rank of the item, the remaining elements depend on the scheduling policy.  Each key ends with a
+        unique sequence number so that items are never compared directly and items with otherwise equal keys stay in
+        the order they were added.  Must be called while holding the condition lock.
+        """
+        rank = 0 if post.reddit_object_name in self.priority_objects else 1
+        sequence = next(self.counter)
+        if self.policy == self.ROUND_ROBIN:
+            # The nth item from each reddit object is downloaded before the n+1th item from any object
+            object_round = self.object_rounds.get(post.reddit_object_name, 0)
+            self.object_rounds[post.reddit_object_name] = object_round + 1
+            return rank, object_round, sequence
+        elif self.policy == self.SMALLEST_FIRST:
+            size = post.content_length if post.content_length is not None else float('inf')
+            return rank, size, sequence
+        return rank, sequence
+
+    def prioritize(self, reddit_object_name):
+        """
+        Gives priority to all content from the supplied reddit object, including content that is already queued and
+        content that is added later, so that it is downloaded ahead of all other content.
+        :param reddit_object_name: The name of the user or subreddit whose content is to be downloaded first.
+        :type reddit_object_name: str
+        """
+        with self.condition:
+            self.priority_objects.add(reddit_object_name)
+            for queue in self.host_queues.values():
+                for index, item in enumerate(queue):
+                    key, post = item
+                    if post.reddit_object_name == reddit_object_name:
+                        queue[index] = ((0,) + key[1:], post)
+                heapq.heapify(queue)
+            self.condition.notify_all()
+
+    def put_later(self, post, delay):
+        """
+        Adds a content item to its host's queue once the supplied delay has passed.  This is used to retry failed
+        downloads without holding a download slot while waiting.
+        :param post: The content item that is to be downloaded again.
+        :param delay: The number of seconds to wait before the item is queued.
+        :type post: Content
+        :type delay: float
+        """
+        with self.condition:
+            heapq.heappush(self.delayed, (monotonic() + delay, next(self.counter), post))
+            self.condition.notify_all()
+
+    def release_delayed(self):
+        """
+        Moves delayed content items whose delay has passed into their host queues and returns the number of seconds
+        until the next delayed item is due, or None if there are no delayed items.  Must be called while holding the
+        condition lock.
+        """
+        now = monotonic()
+        while len(self.delayed) > 0 and self.delayed[0][0] <= now:
+            self.add_to_host_queue(heapq.heappop(self.delayed)[2])
+        return self.delayed[0][0] - now if len(self.delayed) > 0 else None
+
+    def close(self):
+        """Indicates that no more content will be added to the scheduler."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def get(self):
+        """
+        Blocks until a content item can be downloaded without going over the global or host limits, then returns the
+        item.  None is returned once the scheduler has been closed, all queued content has been dispatched, and all
+        dispatched content has finished without being scheduled to be retried.
+        :return: The next content item to be downloaded, or None if there is no more content.
+        :rtype: Content
+        """
+        with self.condition:
+            while True:
+                next_due = self.release_delayed()
+                post = self.next_post()
+                if post is not None:
+                    return post
+                if self.closed and len(self.host_order) == 0 and self.active_count == 0 and next_due is None:
+                    return None
+                self.condition.wait(next_due)
+
+    def next_post(self):
+        """
+        Returns the next post from the first host in round robin order that is under its download limit, or None if
+        there is no host that can currently be dispatched.  A host whose next item has a higher priority rank than the
+        next item of the other hosts is dispatched first.  Must be called while holding the condition lock.
+        """
+        if self.active_count >= self.global_limit:
+            return None
+        selected = None
+        for index, host in enumerate(self.host_order):
+            if self.active.get(host, 0) < self.host_limit:
+                rank = self.host_queues[host][0][0][0]
+                if selected is None or rank < selected[2]:
+                    selected = (index, host, rank)
+        if selected is None:
+            return None
+        index, host, _ = selected
+        del self.host_order[index]
+        post = heapq.heappop(self.host_queues[host])[1]
+        if len(self.host_queues[host]) > 0:
+            self.host_order.append(host)
+        else:
+            del self.host_queues[host]
+        self.active[host] = self.active.get(host, 0) + 1
+        self.active_count += 1
+        self.dispatched[host] = self.dispatched.get(host, 0) + 1
+        return post
+
+    def task_done(self, post):
+        """
+        Releases the download slot held by the supplied content item so that another item from the same host may be
+        dispatched.
+        :param post: The content item that has finished downloading.
+        :type post: Content
+        """
+        with self.condition:
+            host = post.host
+            self.active[host] = self.active.get(host, 1) - 1
+            self.active_count -= 1
+            self.condition.notify_all()
+
+    def clear(self):
+        """
+        Removes all content that has not yet been dispatched from the scheduler and closes it.
+        :return: A list of the content items that were removed.
+        :rtype: list
+        """
+        with self.condition:
+            removed = []
+            for host in self.host_order:
+                removed.extend(item[1] for item in sorted(self.host_queues[host], key=lambda item: item[0]))
+            removed.extend(item[2] for item in self.delayed)
+            self.host_queues.clear()
+            self.host_order.clear()
+            self.delayed.clear()
+            self.closed = True
+            self.condition.notify_all()
+            return removed
+
+    def get_queue_depths(self):
+        """
+        Returns the number of content items that are currently waiting to be downloaded for each host.
+        :rtype: dict
+        """
+        with self.condition:
+            return {host: len(queue) for host, queue in self.host_queues.items()}
+
+    def get_delayed_count(self):
+        """Returns the number of content items that are waiting to be retried."""
+        with self.condition:
+            return len(self.delayed)
+
+    def get_host_stats(self):
+        """
+        Returns a dict of the queued, active, and total dispatched download counts for each host the scheduler has
+        seen.
+        :rtype: dict
+        """
+        with self.condition:
+            return {host: {'queued': len(self.host_queues.get(host, ())),
+                           'active': self.active.get(host, 0),
+                           'dispatched': self.dispatched.get(host, 0)}
+                    for host in set(self.dispatched) | set(self.host_queues)}
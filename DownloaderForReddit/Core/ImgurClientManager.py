@@ -0,0 +1,172 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+import time
+import logging
+from imgurpython import ImgurClient
+from imgurpython.helpers.error import ImgurClientError
+
+
+class ImgurCreditError(ImgurClientError):
+    """Raised instead of making an imgur request when there are not enough imgur credits left to make it."""
+
+    def __init__(self):
+        super().__init__('Not enough imgur credits', 403)
+
+
+class TrackedImgurClient(ImgurClient):
+
+    def __init__(self, client_id, client_secret, manager):
+        """
+        An ImgurClient that checks with the client manager that there are enough credits before each request and
+        reports the credits remaining after each request.
+
+        :param manager: The client manager that tracks the credits for the client.
+        :type manager: ImgurClientManager
+        """
+        self.manager = manager
+        super().__init__(client_id, client_secret)
+
+    def make_request(self, method, route, data=None, force_anon=False):
+        self.manager.wait_for_credits()
+        try:
+            return super().make_request(method, route, data, force_anon)
+        finally:
+            # The credits are not set yet if the request made while the client is being created fails.
+            self.manager.update_credits(getattr(self, 'credits', None))
+
+
+class ImgurClientManager:
+
+    # The number of client credits that are held back.  Client credits are reset daily, so once the remaining credits
+    # fall to this number no more requests are made.
+    CLIENT_CREDIT_RESERVE = 10
+
+    # The number of user credits that are held back.  User credits are reset hourly.
+    USER_CREDIT_RESERVE = 10
+
+    # The longest time in seconds that requests will be held for the user credits to reset.  If the credits reset
+    # later than this no more requests are made.
+    MAX_WAIT = 300
+
+    def __init__(self):
+        """
+        Holds the single imgur client that is shared by every imgur extractor.  Creating an ImgurClient requests the
+        credits endpoint, so creating one client for every post used an extra imgur credit per post.  The manager also
+        tracks the credits that remain from the rate limit headers of each response, holds back requests before the
+        credits run out, and counts the credits used during each download run.
+
+        The client lock is only held while the client is created so that the request the client makes while it is being
+        created can update the credits, which are guarded by the lock.
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.lock = threading.Lock()
+        self.client_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.client = None
+        self.client_credentials = None
+        self.credits = {}
+        self.request_count = 0
+
+    def get_client(self, client_id, client_secret):
+        """
+        Returns the shared imgur client for the supplied credentials.  A new client is only created the first time this
+        is called or if the credentials have changed.
+        :param client_id: The imgur client id from the settings manager.
+        :param client_secret: The imgur client secret from the settings manager.
+        :return: The shared imgur client.
+        :rtype: ImgurClient
+        :raises ImgurClientError: If the client could not be created.
+        """
+        with self.client_lock:
+            if self.client is None or self.client_credentials != (client_id, client_secret):
+                self.client = TrackedImgurClient(client_id, client_secret, self)
+                self.client_credentials = (client_id, client_secret)
+            return self.client
+
+    def start_run(self):
+        """Resets the count of the credits that have been used so that the count only covers the current run."""
+        self.stop_event.clear()
+        with self.lock:
+            self.request_count = 0
+
+    def stop_run(self):
+        """Ends any wait for the user credits to reset when a download run is stopped."""
+        self.stop_event.set()
+
+    def update_credits(self, credits):
+        """
+        Stores the credit values reported by imgur.  The values are read from the response headers and are only
+        replaced when the header was present.
+        :param credits: The credit dict from the imgur client.
+        :type credits: dict
+        """
+        with self.lock:
+            self.request_count += 1
+            for key, value in (credits or {}).items():
+                try:
+                    self.credits[key] = int(value)
+                except (TypeError, ValueError):
+                    pass
+
+    def get_credit(self, key):
+        with self.lock:
+            return self.credits.get(key)
+
+    def wait_for_credits(self):
+        """
+        Blocks until the user credits reset if they are close to running out and reset soon enough.  The lock is not
+        held while waiting so that other threads can still read and update the credits.
+        :raises ImgurCreditError: If there are not enough credits left to make a request, or if the run is stopped
+                                  while waiting for the credits to reset.
+        """
+        with self.lock:
+            client_remaining = self.credits.get('ClientRemaining')
+            if client_remaining is not None and client_remaining <= self.CLIENT_CREDIT_RESERVE:
+                raise ImgurCreditError()
+            user_remaining = self.credits.get('UserRemaining')
+            if user_remaining is None or user_remaining > self.USER_CREDIT_RESERVE:
+                return None
+            reset = self.credits.get('UserReset')
+        wait_time = reset - time.time() if reset is not None else None
+        if wait_time is None or wait_time > self.MAX_WAIT:
+            raise ImgurCreditError()
+        if wait_time > 0:
+            self.logger.info('Waiting for imgur user credits to reset', extra={'wait_time': round(wait_time, 2)})
+            if self.stop_event.wait(wait_time):
+                raise ImgurCreditError()
+        with self.lock:
+            self.credits.pop('UserRemaining', None)
+
+    def get_stats(self):
+        """
+        Returns the number of credits used during the current run and the credits that remain.
+        :rtype: dict
+        """
+        with self.lock:
+            return {'credits_used': self.request_count,
+                    'client_remaining': self.credits.get('ClientRemaining'),
+                    'user_remaining': self.credits.get('UserRemaining')}
@@ -0,0 +1,160 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+
+from Core import SystemUtil
+
+
+class ImgurMetadataCache:
+
+    ALBUM = 'ALBUM'
+    IMAGE = 'IMAGE'
+
+    # The number of seconds that the images of an album or image are trusted for before they are requested again.
+    TTL = 2592000
+
+    # The maximum number of albums and images that are kept.  The least recently used entries are removed first.
+    MAX_ENTRIES = 20000
+
+    # The number of seconds after which reading an entry records a new access time.  Access times only decide which
+    # entries are removed first, so they do not need to be exact.
+    TOUCH_INTERVAL = 86400
+
+    def __init__(self, cache_path=None, ttl=TTL, max_entries=MAX_ENTRIES):
+        """
+        Keeps the image details that imgur returns for albums and images in a database in the data directory, so that
+        an album or image that is posted more than once, or a saved post that is extracted again, does not need to be
+        requested from imgur again.  The link, type, animated flag, and mp4 link of each image are stored, keyed by
+        the imgur id of the album or image.  Reading an entry does not write to the database.  New access times are
+        kept in memory and written the next time an entry is stored or the cache is closed.
+
+        :param cache_path: The path of the cache database.  The cache is stored in the data directory if no path is
+                           given.
+        :param ttl: The number of seconds that an entry is trusted for.
+        :param max_entries: The maximum number of entries that are kept.
+        :type cache_path: str
+        :type ttl: int
+        :type max_entries: int
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.lock = threading.Lock()
+        self.cache_path = cache_path if cache_path is not None else self.get_cache_path()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.connection = None
+        self.touched = {}  # The access times that have not yet been written, keyed by entry key
+
+    @staticmethod
+    def get_cache_path():
+        return os.path.join(SystemUtil.get_data_directory(), 'imgur_cache.db')
+
+    @staticmethod
+    def get_key(kind, imgur_id):
+        return '%s:%s' % (kind, imgur_id)
+
+    def connect(self):
+        """Opens the cache database the first time it is needed.  Must be called with the lock held."""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.cache_path, check_same_thread=False)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS imgur_metadata (key TEXT PRIMARY KEY, '
+                                    'images TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS imgur_metadata_accessed ON imgur_metadata (accessed)')
+            self.connection.commit()
+        return self.connection
+
+    def get(self, kind, imgur_id):
+        """
+        Returns the cached images for the supplied album or image id.
+        :param kind: Either ALBUM or IMAGE.
+        :param imgur_id: The imgur id of the album or image.
+        :return: A list of image dicts, or None if there is no unexpired entry for the id.
+        :rtype: list
+        """
+        key = self.get_key(kind, imgur_id)
+        now = time.time()
+        try:
+            with self.lock:
+                connection = self.connect()
+                row = connection.execute('SELECT images, created, accessed FROM imgur_metadata WHERE key = ?',
+                                         (key,)).fetchone()
+                if row is None or now - row[1] >= self.ttl:
+                    return None  # Expired entries are replaced when the entry is stored again
+                if now - max(row[2], self.touched.get(key, 0)) >= self.TOUCH_INTERVAL:
+                    self.touched[key] = now
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            self.logger.error('Failed to read imgur cache', extra={'key': key}, exc_info=True)
+            return None
+
+    def put(self, kind, imgur_id, images):
+        """
+        Stores the images for the supplied album or image id and removes the least recently used entries if the cache
+        is over its maximum size.
+        :param kind: Either ALBUM or IMAGE.
+        :param imgur_id: The imgur id of the album or image.
+        :param images: A list of image dicts.
+        :type images: list
+        """
+        key = self.get_key(kind, imgur_id)
+        now = time.time()
+        try:
+            with self.lock:
+                connection = self.connect()
+                self.write_touched()
+                self.touched.pop(key, None)
+                connection.execute('INSERT OR REPLACE INTO imgur_metadata (key, images, created, accessed) '
+                                   'VALUES (?, ?, ?, ?)', (key, json.dumps(images), now, now))
+                connection.execute('DELETE FROM imgur_metadata WHERE key IN (SELECT key FROM imgur_metadata '
+                                   'ORDER BY accessed DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+                connection.commit()
+        except sqlite3.Error:
+            self.logger.error('Failed to save imgur cache', extra={'key': key}, exc_info=True)
+
+    def write_touched(self):
+        """
+        Writes the access times that have been recorded since they were last written.  Must be called with the lock
+        held and the connection open.  The caller commits the write.
+        """
+        if self.touched:
+            self.connection.executemany('UPDATE imgur_metadata SET accessed = ? WHERE key = ?',
+                                        [(accessed, key) for key, accessed in self.touched.items()])
+            self.touched = {}
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                try:
+                    self.write_touched()
+                    self.connection.commit()
+                except sqlite3.Error:
+                    self.logger.error('Failed to save imgur cache access times', exc_info=True)
+                self.connection.close()
+                self.connection = None
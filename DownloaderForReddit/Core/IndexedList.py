@@ -0,0 +1,127 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+class IndexedList:
+
+    def __init__(self, items=None, key_attribute=None):
+        """
+        A list that also keeps a hash index of its items so that checking whether an item is in the list takes the
+        same time no matter how long the list is.  Items keep the order that they were added in and can be accessed
+        and deleted by position like a normal list.  The list may contain the same item more than once.
+
+        :param items: An iterable of items that the list starts with.
+        :param key_attribute: The name of the attribute of each item that the index is keyed by.  If no attribute is
+                              given the items themselves are used as the keys and must be hashable.
+        :type key_attribute: str
+        """
+        self.key_attribute = key_attribute
+        self.items = []
+        self.index = {}
+        self.saved_length = None  # The number of items at the start of the list that are known to have been saved
+        if items is not None:
+            self.extend(items)
+
+    def get_key(self, item):
+        return item if self.key_attribute is None else getattr(item, self.key_attribute)
+
+    def add_key(self, key):
+        self.index[key] = self.index.get(key, 0) + 1
+
+    def remove_key(self, key):
+        count = self.index.get(key, 0) - 1
+        if count > 0:
+            self.index[key] = count
+        else:
+            self.index.pop(key, None)
+
+    def append(self, item):
+        self.items.append(item)
+        self.add_key(self.get_key(item))
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def mark_saved(self, length=None):
+        """
+        Records that the first items of the list have been saved, so that only items appended after them need to be
+        saved next time.  Removing any item from the list means the whole list must be saved again.
+        :param length: The number of items that have been saved.  All of the items are considered saved if no length
+                       is given.
+        :type length: int
+        """
+        self.saved_length = len(self.items) if length is None else length
+
+    def contains_key(self, key):
+        """Returns True if an item with the supplied key is in the list."""
+        return key in self.index
+
+    def remove(self, item):
+        self.items.remove(item)
+        self.remove_key(self.get_key(item))
+        self.saved_length = None
+
+    def clear(self):
+        self.items.clear()
+        self.index.clear()
+        self.saved_length = None
+
+    def __contains__(self, item):
+        return self.get_key(item) in self.index
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, position):
+        return self.items[position]
+
+    def __delitem__(self, position):
+        removed = self.items[position]
+        del self.items[position]
+        self.saved_length = None
+        for item in removed if isinstance(position, slice) else (removed,):
+            self.remove_key(self.get_key(item))
+
+    def __eq__(self, other):
+        if isinstance(other, IndexedList):
+            return self.items == other.items
+        return self.items == other
+
+    def __repr__(self):
+        return 'IndexedList(%r)' % self.items
+
+    def __getstate__(self):
+        """Only the items are pickled.  The index is rebuilt when the list is loaded."""
+        return {'items': self.items, 'key_attribute': self.key_attribute}
+
+    def __setstate__(self, state):
+        self.key_attribute = state['key_attribute']
+        self.items = []
+        self.index = {}
+        self.saved_length = None
+        self.extend(state['items'])
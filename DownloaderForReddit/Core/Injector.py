@@ -22,10 +22,27 @@ You should have received a copy of the GNU General Public License
 along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import threading
+
 from Persistence.SettingsManager import SettingsManager
+from Core.SessionManager import SessionManager
+from Core.ContentStore import ContentStore
+from Core.RetryPolicy import RetryPolicy
+from Core.BandwidthLimiter import BandwidthLimiter
+from Core.RedditClientManager import RedditClientManager
+from Core.ImgurClientManager import ImgurClientManager
+from Core.ImgurMetadataCache import ImgurMetadataCache
 
 
 settings_manager = None
+session_manager = None
+content_store = None
+content_store_lock = threading.Lock()
+retry_policy = None
+bandwidth_limiter = None
+reddit_client_manager = None
+imgur_client_manager = None
+imgur_metadata_cache = None
 
 
 def get_settings_manager():
@@ -33,3 +50,61 @@ def get_settings_manager():
     if settings_manager is None:
         settings_manager = SettingsManager()
     return settings_manager
+
+
+def get_session_manager():
+    global session_manager
+    if session_manager is None:
+        session_manager = SessionManager(get_settings_manager().max_download_thread_count)
+    return session_manager
+
+
+def get_content_store():
+    # The content store is first used from the download threads, so it is created under a lock to make sure that
+    # only one store, and one connection to its index, is ever made.
+    global content_store
+    if content_store is None:
+        with content_store_lock:
+            if content_store is None:
+                content_store = ContentStore()
+    return content_store
+
+
+def get_retry_policy():
+    global retry_policy
+    if retry_policy is None:
+        retry_policy = RetryPolicy(get_settings_manager().max_download_retries)
+    return retry_policy
+
+
+def get_bandwidth_limiter():
+    global bandwidth_limiter
+    if bandwidth_limiter is None:
+        settings = get_settings_manager()
+        bandwidth_limiter = BandwidthLimiter(settings.global_download_rate_limit, settings.host_download_rate_limit)
+    return bandwidth_limiter
+
+
+def get_reddit_client_manager():
+    global reddit_client_manager
+    if reddit_client_manager is None:
+        reddit_client_manager = RedditClientManager()
+    return reddit_client_manager
+
+
+def get_reddit_instance():
+    return get_reddit_client_manager().reddit
+
+
+def get_imgur_client_manager():
+    global imgur_client_manager
+    if imgur_client_manager is None:
+        imgur_client_manager = ImgurClientManager()
+    return imgur_client_manager
+
+
+def get_imgur_metadata_cache():
+    global imgur_metadata_cache
+    if imgur_metadata_cache is None:
+        imgur_metadata_cache = ImgurMetadataCache()
+    return imgur_metadata_cache
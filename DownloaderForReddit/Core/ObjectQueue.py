@@ -0,0 +1,74 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+from collections import deque
+from queue import Queue
+
+
+class ObjectQueue(Queue):
+
+    def __init__(self, priority_names=None):
+        """
+        A queue of reddit objects from which objects that the user has asked to download next are taken before all
+        other objects.  Objects are otherwise taken in the order they were put in.  The None that is put in to mark the
+        end of the queue is never moved ahead of an object.
+
+        :param priority_names: The names of the reddit objects that are to be taken first.  The set may be shared with
+                               other queues and is added to by prioritize.
+        :type priority_names: set
+        """
+        self.priority_names = priority_names if priority_names is not None else set()
+        super().__init__()
+
+    def _init(self, maxsize):
+        self.queue = deque()
+        self.priority_queue = deque()
+
+    def _qsize(self):
+        return len(self.queue) + len(self.priority_queue)
+
+    def _put(self, item):
+        if item is not None and item.name in self.priority_names:
+            self.priority_queue.append(item)
+        else:
+            self.queue.append(item)
+
+    def _get(self):
+        if len(self.priority_queue) > 0:
+            return self.priority_queue.popleft()
+        return self.queue.popleft()
+
+    def prioritize(self, name):
+        """
+        Moves the reddit object with the supplied name ahead of every object that has not been prioritized, and makes
+        sure that it is also taken first if it is put in later.
+        :param name: The name of the reddit object that is to be taken next.
+        :type name: str
+        """
+        with self.mutex:
+            self.priority_names.add(name)
+            for item in [x for x in self.queue if x is not None and x.name == name]:
+                self.queue.remove(item)
+                self.priority_queue.append(item)
@@ -0,0 +1,187 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import shelve
+import threading
+import time
+import logging
+import prawcore
+
+from Core import SystemUtil
+
+
+class ObjectValidator:
+
+    # The maximum number of names or ids that reddit accepts in a single info request.
+    BATCH_SIZE = 100
+
+    # The longest number of seconds that a result showing an object to be invalid is trusted for.  Objects that are
+    # banned or suspended can be restored, so invalid results are re-checked sooner than valid results.
+    INVALID_TTL = 86400
+
+    USER = 'USER'
+    SUBREDDIT = 'SUBREDDIT'
+
+    def __init__(self, reddit, ttl, cache_path=None):
+        """
+        Checks whether users and subreddits exist before their submissions are listed.  The result of each check is
+        kept in a cache in the data directory so that objects that were recently found to be valid do not need to be
+        checked again, and objects that were found to be deleted, suspended, or banned are not requested again until
+        the cache entry expires.  Objects that do need to be checked are checked in batches where reddit allows it.
+        An object that is missing from a batch response is not recorded as invalid, because batch responses can leave
+        out objects that do exist.  Its validity is left unknown so that it is looked up directly, and only the result
+        of that lookup is cached.
+
+        Subreddits are checked by name through the info endpoint.  Reddit has no batch endpoint for user names, so a
+        user is checked individually the first time it is seen and its account id is cached.  After that, users are
+        re-checked in batches by account id.
+
+        :param reddit: The praw Reddit instance that requests are made through.
+        :param ttl: The number of seconds that a cached result is trusted for.  Invalid results are trusted for no
+                    longer than INVALID_TTL.
+        :param cache_path: The path of the cache file.  The cache is stored in the data directory if no path is given.
+        :type ttl: int
+        :type cache_path: str
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.reddit = reddit
+        self.ttl = ttl
+        self.cache_path = cache_path if cache_path is not None else self.get_cache_path()
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    @staticmethod
+    def get_cache_path():
+        return os.path.join(SystemUtil.get_data_directory(), 'validity_cache')
+
+    @staticmethod
+    def get_key(object_type, name):
+        return '%s:%s' % (object_type, name.lower())
+
+    def check_users(self, names):
+        """
+        Returns the known validity of each of the supplied user names.  Users whose cached result has expired and whose
+        account id is known are re-checked in batches.
+        :param names: The names of the users that are to be checked.
+        :type names: list
+        :return: A dict of each name and True if the user is valid, False if it is known not to be, or None if the
+                 user must be checked individually.
+        :rtype: dict
+        """
+        results, expired = self.read_cache(self.USER, names)
+        ids = {entry['fullname']: name for name, entry in expired.items() if entry.get('fullname')}
+        id_list = list(ids)
+        for start in range(0, len(id_list), self.BATCH_SIZE):
+            batch = id_list[start:start + self.BATCH_SIZE]
+            try:
+                found = self.reddit.get('/api/user_data_by_account_ids', params={'ids': ','.join(batch)})
+            except prawcore.PrawcoreException:
+                self.logger.warning('Failed to batch check users', exc_info=True)
+                continue
+            if not isinstance(found, dict):
+                continue
+            for fullname in batch:
+                if fullname in found:
+                    name = ids[fullname]
+                    self.record(self.USER, name, True, fullname)
+                    results[name] = True
+        return results
+
+    def check_subreddits(self, names):
+        """
+        Returns the validity of each of the supplied subreddit names.  Subreddits without an unexpired cached result are
+        checked in batches through the info endpoint.
+        :param names: The names of the subreddits that are to be checked.
+        :type names: list
+        :return: A dict of each name and True if the subreddit is valid, False if it is known not to be, or None if it
+                 must be checked individually.
+        :rtype: dict
+        """
+        results, expired = self.read_cache(self.SUBREDDIT, names)
+        unchecked = [name for name in names if results.get(name) is None]
+        for start in range(0, len(unchecked), self.BATCH_SIZE):
+            batch = unchecked[start:start + self.BATCH_SIZE]
+            try:
+                found = {sub.display_name.lower(): sub.fullname for sub in
+                         self.reddit.get('/api/info', params={'sr_name': ','.join(batch)})}
+            except prawcore.PrawcoreException:
+                self.logger.warning('Failed to batch check subreddits', exc_info=True)
+                continue
+            for name in batch:
+                fullname = found.get(name.lower())
+                if fullname is not None:
+                    self.record(self.SUBREDDIT, name, True, fullname)
+                    results[name] = True
+        return results
+
+    def read_cache(self, object_type, names):
+        """
+        Reads the cached results for the supplied names.
+        :return: A dict of each name and its cached validity, which is None if there is no unexpired result, and a dict
+                 of the names whose cached result has expired and their expired cache entries.
+        :rtype: tuple
+        """
+        results = {name: None for name in names}
+        expired = {}
+        now = time.time()
+        invalid_ttl = min(self.ttl, self.INVALID_TTL)
+        try:
+            with self.lock, shelve.open(self.cache_path, 'c') as cache:
+                for name in names:
+                    entry = cache.get(self.get_key(object_type, name))
+                    if entry is None:
+                        continue
+                    if now - entry['checked'] < (self.ttl if entry['valid'] else invalid_ttl):
+                        results[name] = entry['valid']
+                    else:
+                        expired[name] = entry
+        except Exception:
+            self.logger.error('Failed to read validity cache', extra={'cache_path': self.cache_path}, exc_info=True)
+        return results, expired
+
+    def record(self, object_type, name, valid, fullname=None):
+        """
+        Records the result of a check so that it is written to the cache the next time the cache is saved.  This is
+        safe to call from any thread.
+        """
+        with self.lock:
+            self.pending[self.get_key(object_type, name)] = {'valid': valid, 'fullname': fullname,
+                                                             'checked': time.time()}
+
+    def save(self):
+        """Writes every result that has been recorded since the last save to the cache file."""
+        with self.lock:
+            pending = self.pending
+            self.pending = {}
+            if len(pending) == 0:
+                return None
+            try:
+                with shelve.open(self.cache_path, 'c') as cache:
+                    for key, entry in pending.items():
+                        cache[key] = entry
+            except Exception:
+                self.logger.error('Failed to save validity cache', extra={'cache_path': self.cache_path},
+                                  exc_info=True)
@@ -1,6 +1,14 @@
 
 
+import sys
+
+
 class Post(object):
+
+    # Posts are saved in large numbers by each reddit object, so they are kept small by declaring their attributes as
+    # slots instead of giving each post an attribute dict.
+    __slots__ = ('url', 'author', 'title', 'subreddit', 'created', 'score')
+
     def __init__(self, url, author, title, subreddit, created):
         """
         A class that holds information about a post made on reddit.  This class is used to save post information and
@@ -12,8 +20,31 @@ class Post(object):
         :param created: The epoch time that the post was made.
         """
         self.url = url
-        self.author = author
+        self.author = self.intern(author)
         self.title = title
-        self.subreddit = subreddit
+        self.subreddit = self.intern(subreddit)
         self.created = created
         self.score = None
+
+    @staticmethod
+    def intern(value):
+        """
+        Interns author and subreddit names, which are repeated across the many posts that are saved for the same user
+        or subreddit.
+        """
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def __setstate__(self, state):
+        """
+        Posts pickled before the class used slots have a dict of their attributes as their state instead of the tuple
+        of None and a dict of slot values that is pickled now.
+        :param state: The pickled state of the post.
+        :type state: dict or tuple
+        """
+        if isinstance(state, tuple):
+            state = state[1] or {}
+        self.score = None
+        for name, value in state.items():
+            if name in ('author', 'subreddit'):
+                value = self.intern(value)
+            setattr(self, name, value)
@@ -0,0 +1,111 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+import time
+import logging
+
+
+class RateLimitGate:
+
+    # The longest that the gate will hold requests for, in case the rate limit state reported by the server is invalid.
+    MAX_WAIT = 600
+
+    # The number of remaining requests below which requests are held until the rate limit period resets.
+    RESERVE = 10
+
+    def __init__(self, reserve=RESERVE):
+        """
+        Holds back reddit requests when the rate limit reported by reddit is close to being used up.  Praw spaces out
+        its requests based on the rate limit headers returned by reddit, but it does not account for other threads
+        that are making requests at the same time.  Every request passes through the gate, and the rate limit headers
+        of each response are read back into it.  If the number of requests remaining in the current rate limit period
+        is below the reserve, requests are held until the period resets or the run is stopped.
+
+        :param reserve: The number of remaining requests below which requests are held at the gate.
+        :type reserve: int
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.reserve = reserve
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.remaining = None
+        self.used = None
+        self.reset_timestamp = None
+        self.wait_count = 0
+
+    def wait(self):
+        """
+        Blocks until it is safe to make a request without going over the rate limit, or until the gate is stopped.  The
+        lock is not held while waiting so that other threads can still read and update the rate limit state.
+        """
+        with self.lock:
+            wait_time = self.get_wait_time()
+            if wait_time > 0:
+                self.wait_count += 1
+        if wait_time > 0:
+            self.logger.info('Waiting for reddit rate limit to reset', extra={'wait_time': round(wait_time, 2)})
+            self.stop_event.wait(wait_time)
+
+    def update(self, headers):
+        """
+        Reads the rate limit state from the headers of a response from reddit.  Responses without rate limit headers,
+        such as access token responses, are ignored.
+        :param headers: The headers of the response.
+        """
+        try:
+            remaining = int(float(headers['X-Ratelimit-Remaining']))
+            used = int(headers['X-Ratelimit-Used'])
+            reset_timestamp = time.time() + int(headers['X-Ratelimit-Reset'])
+        except (KeyError, ValueError):
+            return None
+        with self.lock:
+            self.remaining = remaining
+            self.used = used
+            self.reset_timestamp = reset_timestamp
+
+    def get_wait_time(self):
+        """
+        Returns the number of seconds until the rate limit resets if the number of remaining requests is below the
+        reserve, otherwise returns 0.  Must be called with the lock held.
+        :rtype: float
+        """
+        if self.remaining is None or self.remaining >= self.reserve or self.reset_timestamp is None:
+            return 0
+        return min(max(0, self.reset_timestamp - time.time()), self.MAX_WAIT)
+
+    def start(self):
+        """Lets requests be held at the gate again after it has been stopped."""
+        self.stop_event.clear()
+
+    def stop(self):
+        """Releases every request that is being held at the gate and stops requests from being held until restarted."""
+        self.stop_event.set()
+
+    @property
+    def json(self):
+        with self.lock:
+            return {'remaining': self.remaining, 'used': self.used, 'reset_timestamp': self.reset_timestamp,
+                    'wait_count': self.wait_count}
@@ -0,0 +1,160 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+import requests
+import praw
+import prawcore
+import logging
+
+from Core.RateLimitGate import RateLimitGate
+from version import __version__
+
+
+USER_AGENT = 'python:DownloaderForReddit:%s (by /u/MalloyDelacroix)' % __version__
+CLIENT_ID = 'frGEUVAuHGL2PQ'
+
+
+class CountingRequestor(prawcore.Requestor):
+
+    def __init__(self, *args, on_request=None, rate_limit_gate=None, session_factory=requests.Session, **kwargs):
+        """
+        A praw requestor that reports each request that is made to reddit, including the requests that fetch an
+        access token, before passing the request on.  A requests session should not be shared between threads, so each
+        thread that makes a request through the shared praw instance is given its own session.  This lets the
+        validation threads make their requests at the same time while still sharing the praw instance's access token
+        and the rate limit gate.
+
+        :param on_request: A callable that is called before each request is made.
+        :param rate_limit_gate: The gate that each request waits at if the rate limit is close to being used up, and
+                                which is updated with the rate limit headers of each response.
+        :param session_factory: A callable that returns a new session for a thread that has not made a request yet.
+        :type rate_limit_gate: RateLimitGate
+        """
+        self.local = threading.local()
+        self.session_factory = session_factory
+        self.base_session = None
+        super().__init__(*args, **kwargs)
+        self.on_request = on_request
+        self.rate_limit_gate = rate_limit_gate
+
+    @property
+    def _http(self):
+        """
+        Returns the session of the calling thread.  Prawcore makes every request through this attribute.  A thread's
+        session is created with the same headers as the session that the requestor was created with.
+        """
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.session_factory()
+            session.headers.update(self.base_session.headers)
+            self.local.session = session
+        return session
+
+    @_http.setter
+    def _http(self, session):
+        self.base_session = session
+        self.local.session = session
+
+    def request(self, *args, **kwargs):
+        if self.on_request is not None:
+            self.on_request()
+        if self.rate_limit_gate is not None:
+            self.rate_limit_gate.wait()
+        response = super().request(*args, **kwargs)
+        if self.rate_limit_gate is not None:
+            self.rate_limit_gate.update(response.headers)
+        return response
+
+
+class RedditClientManager:
+
+    def __init__(self):
+        """
+        Holds the single praw Reddit instance that the application makes all of its reddit requests through.  Creating
+        a new praw instance for each run means that a new access token has to be fetched and a new connection to reddit
+        has to be opened every time.  The shared instance keeps its access token until it expires, at which point praw
+        fetches a new one, and keeps its connections to reddit open in its own requests session.  The instance is
+        created the first time that it is requested.  The instance may be shared between threads because its requestor
+        gives each thread its own requests session.  Praw objects, such as listing generators, should still only be
+        used by the thread that created them.
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.lock = threading.Lock()
+        self.session = None
+        self._reddit = None
+        self.request_count = 0
+        self.rate_limit_gate = RateLimitGate()
+
+    @property
+    def reddit(self):
+        """
+        Returns the shared praw Reddit instance, creating it if it does not yet exist.
+        :rtype: praw.Reddit
+        """
+        with self.lock:
+            if self._reddit is None:
+                self._reddit = self.make_reddit()
+            return self._reddit
+
+    def make_reddit(self):
+        self.session = requests.Session()
+        self.logger.debug('Creating shared reddit instance')
+        return praw.Reddit(user_agent=USER_AGENT, client_id=CLIENT_ID, client_secret=None,
+                           requestor_class=CountingRequestor,
+                           requestor_kwargs={'session': self.session, 'on_request': self.count_request,
+                                             'rate_limit_gate': self.rate_limit_gate})
+
+    def count_request(self):
+        with self.lock:
+            self.request_count += 1
+
+    def start_run(self):
+        """Called at the start of each download run so that requests are held at the rate limit gate again."""
+        self.rate_limit_gate.start()
+
+    def stop_run(self):
+        """Releases any requests that are waiting for the rate limit to reset when a download run is stopped."""
+        self.rate_limit_gate.stop()
+
+    def get_rate_limit(self):
+        """
+        Returns the rate limit state most recently reported by reddit in the headers of a response.  Each value is None
+        until the first response with rate limit headers has been received.
+        :return: A dict of the number of requests remaining and used in the current rate limit period, the time that
+                 the period resets, and the number of times requests have been held at the rate limit gate.
+        :rtype: dict
+        """
+        return self.rate_limit_gate.json
+
+    def get_stats(self):
+        """
+        Returns the number of requests that have been made to reddit along with the current rate limit state.
+        :rtype: dict
+        """
+        stats = self.get_rate_limit()
+        with self.lock:
+            stats['request_count'] = self.request_count
+        return stats
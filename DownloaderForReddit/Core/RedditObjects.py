@@ -23,14 +23,62 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
+import sys
+import time
+
 from Extractors.BaseExtractor import *
 import Core.Injector
 from Core import SystemUtil
+from Core.IndexedList import IndexedList
 from Logging import LogUtils
 
 
 class RedditObject:
 
+    # Every attribute is declared as a slot so that objects do not each carry an attribute dict.  This keeps large
+    # libraries of users and subreddits small in memory.
+    __slots__ = ('version', 'name', 'subreddit_save_method', 'save_path', 'post_limit', 'avoid_duplicates',
+                 'download_videos', 'download_images', 'nsfw_filter', 'name_downloads_by', 'user_added', 'do_not_edit',
+                 'new_submissions', 'saved_submissions', 'previous_downloads', 'date_limit', 'custom_date_limit',
+                 'post_cursor', 'post_cursor_time', 'content', 'failed_extracts', 'saved_content',
+                 'save_undownloaded_content', 'object_type', 'content_display_only', 'store_id', 'collection_counts',
+                 'collection_loader', 'dirty_fields', 'legacy_attributes')
+
+    # Attributes that may be loaded from the object store the first time they are used instead of when the object is
+    # loaded.
+    COLLECTIONS = ('previous_downloads', 'saved_content', 'saved_submissions')
+
+    # Attributes that only belong to the current download session.  These are created the first time they are used.
+    SESSION_ATTRIBUTES = ('new_submissions', 'content', 'failed_extracts')
+
+    # Attributes whose changes do not need to be saved, either because they are not saved or because they are kept by
+    # the object store itself.
+    UNTRACKED_ATTRIBUTES = ('new_submissions', 'content', 'failed_extracts', 'store_id', 'collection_counts',
+                            'collection_loader', 'dirty_fields', 'legacy_attributes')
+
+    # Attributes that hold one of a small set of setting values, or a value that most objects share.  String values of
+    # these attributes are interned so that every object refers to the same string.
+    INTERNED_ATTRIBUTES = ('version', 'save_path', 'nsfw_filter', 'name_downloads_by', 'subreddit_save_method',
+                           'object_type')
+
+    # Values that are shared by every object that has not changed them.  These are not pickled, and attributes that
+    # are not set on an object fall back to them.
+    DEFAULTS = {
+        'subreddit_save_method': None,
+        'do_not_edit': False,
+        'date_limit': 86400,
+        'custom_date_limit': None,
+        'post_cursor': None,
+        'post_cursor_time': 0,
+        'save_undownloaded_content': True,
+        'object_type': None,
+        'content_display_only': False,
+        'store_id': None,
+        'collection_counts': None,
+        'collection_loader': None,
+        'legacy_attributes': None,
+    }
+
     def __init__(self, version, name, save_path, post_limit, avoid_duplicates, download_videos, download_images,
                  nsfw_filter, name_downlads_by, user_added):
         """
@@ -45,6 +93,7 @@ class RedditObject:
         the user/sub had content.  If this variable is anything but 'None' it will be considered. If a user/sub setting
         is set to not restrict download date, it becomes 1.
         """
+        self.store_id = None  # The id of the object in the object store, set when the object is first saved
         self.version = version
         self.name = name
         self.subreddit_save_method = None
@@ -57,21 +106,123 @@ class RedditObject:
         self.name_downloads_by = name_downlads_by
         self.user_added = user_added
         self.do_not_edit = False
-        self.new_submissions = []  # Will be erased at end of download
-        self.saved_submissions = []
-        self.previous_downloads = []
+        # new_submissions, content, and failed_extracts are created when they are first used and are erased at the end
+        # of each download (QRunnable objects cannot be pickled)
+        self.saved_submissions = IndexedList(key_attribute='url')
+        self.previous_downloads = IndexedList()
         self.date_limit = 86400
         self.custom_date_limit = None
-        self.content = []  # Will be erased at end of download (QRunnable objects cannot be pickled)
-        self.failed_extracts = []  # This will be erased at the end of download
+        self.post_cursor = None  # The fullname of the newest post that was extracted on the last run
+        self.post_cursor_time = 0
         self.saved_content = {}
         self.save_undownloaded_content = True
         self.object_type = None
         self.content_display_only = False
+        # collection_counts and collection_loader are set by the object store for objects whose collections have not
+        # been loaded yet.  dirty_fields holds the names of the attributes that have changed since the object was last
+        # saved and is created when the first one changes.
 
     def __str__(self):
         return '%s: %s' % (self.object_type, self.name)
 
+    def __setattr__(self, name, value):
+        if name in self.INTERNED_ATTRIBUTES and isinstance(value, str):
+            value = sys.intern(value)
+        super().__setattr__(name, value)
+        if name not in self.UNTRACKED_ATTRIBUTES and self.store_id is not None:
+            self.mark_dirty(name)
+
+    def mark_dirty(self, name):
+        """
+        Records that an attribute has changed in a way that setting the attribute would not, such as an item being added
+        to or removed from the saved content dict.  Items appended to the indexed list collections are tracked by the
+        lists themselves.
+        :param name: The name of the attribute that has changed.
+        :type name: str
+        """
+        dirty_fields = getattr(self, 'dirty_fields', None)
+        if dirty_fields is None:
+            self.dirty_fields = dirty_fields = set()
+        dirty_fields.add(name)
+
+    def __getattr__(self, name):
+        """
+        Only called for attributes that are not set.  If the object was loaded from the object store without its
+        collections, the collections are loaded the first time one of them is used.  Otherwise the attribute falls
+        back to its shared default, a new empty session list, or a value that was kept from an older version of the
+        object.
+        """
+        if name in self.COLLECTIONS and self.collection_loader is not None:
+            self.load_collections()
+            return object.__getattribute__(self, name)
+        if name in self.DEFAULTS:
+            return self.DEFAULTS[name]
+        if name in self.SESSION_ATTRIBUTES:
+            value = []
+            super().__setattr__(name, value)
+            return value
+        legacy_attributes = self.legacy_attributes
+        if legacy_attributes is not None and name in legacy_attributes:
+            return legacy_attributes[name]
+        raise AttributeError(name)
+
+    def __getstate__(self):
+        """
+        Returns the attributes that are set on the object, leaving out the ones that still hold their shared default.
+        :rtype: dict
+        """
+        state = {}
+        for name in RedditObject.__slots__:
+            try:
+                value = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            if name not in self.DEFAULTS or value != self.DEFAULTS[name]:
+                state[name] = value
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        """
+        Sets the pickled attributes without marking them as changed.  Objects pickled before the class used slots may
+        have attributes that it no longer has, such as already_downloaded.  These are kept in legacy_attributes so that
+        the ObjectUpdater can still transfer them to an updated object.
+        :param state: A dict of the attribute names and values.
+        :type state: dict
+        """
+        legacy_attributes = {}
+        for name, value in state.items():
+            if name in self.INTERNED_ATTRIBUTES and isinstance(value, str):
+                value = sys.intern(value)
+            try:
+                super().__setattr__(name, value)
+            except AttributeError:
+                legacy_attributes[name] = value
+        if legacy_attributes:
+            super().__setattr__('legacy_attributes', legacy_attributes)
+
+    @property
+    def collections_loaded(self):
+        return self.collection_loader is None
+
+    def load_collections(self):
+        """Loads the previous downloads, saved content, and saved submissions if they have not yet been loaded."""
+        loader = self.collection_loader
+        if loader is not None:
+            loader.load_collections(self)
+
+    def get_collection_count(self, name):
+        """
+        Returns the number of items in one of the objects collections without loading the collection.
+        :param name: The attribute name of the collection.
+        :type name: str
+        :rtype: int
+        """
+        counts = self.collection_counts
+        if counts is not None and not self.collections_loaded:
+            return counts[name]
+        return len(getattr(self, name))
+
     @property
     def json(self):
         """
@@ -92,17 +243,17 @@ class RedditObject:
                 'added_on': self.user_added,
                 'do_not_edit': self.do_not_edit,
                 'new_submission_count': len(self.new_submissions) if self.new_submissions is not None else None,
-                'saved_submission_count': len(self.saved_submissions),
-                'previous_download_count': len(self.previous_downloads),
+                'saved_submission_count': self.get_collection_count('saved_submissions'),
+                'previous_download_count': self.get_collection_count('previous_downloads'),
                 'date_limit': self.date_limit,
                 'custom_date_limit': self.custom_date_limit,
                 'content_count': len(self.content),
                 'failed_extract_count': len(self.failed_extracts),
-                'saved_content_count': len(self.saved_content)}
+                'saved_content_count': self.get_collection_count('saved_content')}
 
     @property
     def number_of_downloads(self):
-        return len(self.previous_downloads)
+        return self.get_collection_count('previous_downloads')
 
     @property
     def save_directory(self):
@@ -110,16 +261,23 @@ class RedditObject:
 
     def save_unfinished_downloads(self):
         for content in self.content:
-            if not content.downloaded:
+            if not content.downloaded and not content.permanent_failure:
+                self.mark_dirty('saved_content')
                 self.saved_content[content.url] = [content.user, content.post_title, content.subreddit,
                                                    content.submission_id, content.number_in_seq, content.file_ext,
-                                                   content.date_created]
+                                                   content.date_created, content.bytes_received,
+                                                   content.retry_count]
 
     def load_unfinished_downloads(self):
         try:
+            if self.saved_content:
+                self.mark_dirty('saved_content')
             for key, value in self.saved_content.items():
+                bytes_received = value[7] if len(value) > 7 else 0
+                retry_count = value[8] if len(value) > 8 else 0
                 x = Content(key, value[0], value[1], value[2], value[3], value[4], value[5], self.save_directory,
-                            self.subreddit_save_method, value[6], self.content_display_only)
+                            self.subreddit_save_method, value[6], self.content_display_only, bytes_received,
+                            retry_count)
                 self.content.append(x)
             self.saved_content.clear()
         except:
@@ -134,6 +292,16 @@ class RedditObject:
         if not self.do_not_edit and None is not self.custom_date_limit < last_download_time:
             self.custom_date_limit = None
 
+    def set_post_cursor(self, fullname):
+        """
+        Sets the fullname of the newest post that has been extracted.  This is used as a cursor so that only posts
+        newer than this one are requested from reddit on the next run.
+        :param fullname: The fullname of the post, or None if the cursor is to be cleared.
+        :type fullname: str
+        """
+        self.post_cursor = fullname
+        self.post_cursor_time = time.time()
+
     def check_save_directory(self):
         try:
             SystemUtil.create_directory(self.save_directory)
@@ -150,6 +318,8 @@ class RedditObject:
 
 class User(RedditObject):
 
+    __slots__ = ()
+
     def __init__(self, version, name, save_path, post_limit, avoid_duplicates, download_videos,
                  download_images, nsfw_filter, name_downloads_by, user_added):
         """
@@ -167,6 +337,8 @@ class User(RedditObject):
 
 class Subreddit(RedditObject):
 
+    __slots__ = ()
+
     def __init__(self, version, name, save_path, post_limit, avoid_duplicates, download_videos, download_images,
                  nsfw_filter, subreddit_save_method, name_downloads_by, user_added):
         """
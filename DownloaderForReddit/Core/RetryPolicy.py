@@ -0,0 +1,95 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import random
+
+
+class RetryPolicy:
+
+    # Responses that indicate the server is temporarily unable to serve the file and that the request may succeed if
+    # it is made again later.
+    TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524}
+    # Responses that indicate the file no longer exists and will never be downloadable.
+    PERMANENT_STATUS_CODES = {404, 410}
+
+    BASE_DELAY = 2
+    MAX_DELAY = 120
+
+    def __init__(self, max_retries=3, max_total_retries=10):
+        """
+        Decides whether a failed download should be tried again and how long to wait before doing so.  Transient
+        failures are retried during the same run with an exponentially increasing delay.  Content that is still failing
+        at the end of the run is saved and retried during the next run until it has been retried the maximum total
+        number of times.
+
+        :param max_retries: The number of times a failed download will be retried during a single run.
+        :param max_total_retries: The number of times a download will be retried over all runs before it is given up on.
+        :type max_retries: int
+        :type max_total_retries: int
+        """
+        self.max_retries = max_retries
+        self.max_total_retries = max_total_retries
+
+    def is_transient(self, status_code):
+        """Returns True if the supplied status code is one that may succeed if the request is made again."""
+        return status_code in self.TRANSIENT_STATUS_CODES
+
+    def is_permanent(self, status_code):
+        """Returns True if the supplied status code means that the content will never be downloadable."""
+        return status_code in self.PERMANENT_STATUS_CODES
+
+    def check_exhausted(self, total_retry_count):
+        """Returns True if a download has failed more times over all runs than it is allowed to be retried."""
+        return total_retry_count > self.max_total_retries
+
+    def get_delay(self, run_retry_count, retry_after=None):
+        """
+        Returns the number of seconds to wait before a failed download is retried during the current run, or None if
+        the download should not be retried again until the next run.  The delay doubles with each retry and is
+        randomized so that downloads that failed at the same time do not all retry at the same time.
+        :param run_retry_count: The number of times the download has already been retried during this run.
+        :param retry_after: The value of the Retry-After header sent by the server, if there was one.
+        :type run_retry_count: int
+        :type retry_after: str
+        :return: The number of seconds to wait before retrying, or None.
+        :rtype: float
+        """
+        if run_retry_count >= self.max_retries:
+            return None
+        delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0.5, 1) * self.BASE_DELAY * 2 ** run_retry_count
+        return delay if delay <= self.MAX_DELAY else None
+
+    @staticmethod
+    def parse_retry_after(retry_after):
+        """
+        Returns the number of seconds specified by a Retry-After header.  Only the delay seconds form of the header is
+        used, a header in the http date form is ignored and the normal delay is used instead.
+        """
+        try:
+            return max(0, int(retry_after))
+        except (TypeError, ValueError):
+            return None
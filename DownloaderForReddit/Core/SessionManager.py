@@ -0,0 +1,160 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import logging
+
+
+class SessionManager:
+
+    # The number of different hosts that will have a connection pool kept alive at the same time.
+    HOST_POOL_COUNT = 20
+
+    def __init__(self, pool_size=4):
+        """
+        Holds a single requests session that is shared between all of the download threads so that connections to the
+        same host are kept alive and reused instead of a new TCP and TLS handshake being made for every file.  Each
+        host gets its own connection pool which is sized to the number of download threads so that every thread can
+        hold an open connection at the same time.
+
+        :param pool_size: The maximum number of connections that will be kept open to a single host.
+        :type pool_size: int
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.lock = threading.Lock()
+        self.pool_size = None
+        self.session = None
+        self.request_count = 0
+        self.host_request_counts = {}
+        self.configure(pool_size)
+
+    def configure(self, pool_size):
+        """
+        Sets the size of the per host connection pools.  A new session is only created if the pool size has changed,
+        otherwise the existing session and its open connections are left in place.  The old session is not closed
+        because other threads may still be reading responses from it.  Its connections are closed when the last
+        request using it has finished and it is garbage collected.
+        :param pool_size: The maximum number of connections that will be kept open to a single host.
+        :type pool_size: int
+        """
+        pool_size = max(1, pool_size)
+        with self.lock:
+            if pool_size == self.pool_size and self.session is not None:
+                return
+            self.session = self.make_session(pool_size)
+            self.pool_size = pool_size
+
+    def make_session(self, pool_size):
+        session = requests.Session()
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, HTTPAdapter(pool_connections=self.HOST_POOL_COUNT, pool_maxsize=pool_size))
+        return session
+
+    def get(self, url, **kwargs):
+        """
+        Makes a get request through the shared session.  This method is safe to call from any thread.
+        :param url: The url that is to be requested.
+        :param kwargs: Any keyword arguments that are passed on to the underlying requests session.
+        :return: The response returned from the server.
+        :rtype: requests.Response
+        """
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        """
+        Makes a head request through the shared session.  This method is safe to call from any thread.
+        :param url: The url that is to be requested.
+        :param kwargs: Any keyword arguments that are passed on to the underlying requests session.
+        :return: The response returned from the server.
+        :rtype: requests.Response
+        """
+        return self.request('HEAD', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).hostname
+        with self.lock:
+            session = self.session
+            self.request_count += 1
+            self.host_request_counts[host] = self.host_request_counts.get(host, 0) + 1
+        return session.request(method, url, **kwargs)
+
+    def get_pool_stats(self):
+        """
+        Returns a dict of statistics about each host connection pool that is currently being kept alive.  The
+        difference between the number of requests and the number of connections made to a host is the number of
+        requests that reused an already open connection.
+        :return: A dict of host names and a dict of stats for the hosts connection pool.
+        :rtype: dict
+        """
+        stats = {}
+        with self.lock:
+            session = self.session
+            host_request_counts = dict(self.host_request_counts)
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats[pool.host] = {
+                    'connections_made': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'reused_connections': max(0, pool.num_requests - pool.num_connections),
+                    'idle_connections': self.get_idle_connection_count(pool),
+                    'pool_size': self.pool_size,
+                    'session_requests': host_request_counts.get(pool.host, 0)
+                }
+        return stats
+
+    @staticmethod
+    def get_idle_connection_count(pool):
+        """
+        Returns the number of open connections that are waiting in the supplied pool to be reused.  Empty slots in the
+        pool are held as None and are not counted.
+        """
+        if pool.pool is None:
+            return 0
+        return sum(1 for conn in list(pool.pool.queue) if conn is not None)
+
+    @property
+    def json(self):
+        """
+        Returns a json encodable dict of the overall session statistics which is used for logging purposes.
+        :rtype: dict
+        """
+        pool_stats = self.get_pool_stats()
+        return {'pool_size': self.pool_size,
+                'request_count': self.request_count,
+                'connections_made': sum(x['connections_made'] for x in pool_stats.values()),
+                'reused_connections': sum(x['reused_connections'] for x in pool_stats.values()),
+                'open_host_pools': len(pool_stats)}
+
+    def close(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
@@ -0,0 +1,119 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import threading
+
+
+class StreamWriter:
+
+    # Each download thread keeps one read buffer which is reused for every file that the thread downloads.
+    thread_buffers = threading.local()
+
+    def __init__(self, path, position, write_size, expected_size=None):
+        """
+        Writes streamed content to a file in large blocks.  Content is read from the response into a preallocated
+        buffer that is reused for the life of the thread and written to the file through a memoryview so that the
+        received bytes are not copied again before being written.  If the final size of the file is known the space
+        for the file is reserved before any content is written.
+
+        :param path: The path of the file that the content is written to.
+        :param position: The byte position in the file that the content is to be written from.  Anything in the file
+                         after this position is removed.
+        :param write_size: The number of bytes that are read and written at a time.
+        :param expected_size: The size in bytes that the file will be once all of the content has been written, if it
+                              is known.
+        :type path: str
+        :type position: int
+        :type write_size: int
+        :type expected_size: int
+        """
+        self.path = path
+        self.position = position
+        self.write_size = write_size
+        self.bytes_written = 0
+        self.file = open(path, 'r+b' if position > 0 else 'wb', buffering=0)
+        self.file.seek(position)
+        self.file.truncate()
+        if expected_size is not None and expected_size > position:
+            self.preallocate(expected_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def preallocate(self, size):
+        """
+        Reserves disk space for the file up front so that the file system does not have to repeatedly grow the file as
+        content is written.  Failure to preallocate is not an error, the file will just grow as it is written.
+        """
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(self.file.fileno(), self.position, size - self.position)
+            else:
+                self.file.truncate(size)
+        except OSError:
+            pass
+
+    def get_buffer(self):
+        """Returns a memoryview of this threads reusable read buffer, creating the buffer if needed."""
+        buffer = getattr(self.thread_buffers, 'buffer', None)
+        if buffer is None or len(buffer) != self.write_size:
+            buffer = bytearray(self.write_size)
+            self.thread_buffers.buffer = buffer
+        return memoryview(buffer)
+
+    def read_from(self, stream):
+        """
+        Reads the next block of content from the supplied stream into the reusable buffer.
+        :param stream: A file like object that supports readinto, such as the raw urllib3 response.
+        :return: A memoryview of the bytes that were read.  The view is empty once the stream has been exhausted.
+        :rtype: memoryview
+        """
+        view = self.get_buffer()
+        count = stream.readinto(view)
+        return view[:count or 0]
+
+    def write(self, data):
+        """
+        Writes all of the supplied bytes to the file.
+        :param data: A bytes like object of the content to be written.
+        """
+        view = memoryview(data)
+        while len(view) > 0:
+            count = self.file.write(view)
+            view = view[count:]
+        self.bytes_written += len(data)
+
+    def close(self):
+        """
+        Closes the file.  The file is truncated to the end of the written content first so that any space that was
+        preallocated but not used is not left at the end of the file.
+        """
+        if not self.file.closed:
+            self.file.truncate(self.position + self.bytes_written)
+            self.file.close()
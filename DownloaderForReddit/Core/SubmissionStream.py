@@ -0,0 +1,117 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+from queue import Queue, Empty, Full
+
+
+class SubmissionStream:
+
+    # The number of posts that may be waiting to be extracted before the listing stops requesting new pages.  This is
+    # the number of posts reddit returns in a single listing page.
+    BUFFER_SIZE = 100
+
+    # The number of seconds between checks of whether the other end of the stream has stopped.
+    POLL_INTERVAL = 0.5
+
+    END = object()
+
+    def __init__(self, buffer_size=BUFFER_SIZE, running=None):
+        """
+        A bounded buffer that carries the posts for a single reddit object from the thread that requests the listing
+        from reddit to the thread that extracts the posts' content.  Posts can be extracted as soon as each page of
+        the listing arrives instead of after the whole listing has been requested, and the listing is held back while
+        the buffer is full so that no more than a page's worth of posts are held in memory at once.
+
+        :param buffer_size: The maximum number of posts that may be held in the buffer.
+        :param running: A callable that returns False when the download has been stopped, at which point the listing
+                        stops being read.
+        :type buffer_size: int
+        """
+        self.buffer = Queue(maxsize=buffer_size)
+        self.running = running
+        self.count = 0
+        self.finished = False
+        self.failed = False
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Yields the posts in the stream in the order they were listed until the listing has been fully read."""
+        while True:
+            try:
+                post = self.buffer.get(timeout=self.POLL_INTERVAL)
+            except Empty:
+                if self.finished and self.buffer.empty():
+                    return None
+                continue
+            if post is self.END:
+                return None
+            yield post
+
+    @property
+    def complete(self):
+        """True if every post in the listing has been read from reddit."""
+        return self.finished and not self.failed
+
+    def is_running(self):
+        return self.running is None or self.running()
+
+    def produce(self, posts):
+        """
+        Reads each post from the supplied listing into the buffer, blocking while the buffer is full.  Any exception
+        raised while reading the listing marks the stream as failed and is raised again so that it can be handled by
+        the caller.
+        :param posts: An iterable of the posts that are to be streamed.
+        """
+        try:
+            for post in posts:
+                if not self.is_running() or not self.put(post):
+                    self.failed = True
+                    break
+                self.count += 1
+        except Exception:
+            self.failed = True
+            raise
+        finally:
+            self.finished = True
+            try:
+                self.buffer.put_nowait(self.END)
+            except Full:
+                pass
+
+    def put(self, post):
+        """
+        Adds the post to the buffer once there is room for it.
+        :return: True if the post was added, False if the download was stopped before there was room.
+        :rtype: bool
+        """
+        while True:
+            try:
+                self.buffer.put(post, timeout=self.POLL_INTERVAL)
+                return True
+            except Full:
+                if not self.is_running():
+                    return False
@@ -24,6 +24,7 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 
 
 import requests
+from urllib.parse import urlsplit
 import logging
 
 from Core.Content import Content
@@ -33,13 +34,27 @@ from Core.Post import Post
 
 class BaseExtractor:
 
-    url_key = None
+    # The domains of the websites that the extractor extracts content from.  Subdomains of each domain are matched as
+    # well, so 'imgur.com' also matches 'i.imgur.com'.
+    domains = ()
+
+    # A dict of each registered domain and the extractor class that is used for urls on that domain.
+    registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Registers each domain of a new extractor subclass so that urls on the domain are extracted with the subclass.
+        If two extractors list the same domain, the extractor that is defined last is used.
+        """
+        super().__init_subclass__(**kwargs)
+        for domain in cls.domains:
+            BaseExtractor.registry[domain.lower()] = cls
 
     def __init__(self, post, reddit_object, content_display_only=False):
         """
         A base class for extracting downloadable urls from container websites.  This class should be overridden and any
         necessary methods overridden by subclasses to perform link extraction from the target website.  Each subclass
-        must also include the url_key parameter which is used for matching the website url to the extractor to be used.
+        must also include the domains attribute which is used for matching the website url to the extractor to be used.
 
         :param post: The praw post object which is a post taken from reddit.  This is used to supply specific post
                      related information to the content items that are created.
@@ -70,15 +85,24 @@ class BaseExtractor:
         return __name__
 
     @classmethod
-    def get_url_key(cls):
+    def get_extractor(cls, url):
         """
-        Returns the url_key that each subclass must contain.  The url_key is used to indicate keywords that are domain
-        specific.  The url_key must be so that if the extractor finds the key in a supplied url, the extractor object
-        to which the key belongs can be selected to perform the link extraction.
-        :return: A key that that if found in a url means this extractor is selected to be used for link extraction.
-        :rtype: str
-        """
-        return cls.url_key
+        Returns the registered extractor for the domain of the supplied url.  The url's host name is looked up in the
+        registry followed by each of its parent domains, so the most specific registered domain is used.
+        :param url: The url that content is to be extracted from.
+        :type url: str
+        :return: The extractor registered for the url's domain, or None if no extractor is registered for it.
+        :rtype: BaseExtractor
+        """
+        host = urlsplit(url).hostname
+        if host is None:
+            return None
+        labels = host.split('.')
+        for index in range(len(labels) - 1):
+            extractor = cls.registry.get('.'.join(labels[index:]))
+            if extractor is not None:
+                return extractor
+        return None
 
     def extract_content(self):
         """
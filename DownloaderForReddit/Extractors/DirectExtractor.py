@@ -28,8 +28,6 @@ from Extractors.BaseExtractor import BaseExtractor
 
 class DirectExtractor(BaseExtractor):
 
-    url_key = None
-
     def __init__(self, post, reddit_object, content_display_only=False):
         super().__init__(post, reddit_object, content_display_only)
 
@@ -24,6 +24,7 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 
 
 import logging
+from itertools import chain
 
 from Extractors.BaseExtractor import BaseExtractor
 from Extractors.DirectExtractor import DirectExtractor
@@ -44,23 +45,33 @@ class Extractor:
         self.settings_manager = Injector.get_settings_manager()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
         self.reddit_object = reddit_object
+        self.newest_post = None
 
     def run(self):
-        for post in self.reddit_object.saved_submissions:
-            self.extract(post)
-        for post in self.reddit_object.new_submissions:
+        for post in self.get_posts():
             self.extract(post)
+        self.update_date_limit()
+
+    def get_posts(self):
+        """
+        Returns an iterator of the posts that are to be extracted in the order that their content is to be handled.
+        The reddit object's new submissions may be a stream whose posts are still being read from reddit.
+        """
+        return chain(list(self.reddit_object.saved_submissions), self.reddit_object.new_submissions)
 
-    def extract(self, post):
+    def extract(self, post, future=None):
         """
-        Creates the proper extractor object and calls its extract method, then handles the extractions.
+        Creates the proper extractor object and calls its extract method, then handles the extractions.  If a future
+        is supplied the extraction has already been started on another thread and its result is used instead.
         :param post: The post that is to be extracted.
+        :param future: The future for an extraction that was started by the submit method.
         :type post: Praw.Post
+        :type future: concurrent.futures.Future
         """
-        self.reddit_object.set_date_limit(post.created)
+        if self.newest_post is None or post.created > self.newest_post.created:
+            self.newest_post = post
         try:
-            extractor = self.assign_extractor(post)(post, self.reddit_object)
-            extractor.extract_content()
+            extractor = future.result() if future is not None else self.run_extractor(post)
             self.handle_content(extractor)
         except TypeError:
             self.reddit_object.failed_extracts.append('Failed to extract post: Url domain not supported\n'
@@ -81,6 +92,30 @@ class Extractor:
             self.logger.error('Failed to extract content: Unknown error',
                               extra={'url': post.url, 'reddit_object': self.reddit_object.json}, exc_info=True)
 
+    def update_date_limit(self):
+        """
+        Sets the reddit object's date limit to the date of the newest post that was extracted and the object's post
+        cursor to that post.  This is done once all of the posts have been extracted, because the date limit is used to
+        filter the posts that are still being read from reddit.  If the posts could not all be read, the date limit is
+        left unchanged so that the posts that were not read are not skipped on the next run.
+        """
+        if self.newest_post is not None and getattr(self.reddit_object.new_submissions, 'complete', True):
+            self.reddit_object.set_date_limit(self.newest_post.created)
+            self.reddit_object.set_post_cursor(getattr(self.newest_post, 'fullname', None))
+
+    def run_extractor(self, post):
+        """
+        Creates the extractor object for the supplied post and extracts the post's content.  The reddit object is not
+        modified by this method so it is safe to call for multiple posts at the same time.
+        :param post: The post that is to be extracted.
+        :type post: Praw.Post
+        :return: The extractor that contains the extracted content.
+        :rtype: BaseExtractor
+        """
+        extractor = self.assign_extractor(post)(post, self.reddit_object)
+        extractor.extract_content()
+        return extractor
+
     def get_subreddit(self, post):
         """
         Method returns the subreddit the post was submitted in if the reddit object type is not subreddit, otherwise
@@ -102,10 +137,9 @@ class Extractor:
         :return: The extractor that is to be used to extract content from the supplied post.
         :rtype: BaseExtractor
         """
-        for extractor in BaseExtractor.__subclasses__():
-            key = extractor.get_url_key()
-            if key is not None and key in post.url.lower():
-                return extractor
+        extractor = BaseExtractor.get_extractor(post.url)
+        if extractor is not None:
+            return extractor
         if post.url.lower().endswith(Const.ALL_EXT):
             return DirectExtractor
         return None
@@ -135,7 +169,7 @@ class Extractor:
         :type extractor: BaseExtractor
         """
         for x in extractor.failed_extracts_to_save:
-            if not any(x.url == y.url for y in self.reddit_object.saved_submissions):
+            if not self.reddit_object.saved_submissions.contains_key(x.url):
                 self.reddit_object.saved_submissions.append(x)
 
     def filter_content(self, content):
@@ -29,7 +29,7 @@ from Core import Const
 
 class GfycatExtractor(BaseExtractor):
 
-    url_key = 'gfycat'
+    domains = ('gfycat.com',)
 
     def __init__(self, post, reddit_object, content_display_only=False):
         """
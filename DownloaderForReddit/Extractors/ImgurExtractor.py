@@ -23,17 +23,18 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
-from imgurpython import ImgurClient
 from imgurpython.helpers.error import ImgurClientError, ImgurClientRateLimitError
 
 from Extractors.BaseExtractor import BaseExtractor
 from Core import Const
+from Core.ImgurClientManager import ImgurCreditError
+import Core.Injector
 from Logging import LogUtils
 
 
 class ImgurExtractor(BaseExtractor):
 
-    url_key = 'imgur'
+    domains = ('imgur.com',)
 
     def __init__(self, post, reddit_object, content_display_only=False):
         """
@@ -54,8 +55,11 @@ class ImgurExtractor(BaseExtractor):
                                            imgur_client_secret_valid=self.imgur_client_secret is not None)
         else:
             try:
-                self.client = ImgurClient(self.imgur_client_id, self.imgur_client_secret)
+                self.client = Core.Injector.get_imgur_client_manager().get_client(self.imgur_client_id,
+                                                                                  self.imgur_client_secret)
                 self.connected = True
+            except ImgurCreditError:
+                self.no_credit_error()
             except ImgurClientError as e:
                 if e.status_code == 500:
                     self.over_capacity_error()
@@ -83,6 +87,8 @@ class ImgurExtractor(BaseExtractor):
                     self.extract_direct_mislinked()
                 else:
                     self.extract_single()
+            except ImgurCreditError:
+                self.no_credit_error()
             except ImgurClientError as e:
                 self.handle_client_error(e.status_code)
             except ImgurClientRateLimitError:
@@ -92,9 +98,10 @@ class ImgurExtractor(BaseExtractor):
 
     def handle_client_error(self, status_code):
         if status_code == 403:
-            if self.client.credits['ClientRemaining'] is None:
+            client_remaining = Core.Injector.get_imgur_client_manager().get_credit('ClientRemaining')
+            if client_remaining is None:
                 self.failed_to_locate_error()
-            elif self.client.credits['ClientRemaining'] <= 0:
+            elif client_remaining <= 0:
                 self.no_credit_error()
             else:
                 self.failed_to_locate_error()
@@ -133,27 +140,56 @@ class ImgurExtractor(BaseExtractor):
     def extract_album(self):
         count = 1
         domain, album_id = self.url.rsplit('/', 1)
-        for pic in self.client.get_album_images(album_id):
-            url = pic.link
+        for pic in self.get_album_images(album_id):
+            url = pic['link']
             address, extension = url.rsplit('.', 1)
             file_name = self.get_filename(album_id)
-            if pic.type == 'image/gif' and pic.animated:
+            if pic['type'] == 'image/gif' and pic['animated']:
                 extension = 'mp4'
-                url = pic.mp4
+                url = pic['mp4']
             self.make_content(url, file_name, extension, count)
             count += 1
 
     def extract_single(self):
         domain, image_id = self.url.rsplit('/', 1)
-        pic = self.client.get_image(image_id)
-        url = pic.link
+        pic = self.get_image(image_id)
+        url = pic['link']
         address, extension = url.rsplit('.', 1)
         file_name = self.get_filename(image_id)
-        if pic.type == 'image/gif' and pic.animated:
+        if pic['type'] == 'image/gif' and pic['animated']:
             extension = 'mp4'
-            url = pic.mp4
+            url = pic['mp4']
         self.make_content(url, file_name, extension)
 
+    def get_album_images(self, album_id):
+        """
+        Returns the details of each image in the album from the imgur metadata cache, or from the imgur api if the album
+        is not cached.
+        :param album_id: The imgur id of the album.
+        :type album_id: str
+        :return: A list of dicts of the link, type, animated flag, and mp4 link of each image.
+        :rtype: list
+        """
+        cache = Core.Injector.get_imgur_metadata_cache()
+        images = cache.get(cache.ALBUM, album_id)
+        if images is None:
+            images = [self.get_image_details(pic) for pic in self.client.get_album_images(album_id)]
+            cache.put(cache.ALBUM, album_id, images)
+        return images
+
+    def get_image(self, image_id):
+        """See get_album_images"""
+        cache = Core.Injector.get_imgur_metadata_cache()
+        images = cache.get(cache.IMAGE, image_id)
+        if images is None:
+            images = [self.get_image_details(self.client.get_image(image_id))]
+            cache.put(cache.IMAGE, image_id, images)
+        return images[0]
+
+    @staticmethod
+    def get_image_details(pic):
+        return {'link': pic.link, 'type': pic.type, 'animated': pic.animated, 'mp4': getattr(pic, 'mp4', None)}
+
     def extract_direct_link(self):
         for ext in Const.ALL_EXT:
             if ext in self.url:
@@ -165,9 +201,9 @@ class ImgurExtractor(BaseExtractor):
             image_id, extension = id_with_ext.rsplit('.', 1)
             file_name = self.get_filename(image_id)
             if url.endswith('gifv') or url.endswith('gif'):
-                picture = self.client.get_image(image_id)
-                if picture.type == 'image/gif' and picture.animated:
-                    url = picture.mp4
+                picture = self.get_image(image_id)
+                if picture['type'] == 'image/gif' and picture['animated']:
+                    url = picture['mp4']
                     extension = 'mp4'
             self.make_content(url, file_name, extension)
         except NameError:
@@ -192,9 +228,9 @@ class ImgurExtractor(BaseExtractor):
             image_id, extension = id_with_ext.rsplit('.', 1)
             file_name = self.get_filename(image_id)
             if url.endswith('gifv') or url.endswith('gif'):
-                picture = self.client.get_image(image_id)
-                if picture.type == 'image/gif' and picture.animated:
-                    url = picture.mp4
+                picture = self.get_image(image_id)
+                if picture['type'] == 'image/gif' and picture['animated']:
+                    url = picture['mp4']
                     extension = 'mp4'
             self.make_content(url, file_name, extension)
         except NameError:
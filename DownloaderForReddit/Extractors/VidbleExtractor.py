@@ -23,7 +23,7 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 
 from Extractors.BaseExtractor import BaseExtractor
 from Core import Const
@@ -31,12 +31,12 @@ from Core import Const
 
 class VidbleExtractor(BaseExtractor):
 
-    url_key = 'vidble'
+    domains = ('vidble.com',)
 
     def __init__(self, post, reddit_object, content_display_only=False):
         """
-        A sublcass of the BaseExtractor class.  This class interacts exclusively with the Vidble website via
-        BeautifulSoup4.
+        A sublcass of the BaseExtractor class.  This class interacts exclusively with the Vidble website by parsing the
+        html of its pages.
         """
         super().__init__(post, reddit_object, content_display_only)
         self.vidble_base = "https://vidble.com"
@@ -59,28 +59,48 @@ class VidbleExtractor(BaseExtractor):
         domain, vidble_id = self.url.rsplit('/', 1)
         if '.' in vidble_id:
             vidble_id = vidble_id[:vidble_id.rfind('.')]
-        soup = BeautifulSoup(self.get_text(self.url), 'html.parser')
-        imgs = soup.find_all('img')
-        for img in imgs:
-            img_class = img.get('class')
-            if img_class is not None and img_class[0] == 'img2':
-                link = img.get('src')
-                if link is not None:
-                    base, extension = link.rsplit('.', 1)
-                    file_name = self.get_filename(vidble_id)
-                    self.make_content(self.vidble_base + link, file_name, extension)
+        for link in self.get_image_links(self.get_text(self.url)):
+            base, extension = link.rsplit('.', 1)
+            file_name = self.get_filename(vidble_id)
+            self.make_content(self.vidble_base + link, file_name, extension)
 
     def extract_album(self):
         count = 1
         domain, vidble_id = self.url.rsplit('/', 1)
-        soup = BeautifulSoup(self.get_text(self.url), 'html.parser')
-        imgs = soup.find_all('img')
-        for img in imgs:
-            img_class = img.get('class')
-            if img_class is not None and img_class[0] == 'img2':
-                link = img.get('src')
-                if link is not None:
-                    base, extension = link.rsplit('.', 1)
-                    file_name = self.get_filename(vidble_id)
-                    self.make_content(self.vidble_base + link, file_name, extension, count)
-                    count += 1
+        for link in self.get_image_links(self.get_text(self.url)):
+            base, extension = link.rsplit('.', 1)
+            file_name = self.get_filename(vidble_id)
+            self.make_content(self.vidble_base + link, file_name, extension, count)
+            count += 1
+
+    @staticmethod
+    def get_image_links(text):
+        """
+        Returns the src of each image on a vidble page whose first class is 'img2', which are the images that make up
+        the post.  The page is read with a streaming parser that only looks at the attributes of img tags, which is
+        much faster than building a tree of the whole page.
+        :param text: The html text of the vidble page.
+        :type text: str
+        :return: A list of the image links in the order that they appear on the page.
+        :rtype: list
+        """
+        parser = VidbleImageParser()
+        parser.feed(text)
+        parser.close()
+        return parser.links
+
+
+class VidbleImageParser(HTMLParser):
+
+    def __init__(self):
+        """Collects the src of every img tag on a vidble page whose first class is 'img2'."""
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'img':
+            attrs = dict(attrs)
+            img_class = (attrs.get('class') or '').split()
+            link = attrs.get('src')
+            if len(img_class) > 0 and img_class[0] == 'img2' and link is not None:
+                self.links.append(link)
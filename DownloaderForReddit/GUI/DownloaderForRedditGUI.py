@@ -55,6 +55,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
 
     stop_download = QtCore.pyqtSignal()
     update_user_finder = QtCore.pyqtSignal()
+    state_saved = QtCore.pyqtSignal(bool)
 
     def __init__(self, queue, receiver):
         """
@@ -148,7 +149,8 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
                                         'in the next release')
 
         self.file_open_settings.triggered.connect(self.open_settings_dialog)
-        self.file_save.triggered.connect(self.save_state)
+        self.file_save.triggered.connect(lambda: self.save_state())
+        self.state_saved.connect(self.finish_save_state)
         self.file_import_save_file.triggered.connect(self.import_save_file)
         self.file_open_save_file_location.triggered.connect(self.open_save_file_location)
         self.file_exit.triggered.connect(self.close_from_menu)
@@ -195,6 +197,13 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.statusbar.addPermanentWidget(self.progress_label)
         self.progress_label.setText('Extraction Complete')
         self.progress_label.setVisible(False)
+        self.throughput_label = QtWidgets.QLabel()
+        self.statusbar.addPermanentWidget(self.throughput_label)
+        self.throughput_label.setToolTip('The combined download rate of all running downloads')
+        self.throughput_label.setVisible(False)
+        self.throughput_timer = QtCore.QTimer(self)
+        self.throughput_timer.setInterval(1000)
+        self.throughput_timer.timeout.connect(self.update_throughput_label)
 
         self.check_for_updates(False)
 
@@ -217,6 +226,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         user_downloads = user_menu.addAction("View User Downloads")
         user_menu.addSeparator()
         open_user_folder = user_menu.addAction("Open Download Folder")
+        download_user_next = user_menu.addAction("Download Next")
         user_menu.addSeparator()
         add_user = user_menu.addAction("Add User")
         remove_user = user_menu.addAction("Remove User")
@@ -225,12 +235,15 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         user_settings.triggered.connect(lambda: self.user_settings(0, False))
         user_downloads.triggered.connect(lambda: self.user_settings(1, False))
         open_user_folder.triggered.connect(self.open_user_download_folder)
+        download_user_next.triggered.connect(self.prioritize_user)
 
         if not valid:
             user_settings.setVisible(False)
             user_downloads.setVisible(False)
             open_user_folder.setVisible(False)
             remove_user.setVisible(False)
+        if not valid or not self.running:
+            download_user_next.setVisible(False)
 
         if self.running:
             add_user.setEnabled(False)
@@ -249,6 +262,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         subreddit_downloads = subreddit_menu.addAction("View Subreddit Downloads")
         subreddit_menu.addSeparator()
         open_subreddit_folder = subreddit_menu.addAction("Open Download Folder")
+        download_subreddit_next = subreddit_menu.addAction("Download Next")
         subreddit_menu.addSeparator()
         add_subreddit = subreddit_menu.addAction("Add Subreddit")
         remove_subreddit = subreddit_menu.addAction("Remove Subreddit")
@@ -257,12 +271,15 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         subreddit_settings.triggered.connect(lambda: self.subreddit_settings(0, False))
         subreddit_downloads.triggered.connect(lambda: self.subreddit_settings(1, False))
         open_subreddit_folder.triggered.connect(self.open_subreddit_download_folder)
+        download_subreddit_next.triggered.connect(self.prioritize_subreddit)
 
         if not valid:
             subreddit_settings.setVisible(False)
             subreddit_downloads.setVisible(False)
             open_subreddit_folder.setVisible(False)
             remove_subreddit.setVisible(False)
+        if not valid or not self.running:
+            download_subreddit_next.setVisible(False)
 
         if self.running:
             add_subreddit.setEnabled(False)
@@ -410,6 +427,24 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
                               extra={'selected_sub_save_directory': path}, exc_info=True)
             Message.no_download_folder(self, 'subreddit')
 
+    def prioritize_user(self):
+        """Moves the selected user's content ahead of all other content in the running download."""
+        current_list_model = self.user_view_chooser_dict[self.user_lists_combo.currentText()]
+        position = self.get_selected_view_index(self.user_list_view).row()
+        self.prioritize_reddit_object(current_list_model.reddit_object_list[position])
+
+    def prioritize_subreddit(self):
+        """Moves the selected subreddit's content ahead of all other content in the running download."""
+        current_list_model = self.subreddit_view_chooser_dict[self.subreddit_list_combo.currentText()]
+        position = self.get_selected_view_index(self.subreddit_list_view).row()
+        self.prioritize_reddit_object(current_list_model.reddit_object_list[position])
+
+    def prioritize_reddit_object(self, reddit_object):
+        if self.running and self.download_runner.prioritize(reddit_object):
+            self.update_output('%s will be downloaded next' % reddit_object.name)
+        else:
+            self.update_output('%s is not part of the current download' % reddit_object.name)
+
     def button_assignment(self):
         """Assigns what the download button does depending on if the downloader is currently running"""
         if not self.running:
@@ -512,7 +547,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
 
     def start_reddit_extractor_thread(self, download_type):
         """Moves the extractor to a different thread and calls the appropriate function for the type of download"""
-        self.stop_download.connect(self.download_runner.stop_download)
+        self.stop_download.connect(self.download_runner.stop_download, QtCore.Qt.DirectConnection)
         self.thread = QtCore.QThread()
         self.download_runner.moveToThread(self.thread)
         if download_type == 'USER':
@@ -558,6 +593,11 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.settings_manager.total_files_downloaded += 1
         self.statusbar.showMessage('Downloaded: %s  of  %s' % (self.downloaded, self.download_count), -1)
 
+    def update_throughput_label(self):
+        """Displays the current combined download rate in the status bar."""
+        throughput = Core.Injector.get_bandwidth_limiter().get_throughput()
+        self.throughput_label.setText('%.1f KB/s' % (throughput / 1024))
+
     def setup_progress_bar(self, limit):
         self.progress_bar.setVisible(True)
         if limit < 100:
@@ -1003,8 +1043,12 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.file_add_subreddit_list.setDisabled(True)
         self.file_remove_user_list.setDisabled(True)
         self.file_remove_subreddit_list.setDisabled(True)
+        self.file_save.setDisabled(True)  # The reddit objects are changed by the download threads during a run
         self.progress_label.setVisible(False)
         self.progress_bar.setVisible(True)
+        self.update_throughput_label()
+        self.throughput_label.setVisible(True)
+        self.throughput_timer.start()
 
     def finished_download_gui_shift(self):
         """Re-enables disabled GUI options"""
@@ -1018,6 +1062,9 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.file_add_subreddit_list.setDisabled(False)
         self.file_remove_user_list.setDisabled(False)
         self.file_remove_subreddit_list.setDisabled(False)
+        self.file_save.setDisabled(False)
+        self.throughput_timer.stop()
+        self.throughput_label.setVisible(False)
         if len(self.failed_list) > 0:
             self.file_failed_download_list.setEnabled(True)
             if self.settings_manager.auto_display_failed_list:
@@ -1274,12 +1321,12 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
 
     def check_save_status(self):
         if self.settings_manager.auto_save:
-            self.save_state()
+            self.save_state(True)
             return True
         elif not self.saved:
             ret = Message.unsaved_close_message(self)
             if ret == "SAVE":
-                self.save_state()
+                self.save_state(True)
                 return True
             elif ret == "CLOSE":
                 return True
@@ -1337,8 +1384,14 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         except KeyError:
             pass
 
-    def save_state(self):
-        """Pickles the user and subreddit lists and saves any settings that need to be saved"""
+    def save_state(self, wait=False):
+        """
+        Saves any settings that need to be saved and saves the changes made to the user and subreddit lists.  The lists
+        are written on the object state handler's save thread so that the GUI is not blocked while they are written.
+        :param wait: If True, waits for the lists to be written before returning.  This is used when the application
+                     is closing.
+        :type wait: bool
+        """
         self.settings_manager.save_all()
         save_object_dict = {
             'user_view_chooser_dict': self.user_view_chooser_dict,
@@ -1346,17 +1399,27 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
             'current_user_view': self.user_lists_combo.currentText(),
             'current_sub_view': self.subreddit_list_combo.currentText()
         }
-        if not ObjectStateHandler.save_pickled_state(save_object_dict):
-            Message.failed_to_save(self)
-            self.set_not_saved()
+        future = ObjectStateHandler.start_save(save_object_dict)
+        if wait:
+            if future.result():
+                self.set_saved()
+            else:
+                self.finish_save_state(False)
         else:
             self.set_saved()
+            future.add_done_callback(lambda x: self.state_saved.emit(x.result()))
+
+    def finish_save_state(self, saved):
+        """Notifies the user if writing the lists failed.  Called on the GUI thread once the lists have been written."""
+        if not saved:
+            Message.failed_to_save(self)
+            self.set_not_saved()
 
     def import_save_file(self):
         """
         Has the user select a save file, then moves the file to the applications data folder.  If a save file already
-        exists, the user is asked if they want to overwrite.  If the file is successfully moved, load_state is called
-        to load up the new save file.
+        exists, the user is asked if they want to overwrite.  If the file is successfully moved, it is imported into
+        the object store and load_state is called to load up the new save file.
         """
         imported = False
         save_file = self.select_save_file()
@@ -1371,7 +1434,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
                     if Message.overwrite_save_file_question(self):
                         imported = self.move_save_files(folder, False)
                         self.logger.info('Save file imported: Old save file overwritten')
-            if imported:
+            if imported and ObjectStateHandler.import_shelve():
                 self.load_new_save_file()
 
     def load_new_save_file(self):
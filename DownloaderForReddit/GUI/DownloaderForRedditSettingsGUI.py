@@ -32,6 +32,7 @@ from GUI_Resources.DownloaderForRedditSettingsGUI_auto import Ui_SettingsGUI
 import Core.Injector
 from Core import SystemUtil
 from Core.Messages import Message
+from Core.DownloadRunner import AsyncDownloader
 from GUI.ImgurClientDialog import ImgurClientDialog
 
 
@@ -66,6 +67,11 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
 
         self.score_operator_dict = {'Greater Than': 'GREATER', 'Less Than': 'LESS'}
 
+        self.download_engine_dict = {'Thread Pool': 'THREAD_POOL', 'Asyncio': 'ASYNC'}
+        self.download_order_dict = {'Fair Between Users/Subreddits': 'ROUND_ROBIN',
+                                    'Smallest First': 'SMALLEST_FIRST',
+                                    'Extraction Order': 'FIFO'}
+
         self.gif_display_dict = {
             'DO_NOT_DISPLAY': self.gif_do_not_display_radio,
             'PLACEHOLDER': self.gif_display_placeholder_radio
@@ -154,6 +160,29 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
 
         self.thread_limit_spinbox.setValue(self.settings_manager.max_download_thread_count)
         self.thread_limit_spinbox.setMaximum(QtCore.QThread.idealThreadCount())
+        self.host_thread_limit_spinbox.setValue(self.settings_manager.max_host_download_thread_count)
+        self.host_thread_limit_spinbox.setMaximum(QtCore.QThread.idealThreadCount())
+        self.extraction_thread_limit_spinbox.setValue(self.settings_manager.extraction_thread_count)
+
+        self.download_engine_combo.addItems(self.download_engine_dict.keys())
+        for key, value in self.download_engine_dict.items():
+            if value == self.settings_manager.download_engine:
+                self.download_engine_combo.setCurrentText(key)
+                break
+        if not AsyncDownloader.available():
+            self.download_engine_combo.model().item(self.download_engine_combo.findText('Asyncio')).setEnabled(False)
+        self.download_engine_combo.currentTextChanged.connect(self.download_engine_change)
+        self.async_download_limit_spinbox.setValue(self.settings_manager.max_async_download_count)
+        self.download_engine_change()
+
+        self.download_order_combo.addItems(self.download_order_dict.keys())
+        for key, value in self.download_order_dict.items():
+            if value == self.settings_manager.download_priority_policy:
+                self.download_order_combo.setCurrentText(key)
+                break
+
+        self.global_rate_limit_spinbox.setValue(self.settings_manager.global_download_rate_limit)
+        self.host_rate_limit_spinbox.setValue(self.settings_manager.host_download_rate_limit)
 
         self.save_undownloaded_content_checkbox.setChecked(self.settings_manager.save_undownloaded_content)
 
@@ -162,6 +191,12 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
                                     'will be set to the date that the post was made on reddit'
         self.set_date_modified_checkbox.setToolTip(set_date_modified_tooltip)
 
+        self.deduplicate_content_checkbox.setChecked(self.settings_manager.deduplicate_content)
+        deduplicate_content_tooltip = 'If checked, a downloaded file that is identical to a file that has already\n' \
+                                      'been downloaded will be saved as a hard link to the existing file instead\n' \
+                                      'of as a second copy'
+        self.deduplicate_content_checkbox.setToolTip(deduplicate_content_tooltip)
+
         self.total_files_downloaded_label.setText("Total Files Downloaded: " +
                                                   str(self.settings_manager.total_files_downloaded))
 
@@ -216,6 +251,11 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
         else:
             self.sub_sort_top_combo.setDisabled(True)
 
+    def download_engine_change(self):
+        """Only enables the async download limit if the async download engine is selected"""
+        self.async_download_limit_spinbox.setEnabled(
+            self.download_engine_dict[self.download_engine_combo.currentText()] == 'ASYNC')
+
     def select_save_path(self):
         """Opens a file dialog to select the save path"""
         folder_name = str(QtWidgets.QFileDialog.getExistingDirectory(self, 'Select Save Folder',
@@ -302,8 +342,20 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
 
         self.settings_manager.save_directory = self.save_directory_line_edit.text()
         self.settings_manager.max_download_thread_count = self.thread_limit_spinbox.value()
+        self.settings_manager.max_host_download_thread_count = self.host_thread_limit_spinbox.value()
+        self.settings_manager.extraction_thread_count = self.extraction_thread_limit_spinbox.value()
+        self.settings_manager.download_engine = self.download_engine_dict[self.download_engine_combo.currentText()]
+        self.settings_manager.max_async_download_count = self.async_download_limit_spinbox.value()
+        self.settings_manager.download_priority_policy = \
+            self.download_order_dict[self.download_order_combo.currentText()]
+        self.settings_manager.global_download_rate_limit = self.global_rate_limit_spinbox.value()
+        self.settings_manager.host_download_rate_limit = self.host_rate_limit_spinbox.value()
+        # The limiter is shared with any running download so the new limits take effect immediately
+        Core.Injector.get_bandwidth_limiter().configure(self.settings_manager.global_download_rate_limit,
+                                                        self.settings_manager.host_download_rate_limit)
         self.settings_manager.save_undownloaded_content = self.save_undownloaded_content_checkbox.isChecked()
         self.settings_manager.set_file_modified_date = self.set_date_modified_checkbox.isChecked()
+        self.settings_manager.deduplicate_content = self.deduplicate_content_checkbox.isChecked()
         self.logger.info('Settings saved', extra={'settings': self.settings_manager.json})
 
     def save_display_settings(self):
@@ -66,6 +66,7 @@ class RedditObjectSettingsDialog(QtWidgets.QDialog, Ui_RedditObjectSettingsDialo
         self.closed = False
         self.object_type = init_item.object_type
 
+        self.current_object.load_collections()
         if not self.running and len(self.current_object.content) <= 0:
             self.editing_disabled_label.setVisible(False)
             self.current_temp_object = copy.deepcopy(self.current_object)
@@ -203,6 +204,7 @@ class RedditObjectSettingsDialog(QtWidgets.QDialog, Ui_RedditObjectSettingsDialo
         if self.current_object.name in self.temp_object_dict:
             self.current_temp_object = self.temp_object_dict[self.current_object.name]
         else:
+            self.current_object.load_collections()
             self.current_temp_object = copy.deepcopy(self.current_object)
 
     def setup_display(self, reddit_object):
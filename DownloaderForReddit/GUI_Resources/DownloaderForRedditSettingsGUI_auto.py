@@ -257,13 +257,13 @@ class Ui_SettingsGUI(object):
         font.setPointSize(10)
         self.total_files_downloaded_label.setFont(font)
         self.total_files_downloaded_label.setObjectName("total_files_downloaded_label")
-        self.gridLayout_7.addWidget(self.total_files_downloaded_label, 3, 0, 1, 1)
+        self.gridLayout_7.addWidget(self.total_files_downloaded_label, 11, 0, 1, 1)
         self.save_undownloaded_content_checkbox = QtWidgets.QCheckBox(self.page)
         font = QtGui.QFont()
         font.setPointSize(10)
         self.save_undownloaded_content_checkbox.setFont(font)
         self.save_undownloaded_content_checkbox.setObjectName("save_undownloaded_content_checkbox")
-        self.gridLayout_7.addWidget(self.save_undownloaded_content_checkbox, 1, 0, 1, 1)
+        self.gridLayout_7.addWidget(self.save_undownloaded_content_checkbox, 8, 0, 1, 1)
         self.label_4 = QtWidgets.QLabel(self.page)
         font = QtGui.QFont()
         font.setPointSize(10)
@@ -275,7 +275,110 @@ class Ui_SettingsGUI(object):
         font.setPointSize(10)
         self.set_date_modified_checkbox.setFont(font)
         self.set_date_modified_checkbox.setObjectName("set_date_modified_checkbox")
-        self.gridLayout_7.addWidget(self.set_date_modified_checkbox, 2, 0, 1, 2)
+        self.gridLayout_7.addWidget(self.set_date_modified_checkbox, 9, 0, 1, 2)
+        self.host_thread_limit_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.host_thread_limit_label.setFont(font)
+        self.host_thread_limit_label.setObjectName("host_thread_limit_label")
+        self.gridLayout_7.addWidget(self.host_thread_limit_label, 1, 0, 1, 1)
+        self.host_thread_limit_spinbox = QtWidgets.QSpinBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.host_thread_limit_spinbox.setFont(font)
+        self.host_thread_limit_spinbox.setMinimum(1)
+        self.host_thread_limit_spinbox.setMaximum(12)
+        self.host_thread_limit_spinbox.setProperty("value", 4)
+        self.host_thread_limit_spinbox.setObjectName("host_thread_limit_spinbox")
+        self.gridLayout_7.addWidget(self.host_thread_limit_spinbox, 1, 1, 1, 1)
+        self.download_engine_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.download_engine_label.setFont(font)
+        self.download_engine_label.setObjectName("download_engine_label")
+        self.gridLayout_7.addWidget(self.download_engine_label, 3, 0, 1, 1)
+        self.download_engine_combo = QtWidgets.QComboBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.download_engine_combo.setFont(font)
+        self.download_engine_combo.setObjectName("download_engine_combo")
+        self.gridLayout_7.addWidget(self.download_engine_combo, 3, 1, 1, 1)
+        self.async_download_limit_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.async_download_limit_label.setFont(font)
+        self.async_download_limit_label.setObjectName("async_download_limit_label")
+        self.gridLayout_7.addWidget(self.async_download_limit_label, 4, 0, 1, 1)
+        self.async_download_limit_spinbox = QtWidgets.QSpinBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.async_download_limit_spinbox.setFont(font)
+        self.async_download_limit_spinbox.setMinimum(1)
+        self.async_download_limit_spinbox.setMaximum(500)
+        self.async_download_limit_spinbox.setProperty("value", 100)
+        self.async_download_limit_spinbox.setObjectName("async_download_limit_spinbox")
+        self.gridLayout_7.addWidget(self.async_download_limit_spinbox, 4, 1, 1, 1)
+        self.deduplicate_content_checkbox = QtWidgets.QCheckBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.deduplicate_content_checkbox.setFont(font)
+        self.deduplicate_content_checkbox.setObjectName("deduplicate_content_checkbox")
+        self.gridLayout_7.addWidget(self.deduplicate_content_checkbox, 10, 0, 1, 2)
+        self.global_rate_limit_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.global_rate_limit_label.setFont(font)
+        self.global_rate_limit_label.setObjectName("global_rate_limit_label")
+        self.gridLayout_7.addWidget(self.global_rate_limit_label, 6, 0, 1, 1)
+        self.global_rate_limit_spinbox = QtWidgets.QSpinBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.global_rate_limit_spinbox.setFont(font)
+        self.global_rate_limit_spinbox.setMaximum(1000000)
+        self.global_rate_limit_spinbox.setSingleStep(100)
+        self.global_rate_limit_spinbox.setObjectName("global_rate_limit_spinbox")
+        self.gridLayout_7.addWidget(self.global_rate_limit_spinbox, 6, 1, 1, 1)
+        self.host_rate_limit_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.host_rate_limit_label.setFont(font)
+        self.host_rate_limit_label.setObjectName("host_rate_limit_label")
+        self.gridLayout_7.addWidget(self.host_rate_limit_label, 7, 0, 1, 1)
+        self.host_rate_limit_spinbox = QtWidgets.QSpinBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.host_rate_limit_spinbox.setFont(font)
+        self.host_rate_limit_spinbox.setMaximum(1000000)
+        self.host_rate_limit_spinbox.setSingleStep(100)
+        self.host_rate_limit_spinbox.setObjectName("host_rate_limit_spinbox")
+        self.gridLayout_7.addWidget(self.host_rate_limit_spinbox, 7, 1, 1, 1)
+        self.download_order_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.download_order_label.setFont(font)
+        self.download_order_label.setObjectName("download_order_label")
+        self.gridLayout_7.addWidget(self.download_order_label, 5, 0, 1, 1)
+        self.download_order_combo = QtWidgets.QComboBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.download_order_combo.setFont(font)
+        self.download_order_combo.setObjectName("download_order_combo")
+        self.gridLayout_7.addWidget(self.download_order_combo, 5, 1, 1, 1)
+        self.extraction_thread_limit_label = QtWidgets.QLabel(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.extraction_thread_limit_label.setFont(font)
+        self.extraction_thread_limit_label.setObjectName("extraction_thread_limit_label")
+        self.gridLayout_7.addWidget(self.extraction_thread_limit_label, 2, 0, 1, 1)
+        self.extraction_thread_limit_spinbox = QtWidgets.QSpinBox(self.page)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.extraction_thread_limit_spinbox.setFont(font)
+        self.extraction_thread_limit_spinbox.setMinimum(1)
+        self.extraction_thread_limit_spinbox.setMaximum(32)
+        self.extraction_thread_limit_spinbox.setProperty("value", 4)
+        self.extraction_thread_limit_spinbox.setObjectName("extraction_thread_limit_spinbox")
+        self.gridLayout_7.addWidget(self.extraction_thread_limit_spinbox, 2, 1, 1, 1)
         self.gridLayout_9.addLayout(self.gridLayout_7, 8, 0, 1, 3)
         self.subreddit_sort_group.raise_()
         self.line.raise_()
@@ -419,6 +522,25 @@ class Ui_SettingsGUI(object):
         self.save_undownloaded_content_checkbox.setText(_translate("SettingsGUI", "Save undownloaded content"))
         self.label_4.setText(_translate("SettingsGUI", "Number of simultaneous download threads:"))
         self.set_date_modified_checkbox.setText(_translate("SettingsGUI", "Set files date modified property to the date the post was made"))
+        self.extraction_thread_limit_label.setText(_translate("SettingsGUI", "Number of simultaneous extractions:"))
+        self.extraction_thread_limit_spinbox.setToolTip(_translate("SettingsGUI", "<html><head/><body><p><span style=\" font-size:10pt;\">This is the number of posts whose content is extracted from hosting websites at the same time.  Raising this number lets content be found faster when many posts link to albums or other pages that must be looked up</span></p></body></html>"))
+        self.download_order_label.setText(_translate("SettingsGUI", "Download order:"))
+        self.download_order_combo.setToolTip(_translate("SettingsGUI", "<html><head/><body><p>The order that content is downloaded in.  Fair order downloads content from each user and subreddit in turn so that one large download does not hold up the others.  Smallest first asks each server for the size of its files before downloading them.  Extraction order downloads content in the order that it was found</p></body></html>"))
+        self.global_rate_limit_label.setText(_translate("SettingsGUI", "Download rate limit:"))
+        self.global_rate_limit_spinbox.setToolTip(_translate("SettingsGUI", "<html><head/><body><p>The maximum combined download rate of all downloads.  This may be changed while a download is running</p></body></html>"))
+        self.global_rate_limit_spinbox.setSpecialValueText(_translate("SettingsGUI", "Unlimited"))
+        self.global_rate_limit_spinbox.setSuffix(_translate("SettingsGUI", " KB/s"))
+        self.host_rate_limit_label.setText(_translate("SettingsGUI", "Download rate limit per host:"))
+        self.host_rate_limit_spinbox.setToolTip(_translate("SettingsGUI", "<html><head/><body><p>The maximum download rate from a single host.  This may be changed while a download is running</p></body></html>"))
+        self.host_rate_limit_spinbox.setSpecialValueText(_translate("SettingsGUI", "Unlimited"))
+        self.host_rate_limit_spinbox.setSuffix(_translate("SettingsGUI", " KB/s"))
+        self.deduplicate_content_checkbox.setText(_translate("SettingsGUI", "Link duplicate files to a single stored copy"))
+        self.download_engine_label.setText(_translate("SettingsGUI", "Download engine:"))
+        self.download_engine_combo.setToolTip(_translate("SettingsGUI", "<html><head/><body><p>The thread pool engine downloads each file on its own thread.  The asyncio engine downloads every file on a single thread and can handle a much larger number of simultaneous downloads.  The asyncio engine requires the aiohttp package to be installed</p></body></html>"))
+        self.async_download_limit_label.setText(_translate("SettingsGUI", "Number of simultaneous asyncio downloads:"))
+        self.async_download_limit_spinbox.setToolTip(_translate("SettingsGUI", "<html><head/><body><p>The maximum number of files that the asyncio download engine will download at the same time</p></body></html>"))
+        self.host_thread_limit_label.setText(_translate("SettingsGUI", "Number of simultaneous downloads per host:"))
+        self.host_thread_limit_spinbox.setToolTip(_translate("SettingsGUI", "<html><head/><body><p><span style=\" font-size:10pt;\">This is the maximum number of files that will be downloaded from the same website at the same time.  Lowering this number can prevent sites such as imgur from limiting downloads when the overall thread count is high</span></p></body></html>"))
         self.tooltip_group_box.setToolTip(_translate("SettingsGUI", "<html><head/><body><p>Choose which reddit object attributes are displayed via tooltip when hovering over reddit objects in the main window.</p></body></html>"))
         self.tooltip_group_box.setTitle(_translate("SettingsGUI", "Tooltip Display Options"))
         self.tooltip_name_checkbox.setText(_translate("SettingsGUI", "Name"))
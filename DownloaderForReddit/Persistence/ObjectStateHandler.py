@@ -23,12 +23,15 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
+import dbm
 import shelve
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, Future
 
 from ViewModels.ListModel import ListModel
 from Persistence.ObjectUpdater import ObjectUpdater
+from Persistence.ObjectStore import ObjectStore
 from Core import SystemUtil
 from version import __version__
 
@@ -44,12 +47,28 @@ class ObjectStateHandler:
     total_sub_count = 0
     user_update_count = 0
     sub_update_count = 0
+    store = None
+    save_executor = None
+
+    @classmethod
+    def get_store(cls):
+        if cls.store is None:
+            cls.store = ObjectStore(cls.get_save_path())
+        return cls.store
+
+    @classmethod
+    def get_save_executor(cls):
+        """Returns the single thread that all writes to the object store are made on, in the order they are made."""
+        if cls.save_executor is None:
+            cls.save_executor = ThreadPoolExecutor(max_workers=1)
+        return cls.save_executor
 
     @classmethod
     def load_pickled_state(cls):
         """
-        Loads the reddit object lists from a pickled states and packs them into the view_chooser_dicts that they will
-        be used in.
+        Loads the reddit object lists from the object store and packs them into the view_chooser_dicts that they will
+        be used in.  If the lists have never been saved to the object store, they are first imported from the shelve
+        save_file used by earlier versions if it exists.
         :return: A dict of view chooser dicts and a string representing which value should be displayed currently.
         :rtype: dict
         """
@@ -58,25 +77,30 @@ class ObjectStateHandler:
             user_view_chooser_dict = {}
             subreddit_view_chooser_dict = {}
             save_path = cls.get_save_path()
-            with shelve.open(save_path, 'c') as shelf:
-                user_list_models = shelf['user_list_models']
-                subreddit_list_models = shelf['subreddit_list_models']
-                last_user_view = shelf['current_user_view']
-                last_subreddit_view = shelf['current_subreddit_view']
-
-                for name, user_list in user_list_models.items():
-                    user_list = cls.check_user_objects(user_list)
-                    x = ListModel(name, 'user')
-                    x.reddit_object_list = user_list
-                    user_view_chooser_dict[x.name] = x
-                    cls.total_user_count += len(user_list)
-
-                for name, sub_list in subreddit_list_models.items():
-                    sub_list = cls.check_subreddit_objects(sub_list)
-                    x = ListModel(name, 'subreddit')
-                    x.reddit_object_list = sub_list
-                    subreddit_view_chooser_dict[name] = x
-                    cls.total_sub_count += len(sub_list)
+            store = cls.get_store()
+            if not store.has_state() and cls.check_shelve_exists():
+                cls.import_shelve()
+            state = store.load()
+            user_list_models = state[ObjectStore.USER_LISTS]
+            subreddit_list_models = state[ObjectStore.SUBREDDIT_LISTS]
+            last_user_view = state[ObjectStore.CURRENT_USER_VIEW]
+            last_subreddit_view = state[ObjectStore.CURRENT_SUBREDDIT_VIEW]
+
+            for name, user_list in user_list_models.items():
+                user_list = cls.check_user_objects(user_list)
+                x = ListModel(name, 'user')
+                x.reddit_object_list = user_list
+                x.dirty = False
+                user_view_chooser_dict[x.name] = x
+                cls.total_user_count += len(user_list)
+
+            for name, sub_list in subreddit_list_models.items():
+                sub_list = cls.check_subreddit_objects(sub_list)
+                x = ListModel(name, 'subreddit')
+                x.reddit_object_list = sub_list
+                x.dirty = False
+                subreddit_view_chooser_dict[name] = x
+                cls.total_sub_count += len(sub_list)
             cls.logger.info('Object lists loaded from save file', extra={'total_users': cls.total_user_count,
                                                                          'total_subreddits': cls.total_sub_count,
                                                                          'updated_users': cls.user_update_count,
@@ -96,45 +120,131 @@ class ObjectStateHandler:
     @classmethod
     def get_save_path(cls):
         """
-        Builds and returns a path to the save_file based on the users OS.
+        Builds and returns a path to the object store database based on the users OS.
+        :return: The database path location.
+        :rtype: str
+        """
+        return os.path.join(SystemUtil.get_data_directory(), 'reddit_objects.db')
+
+    @classmethod
+    def get_shelve_path(cls):
+        """
+        Builds and returns a path to the shelve save_file that the lists were saved in by earlier versions.
         :return: The save_file path location.
         :rtype: str
         """
         return os.path.join(SystemUtil.get_data_directory(), 'save_file')
 
+    @classmethod
+    def check_shelve_exists(cls):
+        return dbm.whichdb(cls.get_shelve_path()) not in (None, '')
+
+    @classmethod
+    def import_shelve(cls):
+        """
+        Reads the lists from the shelve save_file, updates any outdated reddit objects, and writes the lists to the
+        object store, replacing any lists already in the store.  The save_file itself is left in place.
+        :return: True if the import was successful and False if it was not.
+        :rtype: bool
+        """
+        shelve_path = cls.get_shelve_path()
+        try:
+            with shelve.open(shelve_path, 'r') as shelf:
+                state = {key: shelf[key] for key in (ObjectStore.USER_LISTS, ObjectStore.SUBREDDIT_LISTS) +
+                         ObjectStore.VIEW_KEYS}
+            for user_list in state[ObjectStore.USER_LISTS].values():
+                cls.check_user_objects(user_list)
+            for sub_list in state[ObjectStore.SUBREDDIT_LISTS].values():
+                cls.check_subreddit_objects(sub_list)
+            cls.get_save_executor().submit(cls.get_store().save, state).result()
+            cls.logger.info('Save file imported into object store', extra={'save_file_location': shelve_path})
+            return True
+        except Exception:
+            cls.logger.error('Failed to import save file', extra={'save_file_location': shelve_path}, exc_info=True)
+            return False
+
     @classmethod
     def save_pickled_state(cls, object_dict):
         """
-        Unpacks the objects in the supplied object_dict and saves them in a pickled state to the hard drive.
+        Unpacks the objects in the supplied object_dict and saves them to the object store, waiting for the save to
+        finish.
         :param object_dict: A dict of view chooser dicts and strings representing which view chooser value is currently
                             displayed
         :type object_dict: dict
         :return: True if the save was successful and False if it was not.
         :rtype: bool
         """
-        user_list_models = cls.get_list_models(object_dict['user_view_chooser_dict'])
-        sub_list_models = cls.get_list_models(object_dict['sub_view_chooser_dict'])
-        save_path = None
+        return cls.start_save(object_dict).result()
+
+    @classmethod
+    def start_save(cls, object_dict):
+        """
+        Collects the changes made to the objects in the supplied object_dict since they were last saved and starts
+        writing them to the object store on the save thread.  This must be called from the thread that changes the
+        objects, which is the GUI thread.
+        :param object_dict: A dict of view chooser dicts and strings representing which view chooser value is currently
+                            displayed
+        :type object_dict: dict
+        :return: A future whose result is True if the save was successful and False if it was not.
+        :rtype: Future
+        """
+        changed_models = []
+        changed_lists = set()
+        for view_chooser_dict in (object_dict['user_view_chooser_dict'], object_dict['sub_view_chooser_dict']):
+            for name, list_model in view_chooser_dict.items():
+                if list_model.dirty:
+                    changed_models.append(list_model)
+                    changed_lists.add((list_model.list_type, name))
         try:
-            save_path = cls.get_save_path()
-            with shelve.open(save_path, 'c') as shelf:
-                shelf['user_list_models'] = user_list_models
-                shelf['subreddit_list_models'] = sub_list_models
-                shelf['current_user_view'] = object_dict['current_user_view']
-                shelf['current_subreddit_view'] = object_dict['current_sub_view']
-            cls.logger.info('Objects successfully saved', extra={'total_users_saved': cls.total_user_count,
-                                                                 'total_subreddits_saved': cls.total_sub_count})
+            changes = cls.get_store().prepare_save(
+                {ObjectStore.USER_LISTS: cls.get_list_models(object_dict['user_view_chooser_dict']),
+                 ObjectStore.SUBREDDIT_LISTS: cls.get_list_models(object_dict['sub_view_chooser_dict']),
+                 ObjectStore.CURRENT_USER_VIEW: object_dict['current_user_view'],
+                 ObjectStore.CURRENT_SUBREDDIT_VIEW: object_dict['current_sub_view']}, changed_lists)
+        except Exception:
+            cls.logger.error('Unable to save to save_file', extra={'save_file_location': cls.get_save_path()},
+                             exc_info=True)
+            future = Future()
+            future.set_result(False)
+            return future
+        for list_model in changed_models:
+            list_model.dirty = False
+        return cls.get_save_executor().submit(cls.write_changes, changes, changed_models)
+
+    @classmethod
+    def write_changes(cls, changes, changed_models):
+        """
+        Writes changes collected by start_save to the object store.  Runs on the save thread.
+        :param changes: The changes that are to be written.
+        :param changed_models: The list models whose objects were added, removed, or reordered.  These are marked as
+                               changed again if the write fails.
+        :type changes: ObjectStoreChanges
+        :type changed_models: list
+        :return: True if the save was successful and False if it was not.
+        :rtype: bool
+        """
+        store = cls.get_store()
+        try:
+            store.write(changes)
+            store.finish_save(changes, True)
+            cls.logger.info('Objects successfully saved', extra={'objects_written': changes.object_count,
+                                                                 'collection_rows_written': changes.row_count,
+                                                                 'objects_removed': len(changes.removed_ids)})
             return True
         except Exception:
-            cls.logger.error('Unable to save to save_file', extra={'save_file_location': save_path}, exc_info=True)
+            cls.logger.error('Unable to save to save_file', extra={'save_file_location': cls.get_save_path()},
+                             exc_info=True)
+            store.finish_save(changes, False)
+            for list_model in changed_models:
+                list_model.dirty = True
             return False
 
     @classmethod
     def get_list_models(cls, view_chooser_dict):
         """
         Iterates through the supplied view_chooser_dict and extracts the user list from each list model, packages it in
-        a dict with the models name, then returns the dict to be pickled.
-        :param view_chooser_dict: The view chooser dict (either user or subreddit) that is to be pickled.
+        a dict with the models name, then returns the dict to be saved.
+        :param view_chooser_dict: The view chooser dict (either user or subreddit) that is to be saved.
         :type view_chooser_dict: dict
         :return: A dict with each view_chooser_dicts name and the reddit object list of the associated list model
         :rtype: dict
@@ -155,6 +265,8 @@ class ObjectStateHandler:
                 x = ObjectUpdater.update_user(user_list[index])
                 user_list[index] = x
                 cls.user_update_count += 1
+            else:
+                ObjectUpdater.update_collections(user_list[index])
         return user_list
 
     @classmethod
@@ -164,6 +276,8 @@ class ObjectStateHandler:
                 x = ObjectUpdater.update_subreddit(sub_list[index])
                 sub_list[index] = x
                 cls.sub_update_count += 1
+            else:
+                ObjectUpdater.update_collections(sub_list[index])
         return sub_list
 
     @staticmethod
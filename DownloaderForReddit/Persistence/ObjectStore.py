@@ -0,0 +1,447 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import pickle
+import sqlite3
+import threading
+import logging
+from itertools import count
+
+from Core import SystemUtil
+from Core.IndexedList import IndexedList
+
+
+class ObjectStore:
+
+    USER_LISTS = 'user_list_models'
+    SUBREDDIT_LISTS = 'subreddit_list_models'
+    CURRENT_USER_VIEW = 'current_user_view'
+    CURRENT_SUBREDDIT_VIEW = 'current_subreddit_view'
+
+    LIST_TYPES = {USER_LISTS: 'user', SUBREDDIT_LISTS: 'subreddit'}
+    VIEW_KEYS = (CURRENT_USER_VIEW, CURRENT_SUBREDDIT_VIEW)
+
+    # Reddit object attributes that are stored in their own tables instead of with the rest of the object.
+    COLLECTIONS = ('previous_downloads', 'saved_content', 'saved_submissions')
+
+    # Reddit object attributes that only hold data for the current download session and are not stored.
+    SESSION_ATTRIBUTES = ('new_submissions', 'content', 'failed_extracts')
+
+    # Reddit object attributes that are used by the store to load and save the object and are not stored.
+    STORE_ATTRIBUTES = ('store_id', 'collection_counts', 'collection_loader', 'dirty_fields')
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)',
+        'CREATE TABLE IF NOT EXISTS lists (id INTEGER PRIMARY KEY, name TEXT NOT NULL, list_type TEXT NOT NULL, '
+        'UNIQUE (list_type, name))',
+        'CREATE TABLE IF NOT EXISTS objects (id INTEGER PRIMARY KEY, list_id INTEGER NOT NULL REFERENCES lists (id), '
+        'position INTEGER NOT NULL, name TEXT NOT NULL, object_type TEXT, attributes BLOB NOT NULL, '
+        'previous_download_count INTEGER NOT NULL, saved_content_count INTEGER NOT NULL, '
+        'saved_submission_count INTEGER NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS objects_list ON objects (list_id, position)',
+        'CREATE TABLE IF NOT EXISTS previous_downloads (object_id INTEGER NOT NULL REFERENCES objects (id), '
+        'position INTEGER NOT NULL, url TEXT NOT NULL, PRIMARY KEY (object_id, position)) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS saved_content (object_id INTEGER NOT NULL REFERENCES objects (id), '
+        'url TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (object_id, url))',
+        'CREATE TABLE IF NOT EXISTS saved_submissions (object_id INTEGER NOT NULL REFERENCES objects (id), '
+        'position INTEGER NOT NULL, url TEXT NOT NULL, submission BLOB NOT NULL, PRIMARY KEY (object_id, position)) '
+        'WITHOUT ROWID',
+        'CREATE INDEX IF NOT EXISTS saved_submissions_url ON saved_submissions (object_id, url)',
+    )
+
+    def __init__(self, db_path=None):
+        """
+        Stores the user and subreddit lists in a database in the data directory.  Each list and each reddit object
+        has its own row, and the previous downloads, saved content, and saved submissions of the reddit objects are
+        kept in their own tables with one row per item, keyed by the object they belong to.  Objects are loaded with
+        only a summary of their collections, which are loaded from the database the first time they are used.  All
+        writes are made in a single transaction so that a failed save leaves the last successful save in place.
+
+        :param db_path: The path of the database.  The database is stored in the data directory if no path is given.
+        :type db_path: str
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.lock = threading.Lock()
+        self.db_path = db_path if db_path is not None else self.get_db_path()
+        self.connection = None
+        self.stored_ids = set()  # The ids of the objects that are in the database, once all writes are finished
+        self.stored_lists = {}  # The ids of the lists in the database by (list type, name)
+        self.object_ids = None
+        self.list_ids = None
+
+    @staticmethod
+    def get_db_path():
+        return os.path.join(SystemUtil.get_data_directory(), 'reddit_objects.db')
+
+    def connect(self):
+        """Opens the database the first time it is needed.  Must be called with the lock held."""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.connection.execute('PRAGMA foreign_keys = ON')
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+            self.connection.commit()
+            self.stored_ids = {row[0] for row in self.connection.execute('SELECT id FROM objects')}
+            self.stored_lists = {(row[1], row[2]): row[0] for row in
+                                 self.connection.execute('SELECT id, list_type, name FROM lists')}
+            self.object_ids = count(max(self.stored_ids, default=0) + 1)
+            self.list_ids = count(max(self.stored_lists.values(), default=0) + 1)
+        return self.connection
+
+    def has_state(self):
+        """
+        Returns True if the lists have been saved to the database at least once.
+        :rtype: bool
+        """
+        with self.lock:
+            row = self.connect().execute('SELECT 1 FROM state WHERE key = ?', (self.CURRENT_USER_VIEW,)).fetchone()
+            return row is not None
+
+    def load(self):
+        """
+        Loads a summary of each saved reddit object from the database.  The previous downloads, saved content, and
+        saved submissions of the objects are not loaded until they are first used, at which point they are loaded by
+        load_collections.  Until then the number of items in each collection is available from the summary.
+        :return: A dict with the user list models and subreddit list models, each a dict of list name to the list of
+                 reddit objects in the list, and the names of the lists that were last displayed.  The list and view
+                 keys are only present if the lists have been saved before.
+        :rtype: dict
+        """
+        with self.lock:
+            connection = self.connect()
+            state = {key: value for key, value in connection.execute('SELECT key, value FROM state')}
+            if not state:
+                return state
+            lists = {}
+            for key, list_type in self.LIST_TYPES.items():
+                state[key] = {}
+                for list_id, name in connection.execute('SELECT id, name FROM lists WHERE list_type = ? ORDER BY id',
+                                                        (list_type,)):
+                    state[key][name] = lists[list_id] = []
+            for row in connection.execute('SELECT id, list_id, attributes, previous_download_count, '
+                                          'saved_content_count, saved_submission_count FROM objects '
+                                          'ORDER BY list_id, position'):
+                reddit_object = pickle.loads(row[2])
+                reddit_object.store_id = row[0]
+                reddit_object.collection_counts = dict(zip(self.COLLECTIONS, row[3:]))
+                reddit_object.collection_loader = self
+                lists[row[1]].append(reddit_object)
+            return state
+
+    def load_collections(self, reddit_object):
+        """
+        Loads the previous downloads, saved content, and saved submissions of a reddit object that was loaded from the
+        database.  Collections that have been replaced on the object since it was loaded are left as they are.
+        :param reddit_object: The reddit object whose collections are to be loaded.
+        :type reddit_object: RedditObject
+        """
+        with self.lock:
+            if reddit_object.collection_loader is not self:
+                return
+            connection = self.connect()
+            object_id = (reddit_object.store_id,)
+            collections = {
+                'previous_downloads': IndexedList(row[0] for row in connection.execute(
+                    'SELECT url FROM previous_downloads WHERE object_id = ? ORDER BY position', object_id)),
+                'saved_content': {row[0]: pickle.loads(row[1]) for row in connection.execute(
+                    'SELECT url, value FROM saved_content WHERE object_id = ? ORDER BY rowid', object_id)},
+                'saved_submissions': IndexedList((pickle.loads(row[0]) for row in connection.execute(
+                    'SELECT submission FROM saved_submissions WHERE object_id = ? ORDER BY position', object_id)),
+                    key_attribute='url')
+            }
+            for name, collection in collections.items():
+                if isinstance(collection, IndexedList):
+                    collection.mark_saved()
+                try:
+                    object.__getattribute__(reddit_object, name)
+                except AttributeError:
+                    object.__setattr__(reddit_object, name, collection)
+            reddit_object.collection_counts = None
+            reddit_object.collection_loader = None
+
+    def save(self, state, changed_lists=None):
+        """
+        Prepares and writes the changes to the supplied lists in one call.
+        :param state: A dict in the same format as is returned by load.
+        :param changed_lists: The (list type, name) keys of the lists whose objects have been added, removed, or
+                              reordered since they were last saved.  Every list is treated as changed if this is None.
+        :type state: dict
+        :type changed_lists: set
+        """
+        changes = self.prepare_save(state, changed_lists)
+        try:
+            self.write(changes)
+        except Exception:
+            self.finish_save(changes, False)
+            raise
+        self.finish_save(changes, True)
+
+    def prepare_save(self, state, changed_lists=None):
+        """
+        Collects everything that has changed in the supplied lists since they were last saved, so that it can be
+        written by write on another thread.  Only new objects, objects with changed attributes, and items appended to
+        or removed from an object's collections are written.  The positions of the objects in a list are only written
+        if the list has changed.  This must be called on the thread that changes the reddit objects, and the objects
+        are marked as saved when it is called.  If the write then fails, finish_save marks them as changed again.  If
+        collecting the changes fails, the objects that were already marked as saved are marked as changed again before
+        the exception is raised.
+        :param state: A dict in the same format as is returned by load.
+        :param changed_lists: The (list type, name) keys of the lists whose objects have been added, removed, or
+                              reordered since they were last saved.  Every list is treated as changed if this is None.
+        :type state: dict
+        :type changed_lists: set
+        :return: The changes that are to be written.
+        :rtype: ObjectStoreChanges
+        """
+        changes = ObjectStoreChanges()
+        changes.views = [(key, state[key]) for key in self.VIEW_KEYS]
+        lists = []
+        with self.lock:
+            self.connect()
+            for key, list_type in self.LIST_TYPES.items():
+                for name, object_list in state[key].items():
+                    list_key = (list_type, name)
+                    list_id = self.stored_lists.get(list_key)
+                    changed = changed_lists is None or list_key in changed_lists or list_id is None
+                    if list_id is None:
+                        list_id = self.stored_lists[list_key] = next(self.list_ids)
+                        changes.new_lists.append((list_key, list_id))
+                    lists.append((list_id, object_list, changed))
+            current_lists = {(list_type, name) for key, list_type in self.LIST_TYPES.items() for name in state[key]}
+            changes.removed_lists = [(key, self.stored_lists.pop(key)) for key in list(self.stored_lists)
+                                     if key not in current_lists]
+        saved_ids = set()
+        try:
+            for list_id, object_list, changed in lists:
+                for position, reddit_object in enumerate(object_list):
+                    self.prepare_object(changes, list_id, position, reddit_object, changed, saved_ids)
+        except Exception:
+            self.finish_save(changes, False)
+            raise
+        with self.lock:
+            # Objects can be replaced without their list being marked as changed, such as when an object is updated to a
+            # new version on load, so any stored object that was not prepared is removed whether or not lists changed.
+            changes.removed_ids = self.stored_ids - saved_ids
+            self.stored_ids.difference_update(changes.removed_ids)
+            self.stored_ids.update(saved_ids)
+        return changes
+
+    def prepare_object(self, changes, list_id, position, reddit_object, list_changed, saved_ids):
+        """
+        Adds the changes to a single reddit object to the supplied changes.
+        :param saved_ids: The ids of the objects that have already been prepared.  An object that shares an id with an
+                          object that has already been prepared is saved as a new object.
+        """
+        store_id = getattr(reddit_object, 'store_id', None)
+        new = store_id is None or store_id in saved_ids
+        if new:
+            object_id = next(self.object_ids)
+            changes.new_objects.append((reddit_object, store_id, object_id))
+            reddit_object.store_id = object_id
+        else:
+            object_id = store_id
+        saved_ids.add(object_id)
+        dirty_fields = getattr(reddit_object, 'dirty_fields', None)
+        fields = set(dirty_fields) if dirty_fields else set()
+        if fields:
+            changes.saved_fields.append((reddit_object, fields))
+            dirty_fields.difference_update(fields)
+
+        collections_changed = False
+        if reddit_object.collections_loaded:
+            for name in self.COLLECTIONS:
+                collection = getattr(reddit_object, name)
+                indexed = isinstance(collection, IndexedList)
+                if new or name in fields or (indexed and collection.saved_length is None):
+                    start = 0
+                    changes.rewritten.append((name, object_id))
+                elif indexed and len(collection) > collection.saved_length:
+                    start = collection.saved_length
+                else:
+                    continue
+                length = len(collection)
+                changes.rows[name].extend(self.get_collection_rows(name, object_id, collection, start, length))
+                if indexed:
+                    changes.saved_collections.append(collection)
+                    collection.mark_saved(length)
+                collections_changed = True
+        elif new:
+            changes.copies.append((store_id, object_id))
+
+        if new or fields or collections_changed:
+            changes.object_rows.append(
+                (list_id, position, reddit_object.name, getattr(reddit_object, 'object_type', None),
+                 self.dump_attributes(reddit_object)) +
+                tuple(reddit_object.get_collection_count(name) for name in self.COLLECTIONS) + (object_id,))
+        elif list_changed:
+            changes.positions.append((list_id, position, object_id))
+
+    @staticmethod
+    def get_collection_rows(name, object_id, collection, start, length):
+        """
+        Returns the rows for the items of a collection from the start position up to the supplied length.  The saved
+        content dict is copied before it is read, which happens in a single step, so that content that is added to it
+        while the rows are being made does not end the iteration.
+        """
+        if name == 'previous_downloads':
+            return [(object_id, index, collection[index]) for index in range(start, length)]
+        if name == 'saved_submissions':
+            return [(object_id, index, collection[index].url, pickle.dumps(collection[index]))
+                    for index in range(start, length)]
+        return [(object_id, url, pickle.dumps(value)) for url, value in collection.copy().items()]
+
+    def write(self, changes):
+        """
+        Writes changes that were collected by prepare_save to the database in a single transaction.  This may be called
+        from any thread.
+        :param changes: The changes that are to be written.
+        :type changes: ObjectStoreChanges
+        """
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                connection.executemany('INSERT INTO lists (id, list_type, name) VALUES (?, ?, ?)',
+                                       [(list_id,) + list_key for list_key, list_id in changes.new_lists])
+                for row in changes.object_rows:
+                    updated = connection.execute(
+                        'UPDATE objects SET list_id = ?, position = ?, name = ?, object_type = ?, attributes = ?, '
+                        'previous_download_count = ?, saved_content_count = ?, saved_submission_count = ? '
+                        'WHERE id = ?', row).rowcount
+                    if not updated:
+                        connection.execute(
+                            'INSERT INTO objects (list_id, position, name, object_type, attributes, '
+                            'previous_download_count, saved_content_count, saved_submission_count, id) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', row)
+                connection.executemany('UPDATE objects SET list_id = ?, position = ? WHERE id = ?', changes.positions)
+                for source_id, object_id in changes.copies:
+                    self.copy_collections(connection, source_id, object_id)
+                for name, object_id in changes.rewritten:
+                    connection.execute('DELETE FROM %s WHERE object_id = ?' % name, (object_id,))
+                connection.executemany('INSERT INTO previous_downloads (object_id, position, url) VALUES (?, ?, ?)',
+                                       changes.rows['previous_downloads'])
+                connection.executemany('INSERT OR REPLACE INTO saved_content (object_id, url, value) VALUES (?, ?, ?)',
+                                       changes.rows['saved_content'])
+                connection.executemany('INSERT INTO saved_submissions (object_id, position, url, submission) '
+                                       'VALUES (?, ?, ?, ?)', changes.rows['saved_submissions'])
+                removed_ids = [(x,) for x in changes.removed_ids]
+                for name in self.COLLECTIONS:
+                    connection.executemany('DELETE FROM %s WHERE object_id = ?' % name, removed_ids)
+                connection.executemany('DELETE FROM objects WHERE id = ?', removed_ids)
+                connection.executemany('DELETE FROM lists WHERE id = ?',
+                                       [(list_id,) for list_key, list_id in changes.removed_lists])
+                connection.executemany('INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)', changes.views)
+
+    def finish_save(self, changes, saved):
+        """
+        Completes a save after the changes have been written.  If the write failed, everything that was marked as saved
+        by prepare_save is marked as changed again so that it is written by the next save.
+        :param changes: The changes that were written.
+        :param saved: True if the changes were written successfully.
+        :type changes: ObjectStoreChanges
+        :type saved: bool
+        """
+        if saved:
+            return
+        for reddit_object, fields in changes.saved_fields:
+            reddit_object.dirty_fields.update(fields)
+        for collection in changes.saved_collections:
+            collection.saved_length = None
+        for reddit_object, store_id, object_id in changes.new_objects:
+            reddit_object.store_id = store_id
+        with self.lock:
+            self.stored_ids.difference_update(object_id for reddit_object, store_id, object_id in changes.new_objects)
+            self.stored_ids.update(changes.removed_ids)
+            for list_key, list_id in changes.new_lists:
+                self.stored_lists.pop(list_key, None)
+            self.stored_lists.update(changes.removed_lists)
+
+    @staticmethod
+    def copy_collections(connection, source_id, object_id):
+        """Copies the stored collections of one object to another.  Must be called inside a transaction."""
+        connection.execute('INSERT INTO previous_downloads (object_id, position, url) '
+                           'SELECT ?, position, url FROM previous_downloads WHERE object_id = ?',
+                           (object_id, source_id))
+        connection.execute('INSERT INTO saved_content (object_id, url, value) '
+                           'SELECT ?, url, value FROM saved_content WHERE object_id = ? ORDER BY rowid',
+                           (object_id, source_id))
+        connection.execute('INSERT INTO saved_submissions (object_id, position, url, submission) '
+                           'SELECT ?, position, url, submission FROM saved_submissions WHERE object_id = ?',
+                           (object_id, source_id))
+
+    def dump_attributes(self, reddit_object):
+        """
+        Pickles the supplied reddit object without its collections, which are stored in their own tables, the data
+        that only belongs to the current download session, or the attributes that tie it to this store.
+        :rtype: bytes
+        """
+        state = reddit_object.__getstate__()
+        for name in self.COLLECTIONS + self.SESSION_ATTRIBUTES + self.STORE_ATTRIBUTES:
+            state.pop(name, None)
+        stored_object = reddit_object.__class__.__new__(reddit_object.__class__)
+        stored_object.__setstate__(state)
+        return pickle.dumps(stored_object)
+
+    def __copy__(self):
+        """Reddit objects that are copied before their collections are loaded share the store they are loaded from."""
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+class ObjectStoreChanges:
+
+    def __init__(self):
+        """
+        Holds the rows that are to be written to the object store by a single save, along with what is needed to mark
+        the saved objects as changed again if the write fails.
+        """
+        self.views = []
+        self.new_lists = []  # (list key, list id)
+        self.removed_lists = []  # (list key, list id)
+        self.object_rows = []
+        self.positions = []
+        self.copies = []  # (source object id, object id)
+        self.rewritten = []  # (collection name, object id)
+        self.rows = {'previous_downloads': [], 'saved_content': [], 'saved_submissions': []}
+        self.removed_ids = set()
+        self.new_objects = []  # (reddit object, previous store id, object id)
+        self.saved_fields = []  # (reddit object, field names)
+        self.saved_collections = []
+
+    @property
+    def object_count(self):
+        return len(self.object_rows) + len(self.positions)
+
+    @property
+    def row_count(self):
+        return sum(len(rows) for rows in self.rows.values())
@@ -1,5 +1,6 @@
 from Core.RedditObjects import User, Subreddit
 from Core import Injector
+from Core.IndexedList import IndexedList
 from version import __version__
 
 
@@ -64,6 +65,8 @@ class ObjectUpdater:
         new.do_not_edit = old.do_not_edit
         new.date_limit = old.date_limit
         new.custom_date_limit = old.custom_date_limit
+        new.post_cursor = getattr(old, 'post_cursor', None)
+        new.post_cursor_time = getattr(old, 'post_cursor_time', 0)
         cls.update_save_path(old, new)
         cls.get_previous_downloads(old, new)
         cls.get_saved_content(old, new)
@@ -92,13 +95,28 @@ class ObjectUpdater:
         type new: RedditObject
         """
         try:
-            new.previous_downloads = old.previous_downloads
+            new.previous_downloads = IndexedList(old.previous_downloads)
         except AttributeError:
             try:
-                new.previous_downloads = old.already_downloaded
+                new.previous_downloads = IndexedList(old.already_downloaded)
             except:
                 print('Could not transfer previous downloads')
 
+    @staticmethod
+    def update_collections(reddit_object):
+        """
+        Converts collection attributes that were saved as plain lists to the indexed lists that replaced them.  This is
+        needed for objects that were saved by the current version before the change and so are not otherwise updated.
+        :param reddit_object: The reddit object whose collections are to be checked.
+        :type reddit_object: RedditObject
+        """
+        if not reddit_object.collections_loaded:
+            return  # Collections loaded from the object store are always indexed lists
+        if not isinstance(reddit_object.previous_downloads, IndexedList):
+            reddit_object.previous_downloads = IndexedList(reddit_object.previous_downloads)
+        if not isinstance(reddit_object.saved_submissions, IndexedList):
+            reddit_object.saved_submissions = IndexedList(reddit_object.saved_submissions, key_attribute='url')
+
     @staticmethod
     def get_saved_content(old, new):
         """
@@ -123,7 +141,7 @@ class ObjectUpdater:
         :type new: RedditObject
         """
         try:
-            new.saved_submissions = old.saved_submissions
+            new.saved_submissions = IndexedList(old.saved_submissions, key_attribute='url')
         except AttributeError:
             pass
 
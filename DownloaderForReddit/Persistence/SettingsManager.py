@@ -24,7 +24,6 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 
 
 import os
-import praw
 from PyQt5.QtCore import QSettings
 import logging
 
@@ -48,11 +47,6 @@ class SettingsManager:
             'Include Only NSFW': 'ONLY'
         }
 
-    @property
-    def r(self):
-        return praw.Reddit(user_agent='python:DownloaderForReddit:%s (by /u/MalloyDelacroix)' % __version__,
-                           client_id='frGEUVAuHGL2PQ', client_secret=None)
-
     def check_first_run(self):
         cached_version = self.settings.value("cached_version", "v0.0.0", type=str)
         if cached_version != __version__:
@@ -99,6 +93,18 @@ class SettingsManager:
         default_folder = os.path.join(os.path.expanduser("~"), "Downloads")
         self.save_directory = self.settings.value("save_directory", default_folder, type=str)
         self.max_download_thread_count = self.settings.value('max_download_thread_count', 4, type=int)
+        self.max_host_download_thread_count = self.settings.value('max_host_download_thread_count', 4, type=int)
+        self.extraction_thread_count = self.settings.value('extraction_thread_count', 4, type=int)
+        self.download_engine = self.settings.value('download_engine', 'THREAD_POOL', type=str)
+        self.max_async_download_count = self.settings.value('max_async_download_count', 100, type=int)
+        self.download_write_size = self.settings.value('download_write_size', 256, type=int)  # In KB
+        self.deduplicate_content = self.settings.value('deduplicate_content', False, type=bool)
+        self.max_download_retries = self.settings.value('max_download_retries', 3, type=int)
+        self.global_download_rate_limit = self.settings.value('global_download_rate_limit', 0, type=int)  # In KB/s
+        self.host_download_rate_limit = self.settings.value('host_download_rate_limit', 0, type=int)  # In KB/s
+        self.download_priority_policy = self.settings.value('download_priority_policy', 'ROUND_ROBIN', type=str)
+        self.validation_thread_count = self.settings.value('validation_thread_count', 4, type=int)
+        self.validity_cache_ttl = self.settings.value('validity_cache_ttl', 7, type=int)  # In days
         self.save_undownloaded_content = self.settings.value("save_undownloaded_content", True, type=bool)
         self.save_failed_extracts = self.settings.value('save_failed_extracts', True, type=bool)
         self.set_file_modified_date = self.settings.value('set_file_modified_date', False, type=bool)
@@ -229,6 +235,18 @@ class SettingsManager:
         self.settings.setValue("name_downloads_by", self.name_downloads_by)
         self.settings.setValue("save_directory", self.save_directory)
         self.settings.setValue("max_download_thread_count", self.max_download_thread_count)
+        self.settings.setValue("max_host_download_thread_count", self.max_host_download_thread_count)
+        self.settings.setValue('extraction_thread_count', self.extraction_thread_count)
+        self.settings.setValue('download_engine', self.download_engine)
+        self.settings.setValue('max_async_download_count', self.max_async_download_count)
+        self.settings.setValue('download_write_size', self.download_write_size)
+        self.settings.setValue('deduplicate_content', self.deduplicate_content)
+        self.settings.setValue('max_download_retries', self.max_download_retries)
+        self.settings.setValue('global_download_rate_limit', self.global_download_rate_limit)
+        self.settings.setValue('host_download_rate_limit', self.host_download_rate_limit)
+        self.settings.setValue('download_priority_policy', self.download_priority_policy)
+        self.settings.setValue('validation_thread_count', self.validation_thread_count)
+        self.settings.setValue('validity_cache_ttl', self.validity_cache_ttl)
         self.settings.setValue("save_undownloaded_content", self.save_undownloaded_content)
         self.settings.setValue('save_failed_extracts', self.save_failed_extracts)
         self.settings.setValue('set_file_modified_date', self.set_file_modified_date)
@@ -341,6 +359,18 @@ class SettingsManager:
             'name_downloads_by': self.name_downloads_by,
             'save_directory': self.save_directory,
             'max_download_thread_count': self.max_download_thread_count,
+            'max_host_download_thread_count': self.max_host_download_thread_count,
+            'extraction_thread_count': self.extraction_thread_count,
+            'download_engine': self.download_engine,
+            'max_async_download_count': self.max_async_download_count,
+            'download_write_size': self.download_write_size,
+            'deduplicate_content': self.deduplicate_content,
+            'max_download_retries': self.max_download_retries,
+            'global_download_rate_limit': self.global_download_rate_limit,
+            'host_download_rate_limit': self.host_download_rate_limit,
+            'download_priority_policy': self.download_priority_policy,
+            'validation_thread_count': self.validation_thread_count,
+            'validity_cache_ttl': self.validity_cache_ttl,
             'save_undownloaded_content': self.save_undownloaded_content
         }
 
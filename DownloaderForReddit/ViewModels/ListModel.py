@@ -51,6 +51,7 @@ class ListModel(QAbstractListModel):
         self.name = name
         self.list_type = list_type
         self.reddit_object_list = []
+        self.dirty = True  # Set when objects are added, removed, or reordered and cleared when the list is saved
 
     def sort_lists(self, method):
         """
@@ -65,7 +66,10 @@ class ListModel(QAbstractListModel):
         else:
             att_method = attrgetter('number_of_downloads')
 
+        order = list(self.reddit_object_list)
         self.reddit_object_list.sort(key=att_method, reverse=method[1])
+        if any(x is not y for x, y in zip(order, self.reddit_object_list)):
+            self.dirty = True
         self.refresh()
 
     def check_name(self, name):
@@ -96,6 +100,7 @@ class ListModel(QAbstractListModel):
     def insertRow(self, item, parent=QModelIndex(), *args, **kwargs):
         self.beginInsertRows(parent, self.rowCount() - 1, self.rowCount())
         self.reddit_object_list.append(item)
+        self.dirty = True
         self.endInsertRows()
         return True
 
@@ -103,12 +108,14 @@ class ListModel(QAbstractListModel):
         self.beginRemoveRows(parent, position, position + rows - 1)
         for x in range(rows):
             self.reddit_object_list.remove(self.reddit_object_list[position])
+        self.dirty = True
         self.endRemoveRows()
         return True
 
     def removeRow(self, row, parent=QModelIndex(), *args):
         self.beginRemoveRows(parent, row, row)
         del self.reddit_object_list[row]
+        self.dirty = True
         self.endRemoveRows()
         return True
 
@@ -148,8 +155,9 @@ class ListModel(QAbstractListModel):
             'download_images': 'Download Images: %s' % reddit_object.download_images,
             'avoid_duplicates': 'Avoid Duplicates: %s' % reddit_object.avoid_duplicates,
             'nsfw_filter': 'NSFW Filter: %s' % self.nsfw_filter_display(reddit_object.nsfw_filter),
-            'saved_content_count': 'Saved Content Count: %s' % len(reddit_object.saved_content),
-            'saved_submission_count': 'Saved Submission Count: %s' % len(reddit_object.saved_submissions),
+            'saved_content_count': 'Saved Content Count: %s' % reddit_object.get_collection_count('saved_content'),
+            'saved_submission_count':
+                'Saved Submission Count: %s' % reddit_object.get_collection_count('saved_submissions'),
             'total_download_count': 'Total Downloads: %s' % reddit_object.number_of_downloads,
             'added_on_date': 'Date Added: %s' % self.format_date(reddit_object.user_added)
         }
@@ -85,6 +85,7 @@ class RedditObjectItemDisplayModel(QAbstractListModel):
             del self.content_display[index]
             del self.reddit_object.saved_content[key]
             self.endRemoveRows()
+        self.reddit_object.mark_dirty('saved_content')
 
     def remove_saved_submission(self, index_list, parent):
         for x in index_list:
@@ -0,0 +1,98 @@
+"""
+Compares the memory used by a synthetic library of 10,000 users, each with a few saved posts, using the slotted
+RedditObject and Post classes against the same objects kept in attribute dicts as they were before the classes used
+slots.  Memory is measured both for newly created objects and for objects that have been loaded from pickles, which is
+how the library is loaded from the object store.
+
+Run from the repository root with:
+    PYTHONPATH=DownloaderForReddit python -m Tests.Benchmarks.benchmark_RedditObjects
+"""
+
+
+import pickle
+import tracemalloc
+
+from DownloaderForReddit.Core.RedditObjects import User
+from DownloaderForReddit.Core.Post import Post
+from DownloaderForReddit.Core.IndexedList import IndexedList
+from DownloaderForReddit.version import __version__
+
+
+OBJECT_COUNT = 10000
+POSTS_PER_OBJECT = 3
+SUBREDDITS = ('pics', 'gifs', 'videos', 'earthporn', 'aww')
+
+
+class DictPost:
+
+    """A post that keeps its attributes in an attribute dict, as Post did before it used slots."""
+
+    def __init__(self, post):
+        for name in Post.__slots__:
+            setattr(self, name, getattr(post, name))
+
+
+class DictUser:
+
+    """A user that keeps its attributes in an attribute dict, as User did before it used slots."""
+
+    def __init__(self, user):
+        self.__dict__.update(user.__getstate__())
+        self.__dict__.update(user.DEFAULTS)
+        self.saved_submissions = IndexedList((DictPost(post) for post in user.saved_submissions), key_attribute='url')
+        self.previous_downloads = IndexedList(user.previous_downloads)
+        self.saved_content = {}
+        self.new_submissions = []
+        self.content = []
+        self.failed_extracts = []
+        self.dirty_fields = set()
+
+
+def make_library():
+    library = []
+    for index in range(OBJECT_COUNT):
+        name = 'user_%d' % index
+        user = User(__version__, name, '/home/user/Downloads/Reddit/', 1000, True, True, True, 'INCLUDE',
+                    'Image/Album Id', 1500000000 + index)
+        for position in range(POSTS_PER_OBJECT):
+            user.saved_submissions.append(Post('https://i.imgur.com/%s_%d.jpg' % (name, position), name,
+                                               'Post %d' % position, SUBREDDITS[position % len(SUBREDDITS)],
+                                               1500000000 + position))
+        library.append(user)
+    return library
+
+
+def measure(build):
+    """Returns the objects created by the supplied function and the number of bytes allocated to create them."""
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, size
+
+
+def report(label, dict_size, slot_size):
+    print(label)
+    print('    attribute dicts:  %.2f MB' % (dict_size / 1000000))
+    print('    slots:            %.2f MB' % (slot_size / 1000000))
+    print('    saved:            %.0f%%' % (100 - slot_size * 100 / dict_size))
+
+
+def run():
+    dict_library, dict_size = measure(lambda: [DictUser(user) for user in make_library()])
+    slot_library, slot_size = measure(make_library)
+    report('%s new users with %s saved posts each' % (OBJECT_COUNT, POSTS_PER_OBJECT), dict_size, slot_size)
+
+    # Each object is pickled on its own, as it is in the object store, so strings are not shared between pickles.
+    dict_pickles = [pickle.dumps(user) for user in dict_library]
+    slot_pickles = [pickle.dumps(user) for user in slot_library]
+    del dict_library, slot_library
+    dict_library, dict_size = measure(lambda: [pickle.loads(data) for data in dict_pickles])
+    slot_library, slot_size = measure(lambda: [pickle.loads(data) for data in slot_pickles])
+    report('%s users loaded from pickles' % OBJECT_COUNT, dict_size, slot_size)
+    print('    pickled size:     %.2f MB with attribute dicts, %.2f MB with slots' %
+          (sum(map(len, dict_pickles)) / 1000000, sum(map(len, slot_pickles)) / 1000000))
+
+
+if __name__ == '__main__':
+    run()
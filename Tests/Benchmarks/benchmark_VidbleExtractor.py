@@ -0,0 +1,32 @@
+"""
+Compares the time taken to find the image links on saved vidble pages using the streaming parser in VidbleExtractor
+against parsing the whole page into a BeautifulSoup tree.
+
+Run from the repository root with:
+    PYTHONPATH=DownloaderForReddit python -m Tests.Benchmarks.benchmark_VidbleExtractor
+"""
+
+
+import timeit
+
+from DownloaderForReddit.Extractors.VidbleExtractor import VidbleExtractor
+from Tests.Test_Extractors.test_VidbleExtractor import read_fixture, get_tree_links
+
+
+FIXTURE_NAMES = ('vidble_album.html', 'vidble_single.html')
+NUMBER = 200
+
+
+def run():
+    for name in FIXTURE_NAMES:
+        text = read_fixture(name)
+        tree_time = timeit.timeit(lambda: get_tree_links(text), number=NUMBER) / NUMBER
+        stream_time = timeit.timeit(lambda: VidbleExtractor.get_image_links(text), number=NUMBER) / NUMBER
+        print('%s (%s bytes)' % (name, len(text)))
+        print('    full tree parse:  %.3f ms' % (tree_time * 1000))
+        print('    streaming parse:  %.3f ms' % (stream_time * 1000))
+        print('    speedup:          %.2fx' % (tree_time / stream_time))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,125 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from queue import Queue
+from unittest import mock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from DownloaderForReddit.Core.DownloadRunner import AsyncDownloader
+from DownloaderForReddit.Core.Content import Content
+
+
+FILE_DATA = bytes(range(256)) * 512
+
+
+class MockHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(FILE_DATA)))
+        self.end_headers()
+        self.wfile.write(FILE_DATA)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(AsyncDownloader.available(), 'aiohttp is not installed')
+class AsyncDownloaderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), MockHandler)
+        cls.base_url = 'http://127.0.0.1:%s/' % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.save_path = tempfile.mkdtemp()
+        self.output = Queue()
+
+    def tearDown(self):
+        shutil.rmtree(self.save_path)
+
+    def make_content(self, name):
+        content = Content(self.base_url + name, 'John Everyman', 'Fluffiest Kitten Ever', 'Aww', name, '', '.jpg',
+                          self.save_path, None, 1500000000, False)
+        content.queue = self.output
+        return content
+
+    def run_downloader(self, content_list):
+        queue = Queue()
+        for content in content_list:
+            queue.put(content)
+        queue.put(None)
+        downloader = AsyncDownloader(queue, 50, 10)
+        downloader.download()
+        return downloader
+
+    def test_download_many(self):
+        content_list = [self.make_content('FluffyKitten%s' % x) for x in range(100)]
+        downloader = self.run_downloader(content_list)
+        self.assertEqual(downloader.download_count, 100)
+        for content in content_list:
+            self.assertTrue(content.downloaded)
+            with open(content.filename, 'rb') as file:
+                self.assertEqual(file.read(), FILE_DATA)
+            self.assertFalse(os.path.exists(content.part_filename))
+
+    def test_unsuccessful_response(self):
+        content = self.make_content('missing')
+        self.run_downloader([content])
+        self.assertFalse(content.downloaded)
+        self.assertTrue(self.output.get().startswith('Failed Download'))
+
+    def test_disk_work_is_not_run_on_event_loop_thread(self):
+        content = self.make_content('FluffyKitten')
+        threads = []
+
+        def record(method):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return method(content, *args)
+            return wrapper
+
+        with mock.patch.object(content, 'open_part_file', record(Content.open_part_file)), \
+                mock.patch.object(content, 'write_chunk', record(Content.write_chunk)), \
+                mock.patch.object(content, 'finish_download', record(Content.finish_download)):
+            self.run_downloader([content])
+        self.assertTrue(content.downloaded)
+        self.assertGreater(len(threads), 2)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_stop_ends_bandwidth_wait(self):
+        content = self.make_content('FluffyKitten')
+        queue = Queue()
+        queue.put(content)
+        queue.put(None)
+        downloader = AsyncDownloader(queue, 50, 10)
+        with mock.patch.object(content.bandwidth_limiter, 'reserve', return_value=60):
+            thread = threading.Thread(target=downloader.download)
+            thread.start()
+            deadline = time.time() + 5
+            while content.bytes_received == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            start = time.perf_counter()
+            downloader.stop()
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(content.downloaded)
+        self.assertTrue(os.path.isfile(content.part_filename))
@@ -0,0 +1,46 @@
+import unittest
+
+from DownloaderForReddit.Core.BandwidthLimiter import TokenBucket, BandwidthLimiter
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_unlimited(self):
+        bucket = TokenBucket(0)
+        self.assertEqual(0, bucket.reserve(10 ** 9))
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(1000)
+        self.assertEqual(0, bucket.reserve(1000))
+        self.assertAlmostEqual(0.5, bucket.reserve(500), places=2)
+
+    def test_lowered_rate_keeps_debt(self):
+        bucket = TokenBucket(1000)
+        bucket.reserve(1500)
+        bucket.set_rate(100)
+        self.assertAlmostEqual(6, bucket.reserve(100), places=1)
+
+
+class BandwidthLimiterTest(unittest.TestCase):
+
+    def test_host_limit_applies_per_host(self):
+        limiter = BandwidthLimiter(0, 1)
+        self.assertEqual(0, limiter.reserve('i.imgur.com', 1024))
+        self.assertGreater(limiter.reserve('i.imgur.com', 1024), 0)
+        self.assertEqual(0, limiter.reserve('i.redd.it', 1024))
+
+    def test_global_limit_applies_to_all_hosts(self):
+        limiter = BandwidthLimiter(1, 0)
+        self.assertEqual(0, limiter.reserve('i.imgur.com', 1024))
+        self.assertGreater(limiter.reserve('i.redd.it', 1024), 0)
+
+    def test_configure_removes_limit(self):
+        limiter = BandwidthLimiter(1, 1)
+        limiter.reserve('i.imgur.com', 1024)
+        limiter.configure(0, 0)
+        self.assertEqual(0, limiter.reserve('i.imgur.com', 1024))
+
+    def test_throughput(self):
+        limiter = BandwidthLimiter()
+        limiter.reserve('i.imgur.com', 3000)
+        self.assertEqual(3000 / BandwidthLimiter.THROUGHPUT_WINDOW, limiter.get_throughput())
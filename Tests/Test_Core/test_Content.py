@@ -1,7 +1,53 @@
+import os
+import shutil
+import tempfile
+import threading
 import unittest
+import time
+from queue import Queue
+from unittest import mock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from DownloaderForReddit.Core.Content import Content
 
 
+FILE_DATA = bytes(range(256)) * 64
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+
+    """
+    Serves FILE_DATA, honouring the start of a Range header.  Files under /wrong_range/ answer range requests with
+    content that starts ten bytes before the requested position.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    requested_ranges = []
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        self.requested_ranges.append(range_header)
+        start = int(range_header[6:].split('-', 1)[0]) if range_header else 0
+        if start >= len(FILE_DATA):
+            self.send_response(416)
+            self.send_header('Content-Range', 'bytes */%s' % len(FILE_DATA))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if range_header and self.path.startswith('/wrong_range/'):
+            start -= 10
+        if range_header:
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %s-%s/%s' % (start, len(FILE_DATA) - 1, len(FILE_DATA)))
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(FILE_DATA) - start))
+        self.end_headers()
+        self.wfile.write(FILE_DATA[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+
 class ContentTest(unittest.TestCase):
 
 
@@ -70,3 +116,88 @@ class ContentTest(unittest.TestCase):
         self.assertEqual(Content.clean_filename(name_one), name_one_correct)
         self.assertEqual(Content.clean_filename(name_two), name_two_correct)
         self.assertEqual(Content.clean_filename(name_three), name_three)
+
+
+class ContentResumeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        cls.base_url = 'http://127.0.0.1:%s/' % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.save_path = tempfile.mkdtemp()
+        RangeHandler.requested_ranges = []
+
+    def tearDown(self):
+        shutil.rmtree(self.save_path)
+
+    def make_content(self, path, part_data=None):
+        content = Content(self.base_url + path, 'John Everyman', 'Fluffiest Kitten Ever', 'Aww', 'FluffyKitten', '',
+                          '.jpg', self.save_path, None, 1500000000, False)
+        content.queue = Queue()
+        if part_data is not None:
+            with open(content.part_filename, 'wb') as file:
+                file.write(part_data)
+            content.bytes_received = len(part_data)
+        return content
+
+    def assert_saved(self, content):
+        self.assertTrue(content.downloaded)
+        self.assertFalse(os.path.exists(content.part_filename))
+        with open(content.filename, 'rb') as file:
+            self.assertEqual(FILE_DATA, file.read())
+
+    def test_download_resumes_from_part_file(self):
+        content = self.make_content('file.jpg', FILE_DATA[:1000])
+        content.run()
+        self.assert_saved(content)
+        self.assertEqual(['bytes=1000-'], RangeHandler.requested_ranges)
+        self.assertEqual(len(FILE_DATA) - 1000, content.bytes_transferred)
+
+    def test_short_part_file_starts_from_beginning(self):
+        content = self.make_content('file.jpg', FILE_DATA[:1000])
+        content.bytes_received = 2000
+        content.run()
+        self.assert_saved(content)
+        self.assertEqual([None], RangeHandler.requested_ranges)
+
+    def test_mismatched_content_range_restarts_download(self):
+        content = self.make_content('wrong_range/file.jpg', FILE_DATA[:1000])
+        content.run()
+        self.assert_saved(content)
+        self.assertEqual(['bytes=1000-', None], RangeHandler.requested_ranges)
+        self.assertEqual(0, content.retry_count)
+
+    def test_complete_part_file_is_finished(self):
+        content = self.make_content('file.jpg', FILE_DATA)
+        content.run()
+        self.assert_saved(content)
+        self.assertEqual(0, content.bytes_transferred)
+
+    def test_stop_ends_bandwidth_wait(self):
+        content = self.make_content('file.jpg')
+        with mock.patch.object(content.bandwidth_limiter, 'reserve', return_value=60):
+            thread = threading.Thread(target=content.run)
+            thread.start()
+            time.sleep(0.2)
+            start = time.perf_counter()
+            content.stop()
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(content.downloaded)
+        self.assertTrue(os.path.isfile(content.part_filename))
+
+    def test_content_range_checks(self):
+        self.assertTrue(Content.check_content_range({'Content-Range': 'bytes 100-199/200'}, 100))
+        self.assertFalse(Content.check_content_range({'Content-Range': 'bytes 0-199/200'}, 100))
+        self.assertFalse(Content.check_content_range({}, 100))
+        self.assertTrue(Content.check_part_complete(416, {'Content-Range': 'bytes */200'}, 200))
+        self.assertFalse(Content.check_part_complete(416, {'Content-Range': 'bytes */300'}, 200))
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from DownloaderForReddit.Core.ContentStore import ContentStore
+from DownloaderForReddit.Core import Injector
+
+
+class ContentStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ContentStore(os.path.join(self.directory.name, 'content_index'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def make_part(self, name, data):
+        path = os.path.join(self.directory.name, '%s.part' % name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_first_copy_is_moved_into_place(self):
+        part = self.make_part('first', b'content')
+        path = os.path.join(self.directory.name, 'first')
+        self.assertFalse(self.store.save(part, path, 'hash'))
+        self.assertTrue(os.path.isfile(path))
+        self.assertFalse(os.path.exists(part))
+
+    def test_duplicate_is_linked_to_first_copy(self):
+        first = os.path.join(self.directory.name, 'first')
+        second = os.path.join(self.directory.name, 'second')
+        self.store.save(self.make_part('first', b'content'), first, 'hash')
+        part = self.make_part('second', b'content')
+        self.assertTrue(self.store.save(part, second, 'hash'))
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertFalse(os.path.exists(part))
+
+    def test_missing_copy_is_replaced_in_index(self):
+        first = os.path.join(self.directory.name, 'first')
+        second = os.path.join(self.directory.name, 'second')
+        third = os.path.join(self.directory.name, 'third')
+        self.store.save(self.make_part('first', b'content'), first, 'hash')
+        os.remove(first)
+        self.assertFalse(self.store.save(self.make_part('second', b'content'), second, 'hash'))
+        self.assertTrue(self.store.save(self.make_part('third', b'content'), third, 'hash'))
+        self.assertTrue(os.path.samefile(second, third))
+
+    def test_index_is_kept_between_stores(self):
+        first = os.path.join(self.directory.name, 'first')
+        second = os.path.join(self.directory.name, 'second')
+        self.store.save(self.make_part('first', b'content'), first, 'hash')
+        self.store.close()
+        self.store = ContentStore(os.path.join(self.directory.name, 'content_index'))
+        self.assertTrue(self.store.save(self.make_part('second', b'content'), second, 'hash'))
+
+    def test_concurrent_saves(self):
+        paths = [os.path.join(self.directory.name, 'file_%s' % x) for x in range(20)]
+        parts = [self.make_part('file_%s' % x, b'content %d' % (x % 4)) for x in range(20)]
+        threads = [threading.Thread(target=self.store.save, args=(part, path, 'hash %s' % (x % 4)))
+                   for x, (part, path) in enumerate(zip(parts, paths))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for x, path in enumerate(paths):
+            with open(path, 'rb') as file:
+                self.assertEqual(b'content %d' % (x % 4), file.read())
+        self.assertFalse(any(path.endswith('.part') for path in os.listdir(self.directory.name)))
+
+    def test_injector_creates_one_store(self):
+        def make_store():
+            time.sleep(0.05)
+            return object()
+
+        with mock.patch.object(Injector, 'content_store', None), \
+                mock.patch.object(Injector, 'ContentStore', side_effect=make_store) as store_class:
+            stores = []
+            threads = [threading.Thread(target=lambda: stores.append(Injector.get_content_store())) for x in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(1, store_class.call_count)
+        self.assertEqual(1, len(set(map(id, stores))))
@@ -0,0 +1,222 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from queue import Queue
+from unittest import mock
+
+from PyQt5.QtCore import QObject, QCoreApplication
+
+from DownloaderForReddit.Core.DownloadRunner import DownloadRunner
+from DownloaderForReddit.Core.DownloadScheduler import DownloadScheduler
+from DownloaderForReddit.Core.Content import Content
+from DownloaderForReddit.Core.RedditObjects import User
+from DownloaderForReddit.version import __version__
+
+
+class MockPost:
+
+    def __init__(self, fullname, created, stickied=False):
+        self.fullname = fullname
+        self.created = created
+        self.stickied = stickied
+
+
+class MockListing:
+
+    """A stand in for a praw new listing method that records how many posts have been read from the listing."""
+
+    def __init__(self, posts):
+        self.posts = posts
+        self.read_count = 0
+
+    def __call__(self, limit=None):
+        for post in self.posts[:limit]:
+            self.read_count += 1
+            yield post
+
+
+class MockReddit:
+
+    def __init__(self, posts):
+        self.posts = posts
+        self.requests = []
+
+    def get(self, path, params=None):
+        self.requests.append((path, params))
+        return iter(self.posts)
+
+
+def make_runner(page_posts=None):
+    """Returns a download runner that is not started, with a reddit instance that returns the supplied posts."""
+    runner = DownloadRunner.__new__(DownloadRunner)
+    runner._r = MockReddit(page_posts if page_posts is not None else [])
+    return runner
+
+
+def make_user(date_limit=350, post_cursor=None, post_cursor_time=None):
+    user = User(__version__, 'name', '/downloads/', 25, True, True, True, 'INCLUDE', 'TITLE', 1500000000)
+    user.date_limit = date_limit
+    user.post_cursor = post_cursor
+    user.post_cursor_time = post_cursor_time if post_cursor_time is not None else time.time()
+    return user
+
+
+class GetNewSubmissionsTest(unittest.TestCase):
+
+    def test_listing_stops_at_date_limit(self):
+        listing = MockListing([MockPost('t3_pinned', 100, stickied=True), MockPost('t3_e', 500),
+                               MockPost('t3_d', 400), MockPost('t3_c', 300), MockPost('t3_b', 200)])
+        posts = list(make_runner().get_new_submissions(listing, make_user(date_limit=350)))
+        self.assertEqual(['t3_pinned', 't3_e', 't3_d'], [post.fullname for post in posts])
+        self.assertEqual(4, listing.read_count)
+
+    def test_cursor_page_is_the_only_request(self):
+        runner = make_runner([MockPost('t3_f', 600)])
+        listing = MockListing([MockPost('t3_f', 600), MockPost('t3_e', 500)])
+        posts = list(runner.get_new_submissions(listing, make_user(post_cursor='t3_e')))
+        self.assertEqual(['t3_f'], [post.fullname for post in posts])
+        self.assertEqual(0, listing.read_count)
+        self.assertEqual(('user/name/submitted', {'sort': 'new', 'limit': 25, 'before': 't3_e'}),
+                         runner._r.requests[0])
+
+
+class CursorTest(unittest.TestCase):
+
+    def test_expired_cursor_is_not_used(self):
+        runner = make_runner([MockPost('t3_f', 600)])
+        user = make_user(post_cursor='t3_e', post_cursor_time=time.time() - DownloadRunner.CURSOR_MAX_AGE - 1)
+        self.assertIsNone(runner.get_cursor_page(user))
+        self.assertEqual([], runner._r.requests)
+
+    def test_cursor_is_not_used_with_custom_date_limit(self):
+        runner = make_runner([MockPost('t3_f', 600)])
+        user = make_user(post_cursor='t3_e')
+        user.custom_date_limit = 100
+        self.assertIsNone(runner.get_cursor_page(user))
+        self.assertEqual([], runner._r.requests)
+
+    def test_full_cursor_page_is_not_used(self):
+        runner = make_runner([MockPost('t3_%d' % x, 1000 + x) for x in range(25)])
+        self.assertIsNone(runner.get_cursor_page(make_user(post_cursor='t3_e')))
+        self.assertEqual(1, len(runner._r.requests))
+
+    def test_empty_cursor_page_is_not_used(self):
+        runner = make_runner([])
+        self.assertIsNone(runner.get_cursor_page(make_user(post_cursor='t3_e')))
+        self.assertEqual(1, len(runner._r.requests))
+
+    def test_deleted_cursor_post_does_not_hide_new_posts(self):
+        runner = make_runner([])
+        user = make_user(post_cursor='t3_deleted')
+        listing = MockListing([MockPost('t3_f', 600), MockPost('t3_e', 500), MockPost('t3_d', 300)])
+        posts = list(runner.get_new_submissions(listing, user))
+        self.assertEqual(['t3_f', 't3_e'], [post.fullname for post in posts])
+        self.assertEqual('t3_deleted', user.post_cursor)
+
+    def test_cursor_is_renewed_when_it_is_the_newest_post(self):
+        user = make_user(post_cursor='t3_e', post_cursor_time=0)
+        DownloadRunner.check_post_cursor(user, MockPost('t3_e', 300), 350)
+        self.assertEqual('t3_e', user.post_cursor)
+        self.assertTrue(user.post_cursor_time > 0)
+
+    def test_cursor_to_deleted_post_is_cleared(self):
+        user = make_user(post_cursor='t3_e')
+        DownloadRunner.check_post_cursor(user, MockPost('t3_d', 300), 350)
+        self.assertIsNone(user.post_cursor)
+
+    def test_cursor_is_kept_when_newer_posts_exist(self):
+        user = make_user(post_cursor='t3_e')
+        DownloadRunner.check_post_cursor(user, MockPost('t3_f', 600), 350)
+        self.assertEqual('t3_e', user.post_cursor)
+
+    def test_listing_invalidates_cursor_to_deleted_post(self):
+        user = make_user(post_cursor='t3_e', post_cursor_time=time.time() - DownloadRunner.CURSOR_MAX_AGE - 1)
+        listing = MockListing([MockPost('t3_d', 300), MockPost('t3_c', 200)])
+        posts = list(make_runner().get_new_submissions(listing, user))
+        self.assertEqual([], posts)
+        self.assertIsNone(user.post_cursor)
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+
+    """Sends a large file slowly so that a download is still in progress when it is stopped."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(1048576 * 100))
+        self.end_headers()
+        try:
+            for _ in range(1600):
+                self.wfile.write(bytes(65536))
+                self.wfile.flush()
+                time.sleep(0.01)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StopSignalTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # The downloader's thread runs an event loop, which needs an application.
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.save_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.save_path)
+
+    def make_runner(self):
+        """Returns a download runner that only has what is needed to start its downloader."""
+        runner = DownloadRunner.__new__(DownloadRunner)
+        QObject.__init__(runner)
+        runner.settings_manager = mock.Mock(download_engine='THREAD', max_download_thread_count=2,
+                                            max_host_download_thread_count=2,
+                                            download_priority_policy=DownloadScheduler.ROUND_ROBIN)
+        runner.logger = mock.Mock()
+        runner.queued_posts = Queue()
+        runner.priority_objects = set()
+        return runner
+
+    def test_stop_signal_stops_busy_downloader(self):
+        runner = self.make_runner()
+        content = Content('http://127.0.0.1:%s/SlowKitten' % self.server.server_address[1], 'John Everyman',
+                          'Slowest Kitten Ever', 'Aww', 'SlowKitten', '', '.jpg', self.save_path, None, 1500000000,
+                          False)
+        content.queue = Queue()
+        runner.queued_posts.put(content)
+        runner.start_downloader()
+        deadline = time.time() + 5
+        while content.bytes_received == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(content.bytes_received > 0)
+
+        # The stop is emitted from another thread, as it is when the GUI stops a runner whose thread is busy, and no
+        # events are processed until the content has stopped, so the stop must not depend on an event loop.
+        threading.Thread(target=runner.stop.emit).start()
+        deadline = time.time() + 5
+        while not content.stopped and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(content.stopped)
+        deadline = time.time() + 5
+        while not runner.downloader_thread.isFinished() and time.time() < deadline:
+            # The downloader's thread is told to quit through the event loop of the thread that started it.
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.assertTrue(runner.downloader_thread.isFinished())
+        self.assertFalse(content.downloaded)
+        self.assertTrue(os.path.exists(content.part_filename))
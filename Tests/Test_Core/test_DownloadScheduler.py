@@ -0,0 +1,114 @@
+import unittest
+from DownloaderForReddit.Core.DownloadScheduler import DownloadScheduler
+
+
+class MockContent:
+
+    def __init__(self, host, name, reddit_object_name=None, content_length=None):
+        self.host = host
+        self.name = name
+        self.reddit_object_name = reddit_object_name
+        self.content_length = content_length
+
+
+class DownloadSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = DownloadScheduler(4, 2)
+
+    def fill(self, host, count):
+        for x in range(count):
+            self.scheduler.put(MockContent(host, '%s_%s' % (host, x)))
+
+    def test_hosts_dispatched_round_robin(self):
+        self.fill('i.imgur.com', 3)
+        self.fill('i.redd.it', 2)
+        hosts = [self.scheduler.get().host for _ in range(4)]
+        self.assertEqual(hosts, ['i.imgur.com', 'i.redd.it', 'i.imgur.com', 'i.redd.it'])
+
+    def test_host_limit(self):
+        self.fill('i.imgur.com', 3)
+        self.scheduler.get()
+        self.scheduler.get()
+        with self.scheduler.condition:
+            self.assertIsNone(self.scheduler.next_post())
+        self.assertEqual(self.scheduler.get_queue_depths(), {'i.imgur.com': 1})
+
+    def test_task_done_releases_host_slot(self):
+        self.fill('i.imgur.com', 3)
+        first = self.scheduler.get()
+        self.scheduler.get()
+        self.scheduler.task_done(first)
+        self.assertEqual(self.scheduler.get().name, 'i.imgur.com_2')
+
+    def test_global_limit(self):
+        scheduler = DownloadScheduler(1, 2)
+        scheduler.put(MockContent('a', 'a'))
+        scheduler.put(MockContent('b', 'b'))
+        scheduler.get()
+        with scheduler.condition:
+            self.assertIsNone(scheduler.next_post())
+
+    def test_closed_and_empty_returns_none(self):
+        self.fill('i.imgur.com', 1)
+        self.scheduler.close()
+        post = self.scheduler.get()
+        self.assertIsNotNone(post)
+        self.scheduler.task_done(post)
+        self.assertIsNone(self.scheduler.get())
+
+    def test_closed_waits_for_retry(self):
+        self.fill('i.imgur.com', 1)
+        self.scheduler.close()
+        post = self.scheduler.get()
+        self.scheduler.put_later(post, 0.05)
+        self.scheduler.task_done(post)
+        self.assertIs(post, self.scheduler.get())
+        self.scheduler.task_done(post)
+        self.assertIsNone(self.scheduler.get())
+
+    def test_clear(self):
+        self.fill('i.imgur.com', 2)
+        self.fill('gfycat.com', 1)
+        self.scheduler.put_later(MockContent('i.redd.it', 'i.redd.it'), 60)
+        removed = self.scheduler.clear()
+        self.assertEqual(len(removed), 4)
+        self.assertIsNone(self.scheduler.get())
+
+    def test_round_robin_between_reddit_objects(self):
+        scheduler = DownloadScheduler(1, 1)
+        for x in range(3):
+            scheduler.put(MockContent('i.imgur.com', 'big_%s' % x, 'big'))
+        scheduler.put(MockContent('i.imgur.com', 'small_0', 'small'))
+        names = []
+        for _ in range(3):
+            post = scheduler.get()
+            names.append(post.name)
+            scheduler.task_done(post)
+        self.assertEqual(names, ['big_0', 'small_0', 'big_1'])
+
+    def test_smallest_first(self):
+        scheduler = DownloadScheduler(1, 1, DownloadScheduler.SMALLEST_FIRST)
+        scheduler.put(MockContent('i.imgur.com', 'unknown'))
+        scheduler.put(MockContent('i.imgur.com', 'large', content_length=5000))
+        scheduler.put(MockContent('i.imgur.com', 'small', content_length=10))
+        names = []
+        for _ in range(3):
+            post = scheduler.get()
+            names.append(post.name)
+            scheduler.task_done(post)
+        self.assertEqual(names, ['small', 'large', 'unknown'])
+
+    def test_prioritized_object_jumps_ahead(self):
+        scheduler = DownloadScheduler(1, 1, DownloadScheduler.FIFO)
+        scheduler.put(MockContent('i.imgur.com', 'bulk_0', 'bulk'))
+        scheduler.put(MockContent('i.imgur.com', 'bulk_1', 'bulk'))
+        scheduler.put(MockContent('i.redd.it', 'single_0', 'single'))
+        scheduler.prioritize('single')
+        scheduler.put(MockContent('i.redd.it', 'single_1', 'single'))
+        names = []
+        for _ in range(4):
+            post = scheduler.get()
+            names.append(post.name)
+            scheduler.task_done(post)
+        self.assertEqual(names, ['single_0', 'single_1', 'bulk_0', 'bulk_1'])
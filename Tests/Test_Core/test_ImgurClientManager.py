@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from DownloaderForReddit.Core.ImgurClientManager import ImgurClientManager, ImgurCreditError
+
+
+class MockResponse:
+
+    def __init__(self, data, headers):
+        self.status_code = 200
+        self.data = data
+        self.headers = headers
+
+    def json(self):
+        return {'data': self.data, 'success': True, 'status': 200}
+
+
+class MockRequests:
+
+    """A stand in for the requests module used by the imgur client that answers every request with the credits."""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, headers=None, params=None, data=None):
+        self.urls.append(url)
+        return MockResponse({'UserLimit': 500, 'UserRemaining': 499, 'UserReset': 1500000000, 'ClientLimit': 12500,
+                             'ClientRemaining': 12000},
+                            {'X-RateLimit-UserRemaining': '499', 'X-RateLimit-ClientRemaining': '12000'})
+
+
+class ImgurClientManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = ImgurClientManager()
+
+    def test_credits_read_from_headers(self):
+        self.manager.update_credits({'ClientRemaining': '5000', 'UserRemaining': '400', 'UserReset': None})
+        self.manager.update_credits({'ClientRemaining': '4999', 'UserRemaining': None})
+        self.assertEqual({'credits_used': 2, 'client_remaining': 4999, 'user_remaining': 400},
+                         self.manager.get_stats())
+
+    def test_no_requests_when_client_credits_run_low(self):
+        self.manager.update_credits({'ClientRemaining': str(ImgurClientManager.CLIENT_CREDIT_RESERVE)})
+        with self.assertRaises(ImgurCreditError):
+            self.manager.wait_for_credits()
+
+    def test_no_requests_when_user_credits_reset_too_late(self):
+        self.manager.update_credits({'UserRemaining': '0', 'UserReset': str(int(time.time()) + 3600)})
+        with self.assertRaises(ImgurCreditError):
+            self.manager.wait_for_credits()
+
+    def test_user_credits_reset_wait(self):
+        self.manager.update_credits({'UserRemaining': '0', 'UserReset': str(int(time.time()))})
+        self.manager.wait_for_credits()
+        self.assertIsNone(self.manager.get_credit('UserRemaining'))
+
+    def test_get_client_requests_credits_without_deadlock(self):
+        mock_requests = MockRequests()
+        clients = []
+        with mock.patch('imgurpython.client.requests', mock_requests):
+            thread = threading.Thread(target=lambda: clients.append(self.manager.get_client('id', 'secret')),
+                                      daemon=True)
+            thread.start()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+            self.assertIs(clients[0], self.manager.get_client('id', 'secret'))
+        self.assertEqual(['https://api.imgur.com/3/credits'], mock_requests.urls)
+        self.assertEqual(12000, self.manager.get_credit('ClientRemaining'))
+        self.assertEqual(1, self.manager.get_stats()['credits_used'])
+
+    def test_stop_ends_user_credits_reset_wait(self):
+        self.manager.update_credits({'UserRemaining': '0', 'UserReset': str(int(time.time()) + 60)})
+        errors = []
+
+        def wait():
+            try:
+                self.manager.wait_for_credits()
+            except ImgurCreditError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=wait, daemon=True)
+        thread.start()
+        time.sleep(0.1)
+        self.assertEqual(0, self.manager.get_stats()['user_remaining'])
+        self.manager.stop_run()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, len(errors))
+
+    def test_start_run_resets_usage(self):
+        self.manager.update_credits({})
+        self.manager.start_run()
+        self.assertEqual(0, self.manager.get_stats()['credits_used'])
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from DownloaderForReddit.Core.ImgurMetadataCache import ImgurMetadataCache
+
+
+IMAGES = [{'link': 'https://i.imgur.com/abc.gif', 'type': 'image/gif', 'animated': True,
+           'mp4': 'https://i.imgur.com/abc.mp4'}]
+
+
+class ImgurMetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, 'imgur_cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_cache(self, **kwargs):
+        cache = ImgurMetadataCache(self.cache_path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_stored_images_returned(self):
+        cache = self.make_cache()
+        cache.put(cache.ALBUM, 'abc', IMAGES)
+        self.assertEqual(IMAGES, cache.get(cache.ALBUM, 'abc'))
+        self.assertIsNone(cache.get(cache.IMAGE, 'abc'))
+
+    def test_expired_entries_ignored(self):
+        cache = self.make_cache(ttl=0)
+        cache.put(cache.IMAGE, 'abc', IMAGES)
+        self.assertIsNone(cache.get(cache.IMAGE, 'abc'))
+
+    def access_time(self, cache, kind, imgur_id):
+        return cache.connection.execute('SELECT accessed FROM imgur_metadata WHERE key = ?',
+                                        (cache.get_key(kind, imgur_id),)).fetchone()[0]
+
+    def test_least_recently_used_entry_removed(self):
+        cache = self.make_cache(max_entries=2)
+        with mock.patch('time.time', return_value=1000):
+            cache.put(cache.IMAGE, 'one', IMAGES)
+        with mock.patch('time.time', return_value=2000):
+            cache.put(cache.IMAGE, 'two', IMAGES)
+        with mock.patch('time.time', return_value=1000 + cache.TOUCH_INTERVAL):
+            cache.get(cache.IMAGE, 'one')
+            cache.put(cache.IMAGE, 'three', IMAGES)
+            self.assertIsNotNone(cache.get(cache.IMAGE, 'one'))
+            self.assertIsNone(cache.get(cache.IMAGE, 'two'))
+            self.assertIsNotNone(cache.get(cache.IMAGE, 'three'))
+
+    def test_recent_access_time_not_updated(self):
+        cache = self.make_cache()
+        with mock.patch('time.time', return_value=1000):
+            cache.put(cache.IMAGE, 'one', IMAGES)
+        with mock.patch('time.time', return_value=1000 + cache.TOUCH_INTERVAL - 1):
+            self.assertEqual(IMAGES, cache.get(cache.IMAGE, 'one'))
+        self.assertEqual({}, cache.touched)
+        self.assertEqual(1000, self.access_time(cache, cache.IMAGE, 'one'))
+
+    def test_stale_access_time_written_on_close(self):
+        cache = self.make_cache()
+        with mock.patch('time.time', return_value=1000):
+            cache.put(cache.IMAGE, 'one', IMAGES)
+        with mock.patch('time.time', return_value=1000 + cache.TOUCH_INTERVAL):
+            cache.get(cache.IMAGE, 'one')
+        self.assertEqual(1000, self.access_time(cache, cache.IMAGE, 'one'))
+        cache.close()
+        cache = self.make_cache()
+        cache.connect()
+        self.assertEqual(1000 + cache.TOUCH_INTERVAL, self.access_time(cache, cache.IMAGE, 'one'))
@@ -0,0 +1,39 @@
+import pickle
+import unittest
+
+from DownloaderForReddit.Core.IndexedList import IndexedList
+
+
+class Item:
+
+    def __init__(self, url):
+        self.url = url
+
+
+class IndexedListTest(unittest.TestCase):
+
+    def test_keeps_insertion_order(self):
+        items = IndexedList(['c', 'a', 'b'])
+        items.append('a')
+        self.assertEqual(['c', 'a', 'b', 'a'], list(items))
+        self.assertEqual('b', items[2])
+        self.assertEqual(4, len(items))
+
+    def test_membership_after_delete(self):
+        items = IndexedList(['a', 'b', 'a'])
+        del items[0]
+        self.assertIn('a', items)
+        del items[1]
+        self.assertNotIn('a', items)
+        self.assertIn('b', items)
+
+    def test_key_attribute(self):
+        items = IndexedList([Item('x'), Item('y')], key_attribute='url')
+        self.assertTrue(items.contains_key('x'))
+        self.assertIn(Item('y'), items)
+        self.assertFalse(items.contains_key('z'))
+
+    def test_pickle_rebuilds_index(self):
+        items = pickle.loads(pickle.dumps(IndexedList(['a', 'b'])))
+        self.assertEqual(['a', 'b'], items)
+        self.assertIn('b', items)
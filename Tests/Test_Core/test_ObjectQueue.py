@@ -0,0 +1,42 @@
+import unittest
+
+from DownloaderForReddit.Core.ObjectQueue import ObjectQueue
+
+
+class MockObject:
+
+    def __init__(self, name):
+        self.name = name
+
+
+class ObjectQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = ObjectQueue()
+        for x in range(5):
+            self.queue.put(MockObject('object_%s' % x))
+        self.queue.put(None)
+
+    def take_names(self):
+        names = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            names.append(item.name if item is not None else None)
+        return names
+
+    def test_objects_taken_in_order(self):
+        self.assertEqual(['object_0', 'object_1', 'object_2', 'object_3', 'object_4', None], self.take_names())
+
+    def test_prioritized_object_taken_first(self):
+        self.queue.prioritize('object_3')
+        self.assertEqual(['object_3', 'object_0', 'object_1', 'object_2', 'object_4', None], self.take_names())
+
+    def test_object_put_after_prioritize_taken_first(self):
+        priority_names = set()
+        queue = ObjectQueue(priority_names)
+        ObjectQueue(priority_names).prioritize('late')
+        queue.put(MockObject('early'))
+        queue.put(MockObject('late'))
+        self.assertEqual('late', queue.get_nowait().name)
+        self.assertEqual('early', queue.get_nowait().name)
+        self.assertEqual({'late'}, priority_names)
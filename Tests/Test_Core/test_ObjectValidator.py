@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from DownloaderForReddit.Core.ObjectValidator import ObjectValidator
+
+
+class Subreddit:
+
+    def __init__(self, display_name):
+        self.display_name = display_name
+        self.fullname = 't5_%s' % display_name.lower()
+
+
+class RedditState:
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.requests = []
+
+    def get(self, path, params=None):
+        self.requests.append((path, params))
+        names = params['sr_name'].split(',')
+        return [Subreddit(name) for name in names if name.lower() in self.existing]
+
+
+class ObjectValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, 'validity_cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_subreddits_checked_in_one_batch(self):
+        reddit = RedditState({'pics', 'earthporn'})
+        validator = ObjectValidator(reddit, 3600, self.cache_path)
+        results = validator.check_subreddits(['pics', 'EarthPorn', 'banned_sub'])
+        self.assertEqual({'pics': True, 'EarthPorn': True, 'banned_sub': None}, results)
+        self.assertEqual(1, len(reddit.requests))
+
+    def test_cached_results_are_not_requested_again(self):
+        reddit = RedditState({'pics'})
+        validator = ObjectValidator(reddit, 3600, self.cache_path)
+        validator.check_subreddits(['pics'])
+        validator.record(ObjectValidator.SUBREDDIT, 'banned_sub', False)
+        validator.save()
+        results = validator.check_subreddits(['pics', 'banned_sub'])
+        self.assertEqual({'pics': True, 'banned_sub': False}, results)
+        self.assertEqual(1, len(reddit.requests))
+
+    def test_subreddits_missing_from_batch_are_not_cached(self):
+        reddit = RedditState({'pics'})
+        validator = ObjectValidator(reddit, 3600, self.cache_path)
+        validator.check_subreddits(['pics', 'missing_sub'])
+        validator.save()
+        results, expired = validator.read_cache(ObjectValidator.SUBREDDIT, ['pics', 'missing_sub'])
+        self.assertEqual({'pics': True, 'missing_sub': None}, results)
+        self.assertEqual({}, expired)
+
+    def test_invalid_results_expire_sooner_than_valid_results(self):
+        validator = ObjectValidator(RedditState(set()), 7 * 86400, self.cache_path)
+        validator.record(ObjectValidator.SUBREDDIT, 'valid_sub', True, 't5_abc')
+        validator.record(ObjectValidator.SUBREDDIT, 'banned_sub', False)
+        for entry in validator.pending.values():
+            entry['checked'] = time.time() - ObjectValidator.INVALID_TTL - 1
+        validator.save()
+        results, expired = validator.read_cache(ObjectValidator.SUBREDDIT, ['valid_sub', 'banned_sub'])
+        self.assertEqual({'valid_sub': True, 'banned_sub': None}, results)
+        self.assertIn('banned_sub', expired)
+
+    def test_expired_results_are_ignored(self):
+        validator = ObjectValidator(RedditState(set()), 0, self.cache_path)
+        validator.record(ObjectValidator.USER, 'some_user', True, 't2_abc')
+        validator.save()
+        results, expired = validator.read_cache(ObjectValidator.USER, ['some_user'])
+        self.assertEqual({'some_user': None}, results)
+        self.assertEqual('t2_abc', expired['some_user']['fullname'])
@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+
+from DownloaderForReddit.Core.RateLimitGate import RateLimitGate
+
+
+def make_headers(remaining, used, reset):
+    return {'X-Ratelimit-Remaining': remaining, 'X-Ratelimit-Used': used, 'X-Ratelimit-Reset': reset}
+
+
+class RateLimitGateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.gate = RateLimitGate(reserve=10)
+
+    def test_no_wait_before_first_response(self):
+        self.assertEqual(0, self.gate.get_wait_time())
+
+    def test_headers_are_parsed(self):
+        self.gate.update(make_headers('582.0', '18', '100'))
+        state = self.gate.json
+        self.assertEqual(582, state['remaining'])
+        self.assertEqual(18, state['used'])
+        self.assertTrue(time.time() + 99 < state['reset_timestamp'] <= time.time() + 100)
+
+    def test_responses_without_rate_limit_headers_are_ignored(self):
+        self.gate.update(make_headers('5.0', '595', '100'))
+        self.gate.update({'Content-Type': 'application/json'})
+        self.gate.update(make_headers('invalid', '595', '100'))
+        self.assertEqual(5, self.gate.json['remaining'])
+
+    def test_no_wait_above_reserve(self):
+        self.gate.update(make_headers('50.0', '550', '100'))
+        self.assertEqual(0, self.gate.get_wait_time())
+
+    def test_wait_until_reset_below_reserve(self):
+        self.gate.update(make_headers('5.0', '595', '100'))
+        wait_time = self.gate.get_wait_time()
+        self.assertTrue(99 < wait_time <= 100)
+
+    def test_wait_is_capped(self):
+        self.gate.update(make_headers('0', '600', '10000'))
+        self.assertEqual(RateLimitGate.MAX_WAIT, self.gate.get_wait_time())
+
+    def test_stop_releases_waiting_request(self):
+        self.gate.update(make_headers('0', '600', '100'))
+        thread = threading.Thread(target=self.gate.wait)
+        thread.start()
+        time.sleep(0.1)
+        self.assertTrue(thread.is_alive())
+        self.gate.stop()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, self.gate.json['wait_count'])
+
+    def test_lock_is_not_held_while_waiting(self):
+        self.gate.update(make_headers('0', '600', '100'))
+        thread = threading.Thread(target=self.gate.wait)
+        thread.start()
+        time.sleep(0.1)
+        acquired = self.gate.lock.acquire(timeout=1)
+        if acquired:
+            self.gate.lock.release()
+        self.gate.stop()
+        thread.join(2)
+        self.assertTrue(acquired)
+
+    def test_start_holds_requests_again_after_stop(self):
+        self.gate.stop()
+        self.gate.start()
+        self.assertFalse(self.gate.stop_event.is_set())
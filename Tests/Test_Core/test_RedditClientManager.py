@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+
+from DownloaderForReddit.Core.RedditClientManager import RedditClientManager, CountingRequestor, USER_AGENT
+from DownloaderForReddit.Core.RateLimitGate import RateLimitGate
+
+
+class MockResponse:
+
+    def __init__(self, headers=None):
+        self.status_code = 200
+        self.headers = headers if headers is not None else {}
+
+
+class MockSession:
+
+    """A stand in for a requests session that records how many requests are in progress at the same time."""
+
+    def __init__(self, response_headers=None, counter=None):
+        self.headers = {}
+        self.response_headers = response_headers
+        self.counter = counter if counter is not None else RequestCounter()
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        self.counter.start()
+        time.sleep(0.05)
+        self.counter.finish()
+        return MockResponse(self.response_headers)
+
+
+class RequestCounter:
+
+    """Counts the requests that are in progress at the same time across every session."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.sessions = []
+
+    def start(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def finish(self):
+        with self.lock:
+            self.active -= 1
+
+    def make_session(self):
+        session = MockSession(counter=self)
+        self.sessions.append(session)
+        return session
+
+
+class RedditClientManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.counts = []
+        self.session = MockSession()
+        self.requestor = CountingRequestor(user_agent=USER_AGENT, session=self.session,
+                                           on_request=lambda: self.counts.append(1))
+
+    def test_requests_are_counted(self):
+        self.requestor.request('GET', 'https://oauth.reddit.com/api/v1/me')
+        self.requestor.request('GET', 'https://oauth.reddit.com/r/pics/new')
+        self.assertEqual(2, len(self.counts))
+        self.assertEqual(('GET', 'https://oauth.reddit.com/r/pics/new'), self.session.requests[1])
+
+    def test_each_thread_has_its_own_session(self):
+        counter = self.session.counter
+        requestor = CountingRequestor(user_agent=USER_AGENT, session=self.session,
+                                      session_factory=counter.make_session)
+        threads = [threading.Thread(target=requestor.request, args=('GET', 'https://oauth.reddit.com/%s' % x))
+                   for x in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, len(counter.sessions))
+        self.assertEqual([1, 1, 1, 1], [len(session.requests) for session in counter.sessions])
+        self.assertTrue(counter.max_active > 1)
+        for session in counter.sessions:
+            self.assertEqual(self.session.headers['User-Agent'], session.headers['User-Agent'])
+
+        requestor.request('GET', 'https://oauth.reddit.com/api/v1/me')
+        self.assertEqual(1, len(self.session.requests))
+
+    def test_rate_limit_headers_update_gate(self):
+        gate = RateLimitGate()
+        session = MockSession({'X-Ratelimit-Remaining': '3.0', 'X-Ratelimit-Used': '597', 'X-Ratelimit-Reset': '60'})
+        requestor = CountingRequestor(user_agent=USER_AGENT, session=session, rate_limit_gate=gate)
+        requestor.request('GET', 'https://oauth.reddit.com/r/pics/new')
+        self.assertEqual(3, gate.json['remaining'])
+        self.assertTrue(gate.get_wait_time() > 0)
+
+        gate.stop()
+        requestor.request('GET', 'https://oauth.reddit.com/r/pics/new')
+        self.assertEqual(2, len(session.requests))
+        self.assertEqual(1, gate.json['wait_count'])
+
+    def test_shared_instance_is_created_once(self):
+        manager = RedditClientManager()
+        reddit = manager.reddit
+        self.assertIs(reddit, manager.reddit)
+        self.assertEqual(0, manager.get_stats()['request_count'])
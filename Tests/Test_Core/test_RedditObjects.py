@@ -0,0 +1,76 @@
+import copy
+import copyreg
+import pickle
+import unittest
+
+from DownloaderForReddit.Persistence.ObjectUpdater import ObjectUpdater
+from DownloaderForReddit.Core.RedditObjects import User
+from DownloaderForReddit.Core.Post import Post
+from DownloaderForReddit.version import __version__
+
+
+class DictPickle:
+
+    """Pickles as an object of the supplied class with a dict state, the way objects were pickled before slots."""
+
+    def __init__(self, cls, state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce__(self):
+        return copyreg._reconstructor, (self.cls, object, None), self.state
+
+
+def make_user():
+    return User(__version__, 'name', '/downloads/', 1000, True, True, True, 'INCLUDE', 'TITLE', 1500000000)
+
+
+class RedditObjectTest(unittest.TestCase):
+
+    def test_pickle_leaves_out_defaults_and_session_lists(self):
+        user = make_user()
+        user.content.append('content')
+        user.content.clear()
+        user.post_limit = 50
+        state = user.__getstate__()
+        self.assertNotIn('date_limit', state)
+        self.assertNotIn('store_id', state)
+        self.assertEqual([], state['content'])
+
+        loaded = pickle.loads(pickle.dumps(user))
+        self.assertEqual(50, loaded.post_limit)
+        self.assertEqual(86400, loaded.date_limit)
+        self.assertEqual([], loaded.failed_extracts)
+        self.assertIs(loaded.nsfw_filter, user.nsfw_filter)
+        self.assertEqual(user.json, copy.deepcopy(user).json)
+
+    def test_only_stored_objects_track_changes(self):
+        user = make_user()
+        user.post_limit = 50
+        self.assertIsNone(getattr(user, 'dirty_fields', None))
+        user.store_id = 1
+        user.post_limit = 60
+        user.content.append('content')
+        self.assertEqual({'post_limit'}, user.dirty_fields)
+
+    def test_old_dict_pickle_is_updated(self):
+        post = DictPickle(Post, {'url': 'https://i.imgur.com/a.jpg', 'author': 'name', 'title': 'title',
+                                 'subreddit': 'pics', 'created': 1500000000})
+        state = {'version': 'v1.0.0', 'name': 'name', 'save_path': '/downloads/name/', 'post_limit': 25,
+                 'avoid_duplicates': True, 'download_videos': True, 'download_images': True, 'nsfw_filter': 'EXCLUDE',
+                 'name_downloads_by': 'TITLE', 'user_added': 1500000000, 'do_not_edit': False, 'date_limit': 1510000000,
+                 'custom_date_limit': None, 'already_downloaded': ['https://i.imgur.com/b.jpg'], 'saved_content': {},
+                 'saved_submissions': [post], 'new_submissions': None, 'content': [], 'failed_extracts': [],
+                 'object_type': 'USER'}
+        old = pickle.loads(pickle.dumps(DictPickle(User, state)))
+        self.assertIsNone(old.saved_submissions[0].score)
+        with self.assertRaises(AttributeError):
+            old.previous_downloads
+
+        user = ObjectUpdater.update_user(old)
+        self.assertEqual(__version__, user.version)
+        self.assertEqual('/downloads/', user.save_path)
+        self.assertEqual('EXCLUDE', user.nsfw_filter)
+        self.assertEqual(1510000000, user.date_limit)
+        self.assertEqual(['https://i.imgur.com/b.jpg'], list(user.previous_downloads))
+        self.assertTrue(user.saved_submissions.contains_key('https://i.imgur.com/a.jpg'))
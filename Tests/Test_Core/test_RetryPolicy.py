@@ -0,0 +1,36 @@
+import unittest
+
+from DownloaderForReddit.Core.RetryPolicy import RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=3, max_total_retries=5)
+
+    def test_failure_classification(self):
+        for status_code in (429, 500, 502, 503, 504):
+            self.assertTrue(self.policy.is_transient(status_code))
+            self.assertFalse(self.policy.is_permanent(status_code))
+        for status_code in (404, 410):
+            self.assertTrue(self.policy.is_permanent(status_code))
+            self.assertFalse(self.policy.is_transient(status_code))
+        self.assertFalse(self.policy.is_transient(403))
+
+    def test_delay_grows_with_retry_count(self):
+        for run_retry_count in range(3):
+            delay = self.policy.get_delay(run_retry_count)
+            maximum = RetryPolicy.BASE_DELAY * 2 ** run_retry_count
+            self.assertTrue(maximum / 2 <= delay <= maximum)
+
+    def test_no_delay_once_run_retries_used(self):
+        self.assertIsNone(self.policy.get_delay(3))
+
+    def test_retry_after_header(self):
+        self.assertEqual(self.policy.get_delay(0, '7'), 7)
+        self.assertIsNone(self.policy.get_delay(0, str(RetryPolicy.MAX_DELAY + 1)))
+        self.assertIsNotNone(self.policy.get_delay(0, 'Wed, 21 Oct 2015 07:28:00 GMT'))
+
+    def test_exhausted(self):
+        self.assertFalse(self.policy.check_exhausted(5))
+        self.assertTrue(self.policy.check_exhausted(6))
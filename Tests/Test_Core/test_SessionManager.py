@@ -0,0 +1,39 @@
+import unittest
+from unittest import mock
+
+from DownloaderForReddit.Core.SessionManager import SessionManager
+
+
+class SessionManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = SessionManager(4)
+        self.addCleanup(self.manager.close)
+
+    def test_pools_are_sized_to_thread_count(self):
+        adapter = self.manager.session.get_adapter('https://i.imgur.com/a.jpg')
+        self.assertEqual(4, adapter._pool_maxsize)
+        self.assertEqual(SessionManager.HOST_POOL_COUNT, adapter._pool_connections)
+
+    def test_configure_keeps_session_if_size_unchanged(self):
+        session = self.manager.session
+        self.manager.configure(4)
+        self.assertIs(session, self.manager.session)
+
+    def test_configure_does_not_close_session_in_use(self):
+        session = self.manager.session
+        with mock.patch.object(session, 'close') as close:
+            self.manager.configure(8)
+        close.assert_not_called()
+        self.assertIsNot(session, self.manager.session)
+        self.assertEqual(8, self.manager.pool_size)
+
+    def test_requests_are_counted_per_host(self):
+        with mock.patch.object(self.manager.session, 'request') as request:
+            self.manager.get('https://i.imgur.com/a.jpg', stream=True)
+            self.manager.head('https://i.imgur.com/b.jpg')
+            self.manager.get('https://i.redd.it/c.jpg')
+        request.assert_any_call('GET', 'https://i.imgur.com/a.jpg', stream=True)
+        request.assert_any_call('HEAD', 'https://i.imgur.com/b.jpg')
+        self.assertEqual(3, self.manager.request_count)
+        self.assertEqual({'i.imgur.com': 2, 'i.redd.it': 1}, self.manager.host_request_counts)
@@ -0,0 +1,44 @@
+import io
+import os
+import tempfile
+import unittest
+
+from DownloaderForReddit.Core.StreamWriter import StreamWriter
+
+
+class StreamWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test.part')
+        self.data = os.urandom(10000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_stream(self, position, expected_size=None):
+        stream = io.BytesIO(self.data[position:])
+        with StreamWriter(self.path, position, 4096, expected_size) as writer:
+            chunk = writer.read_from(stream)
+            while chunk:
+                writer.write(chunk)
+                chunk = writer.read_from(stream)
+        return writer
+
+    def test_write_full_file(self):
+        writer = self.write_stream(0, len(self.data))
+        self.assertEqual(len(self.data), writer.bytes_written)
+        with open(self.path, 'rb') as file:
+            self.assertEqual(self.data, file.read())
+
+    def test_resume_removes_content_after_position(self):
+        with open(self.path, 'wb') as file:
+            file.write(self.data[:3000] + b'not part of the file')
+        writer = self.write_stream(3000)
+        self.assertEqual(len(self.data) - 3000, writer.bytes_written)
+        with open(self.path, 'rb') as file:
+            self.assertEqual(self.data, file.read())
+
+    def test_unused_preallocation_is_truncated(self):
+        self.write_stream(0, len(self.data) * 2)
+        self.assertEqual(len(self.data), os.path.getsize(self.path))
@@ -0,0 +1,35 @@
+import threading
+import unittest
+
+from DownloaderForReddit.Core.SubmissionStream import SubmissionStream
+
+
+def failing_listing():
+    yield 1
+    yield 2
+    raise ConnectionError
+
+
+class SubmissionStreamTest(unittest.TestCase):
+
+    def test_posts_stream_in_order(self):
+        stream = SubmissionStream(buffer_size=2)
+        producer = threading.Thread(target=stream.produce, args=(range(10),))
+        producer.start()
+        self.assertEqual(list(range(10)), list(stream))
+        producer.join()
+        self.assertTrue(stream.complete)
+        self.assertEqual(10, len(stream))
+
+    def test_failed_listing_is_not_complete(self):
+        stream = SubmissionStream()
+        with self.assertRaises(ConnectionError):
+            stream.produce(failing_listing())
+        self.assertEqual([1, 2], list(stream))
+        self.assertFalse(stream.complete)
+
+    def test_stopped_listing_is_not_complete(self):
+        stream = SubmissionStream(buffer_size=1, running=lambda: False)
+        stream.POLL_INTERVAL = 0.01
+        stream.produce(range(10))
+        self.assertFalse(stream.complete)
@@ -0,0 +1,52 @@
+import unittest
+
+from DownloaderForReddit.Extractors.BaseExtractor import BaseExtractor
+
+
+class BaseExtractorTest(unittest.TestCase):
+
+    def setUp(self):
+        # Registering the example extractors adds them to the global registry, so the registry is restored after each
+        # test to keep the example domains from leaking into other tests.
+        self.registry = dict(BaseExtractor.registry)
+        self.addCleanup(self.restore_registry, self.registry)
+
+        class ExampleExtractor(BaseExtractor):
+
+            domains = ('example.com',)
+
+        class ExampleMediaExtractor(BaseExtractor):
+
+            domains = ('media.example.com',)
+
+        self.example_extractor = ExampleExtractor
+        self.example_media_extractor = ExampleMediaExtractor
+
+    @staticmethod
+    def restore_registry(registry):
+        BaseExtractor.registry.clear()
+        BaseExtractor.registry.update(registry)
+
+    def test_domain_match(self):
+        self.assertEqual(self.example_extractor, BaseExtractor.get_extractor('https://example.com/abc'))
+
+    def test_subdomain_match(self):
+        self.assertEqual(self.example_extractor, BaseExtractor.get_extractor('https://i.Example.com/abc.jpg'))
+
+    def test_most_specific_domain_is_used(self):
+        self.assertEqual(self.example_media_extractor, BaseExtractor.get_extractor('https://cdn.media.example.com/abc'))
+
+    def test_domain_must_match_whole_labels(self):
+        self.assertIsNone(BaseExtractor.get_extractor('https://notexample.com/abc'))
+        self.assertIsNone(BaseExtractor.get_extractor('https://other.com/example.com'))
+
+    def test_url_without_host(self):
+        self.assertIsNone(BaseExtractor.get_extractor('not a url'))
+
+    def test_example_domains_are_not_left_registered(self):
+        self.assertEqual(self.example_extractor, BaseExtractor.registry.get('example.com'))
+        self.assertEqual(self.example_media_extractor, BaseExtractor.registry.get('media.example.com'))
+        self.doCleanups()
+        self.assertNotIn('example.com', BaseExtractor.registry)
+        self.assertNotIn('media.example.com', BaseExtractor.registry)
+        self.assertEqual(self.registry, BaseExtractor.registry)
@@ -0,0 +1,42 @@
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+
+from DownloaderForReddit.Extractors.VidbleExtractor import VidbleExtractor
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def get_tree_links(text):
+    """The links found by parsing the whole page into a tree, which is how vidble pages were previously parsed."""
+    links = []
+    for img in BeautifulSoup(text, 'html.parser').find_all('img'):
+        img_class = img.get('class')
+        if img_class is not None and img_class[0] == 'img2' and img.get('src') is not None:
+            links.append(img.get('src'))
+    return links
+
+
+class VidbleExtractorTest(unittest.TestCase):
+
+    def test_album_links(self):
+        text = read_fixture('vidble_album.html')
+        links = VidbleExtractor.get_image_links(text)
+        self.assertEqual(40, len(links))
+        self.assertEqual(get_tree_links(text), links)
+
+    def test_single_links(self):
+        text = read_fixture('vidble_single.html')
+        self.assertEqual(get_tree_links(text), VidbleExtractor.get_image_links(text))
+        self.assertEqual(1, len(VidbleExtractor.get_image_links(text)))
+
+    def test_only_first_class_matched(self):
+        text = '<img class="img2 big" src="/a.jpg"><img class="thumb img2" src="/b.jpg"><img class="img2">'
+        self.assertEqual(['/a.jpg'], VidbleExtractor.get_image_links(text))
@@ -0,0 +1,188 @@
+import os
+import shelve
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from DownloaderForReddit.Persistence.ObjectStateHandler import ObjectStateHandler
+from DownloaderForReddit.Persistence.ObjectStore import ObjectStore
+from DownloaderForReddit.Core.RedditObjects import User, Subreddit
+from DownloaderForReddit.Core.Post import Post
+from DownloaderForReddit.version import __version__
+
+
+def make_user(name):
+    user = User(__version__, name, '/downloads/', 1000, True, True, True, 'INCLUDE', 'TITLE', 1500000000)
+    user.previous_downloads.extend(['https://i.imgur.com/%s%s.jpg' % (name, x) for x in range(3)])
+    user.saved_content['https://i.redd.it/%s.png' % name] = [name, 'title', 'pics', 'abc', 1, '.png', '2018-01-01']
+    user.saved_submissions.append(Post('https://gfycat.com/%s' % name, name, 'title', 'gifs', 1500000000))
+    user.date_limit = 1510000000
+    return user
+
+
+def make_state():
+    sub = Subreddit(__version__, 'pics', '/downloads/', 100, True, True, True, 'EXCLUDE', 'SUB_FOLDER', 'TITLE',
+                    1500000000)
+    return {ObjectStore.USER_LISTS: {'Default': [make_user('one'), make_user('two')], 'Other': []},
+            ObjectStore.SUBREDDIT_LISTS: {'Default': [sub]},
+            ObjectStore.CURRENT_USER_VIEW: 'Default',
+            ObjectStore.CURRENT_SUBREDDIT_VIEW: 'Default'}
+
+
+class ObjectStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = ObjectStore(os.path.join(self.directory, 'reddit_objects.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_empty_store_has_no_state(self):
+        self.assertFalse(self.store.has_state())
+        self.assertEqual({}, self.store.load())
+
+    def test_saved_lists_loaded(self):
+        self.store.save(make_state())
+        state = self.store.load()
+        self.assertEqual(['Default', 'Other'], list(state[ObjectStore.USER_LISTS]))
+        self.assertEqual('Default', state[ObjectStore.CURRENT_SUBREDDIT_VIEW])
+        one, two = state[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(('one', 'two'), (one.name, two.name))
+        self.assertEqual(1510000000, one.date_limit)
+        self.assertEqual(make_user('one').previous_downloads, one.previous_downloads)
+        self.assertIn('https://i.imgur.com/one2.jpg', one.previous_downloads)
+        self.assertEqual(['one', 'title', 'pics', 'abc', 1, '.png', '2018-01-01'],
+                         one.saved_content['https://i.redd.it/one.png'])
+        self.assertTrue(one.saved_submissions.contains_key('https://gfycat.com/one'))
+        self.assertEqual([], one.content)
+        self.assertEqual('SUB_FOLDER', state[ObjectStore.SUBREDDIT_LISTS]['Default'][0].subreddit_save_method)
+
+    def test_collections_loaded_on_first_use(self):
+        self.store.save(make_state())
+        one = self.store.load()[ObjectStore.USER_LISTS]['Default'][0]
+        self.assertFalse(one.collections_loaded)
+        self.assertEqual(3, one.number_of_downloads)
+        self.assertEqual(1, one.json['saved_content_count'])
+        self.assertFalse(one.collections_loaded)
+        self.assertIn('https://i.imgur.com/one0.jpg', one.previous_downloads)
+        self.assertTrue(one.collections_loaded)
+        self.assertEqual(1, len(one.saved_submissions))
+
+    def test_unloaded_collections_kept_on_save(self):
+        self.store.save(make_state())
+        state = self.store.load()
+        one, two = state[ObjectStore.USER_LISTS]['Default']
+        two.previous_downloads.append('https://i.imgur.com/new.jpg')
+        one.post_limit = 50
+        del state[ObjectStore.USER_LISTS]['Other']
+        self.store.save(state)
+        one, two = self.store.load()[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(50, one.post_limit)
+        self.assertEqual(3, len(one.previous_downloads))
+        self.assertEqual(4, len(two.previous_downloads))
+        self.assertNotIn('Other', self.store.load()[ObjectStore.USER_LISTS])
+
+    def test_removed_object_deleted(self):
+        self.store.save(make_state())
+        state = self.store.load()
+        del state[ObjectStore.USER_LISTS]['Default'][0]
+        self.store.save(state)
+        users = self.store.load()[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(['two'], [user.name for user in users])
+        self.assertEqual(3, len(users[0].previous_downloads))
+
+    def test_only_changes_written(self):
+        self.store.save(make_state())
+        state = self.store.load()
+        one, two = state[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(0, self.store.prepare_save(state, set()).object_count)
+        one.date_limit = 1520000000
+        two.previous_downloads.append('https://i.imgur.com/new.jpg')
+        changes = self.store.prepare_save(state, set())
+        self.assertEqual(2, changes.object_count)
+        self.assertEqual([(two.store_id, 3, 'https://i.imgur.com/new.jpg')], changes.rows['previous_downloads'])
+        self.assertEqual([], changes.rewritten)
+        self.store.write(changes)
+        one, two = self.store.load()[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(1520000000, one.date_limit)
+        self.assertEqual('https://i.imgur.com/new.jpg', two.previous_downloads[3])
+
+    def test_failed_write_saved_again(self):
+        self.store.save(make_state())
+        state = self.store.load()
+        one = state[ObjectStore.USER_LISTS]['Default'][0]
+        one.post_limit = 50
+        one.previous_downloads.append('https://i.imgur.com/new.jpg')
+        self.store.finish_save(self.store.prepare_save(state, set()), False)
+        changes = self.store.prepare_save(state, set())
+        self.assertEqual(1, changes.object_count)
+        self.assertEqual([('previous_downloads', one.store_id)], changes.rewritten)
+        self.store.write(changes)
+        one = self.store.load()[ObjectStore.USER_LISTS]['Default'][0]
+        self.assertEqual(50, one.post_limit)
+        self.assertEqual(4, len(one.previous_downloads))
+
+    def test_failed_prepare_saved_again(self):
+        self.store.save(make_state())
+        state = self.store.load()
+        one = state[ObjectStore.USER_LISTS]['Default'][0]
+        one.post_limit = 50
+        one.previous_downloads.append('https://i.imgur.com/new.jpg')
+        three = make_user('three')
+        state[ObjectStore.USER_LISTS]['Default'].append(three)
+        dump_attributes = self.store.dump_attributes
+
+        def fail_on_new_user(reddit_object):
+            if reddit_object is three:
+                raise ValueError()
+            return dump_attributes(reddit_object)
+
+        with mock.patch.object(self.store, 'dump_attributes', side_effect=fail_on_new_user):
+            with self.assertRaises(ValueError):
+                self.store.prepare_save(state, {('user', 'Default')})
+        self.assertEqual({'post_limit'}, one.dirty_fields)
+        self.assertIsNone(one.previous_downloads.saved_length)
+        self.assertIsNone(three.store_id)
+
+        self.store.save(state, {('user', 'Default')})
+        one, two, three = self.store.load()[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(50, one.post_limit)
+        self.assertEqual(4, len(one.previous_downloads))
+        self.assertEqual(3, len(three.previous_downloads))
+
+    def test_failed_save_keeps_last_save(self):
+        self.store.save(make_state())
+        state = make_state()
+        del state[ObjectStore.CURRENT_SUBREDDIT_VIEW]
+        with self.assertRaises(KeyError):
+            self.store.save(state)
+        self.assertEqual(2, len(self.store.load()[ObjectStore.USER_LISTS]['Default']))
+
+    def test_shelve_save_file_imported(self):
+        shelve_path = os.path.join(self.directory, 'save_file')
+        with shelve.open(shelve_path, 'c') as shelf:
+            shelf.update(make_state())
+        with mock.patch.object(ObjectStateHandler, 'store', self.store), \
+                mock.patch.object(ObjectStateHandler, 'get_shelve_path', return_value=shelve_path):
+            self.assertTrue(ObjectStateHandler.check_shelve_exists())
+            self.assertTrue(ObjectStateHandler.import_shelve())
+        self.assertTrue(self.store.has_state())
+        users = self.store.load()[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual(3, len(users[1].previous_downloads))
+
+    def test_updated_objects_replace_stored_objects(self):
+        state = make_state()
+        for user in state[ObjectStore.USER_LISTS]['Default']:
+            user.version = 'v0.0.1'
+        self.store.save(state)
+        with mock.patch.object(ObjectStateHandler, 'store', self.store):
+            loaded = ObjectStateHandler.load_pickled_state()
+            self.assertTrue(ObjectStateHandler.start_save(
+                {'user_view_chooser_dict': loaded['user_dict'], 'sub_view_chooser_dict': loaded['sub_dict'],
+                 'current_user_view': 'Default', 'current_sub_view': 'Default'}).result())
+        users = self.store.load()[ObjectStore.USER_LISTS]['Default']
+        self.assertEqual([('one', __version__), ('two', __version__)], [(user.name, user.version) for user in users])
+        self.assertEqual(3, len(users[0].previous_downloads))